@@ -1,4 +1,5 @@
 from ninja import NinjaAPI
+from app.core.renderers import ORJSONRenderer
 from app.authentication.api.routers import router as auth_router
 from app.scheduler.api.routers import router as scheduler_router
 from app.planetary.api.api import router as planetary_router
@@ -7,7 +8,8 @@ from app.planetary.api.api import router as planetary_router
 api = NinjaAPI(
     title="Schduler API",
     version="1.0.0",
-    description="RESTful API"
+    description="RESTful API",
+    renderer=ORJSONRenderer()
 )
 
 api.add_router("/auth", auth_router)
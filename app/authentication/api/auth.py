@@ -1,18 +1,49 @@
+from django.conf import settings
 from ninja.security import HttpBearer
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import TokenError
 from django.contrib.auth import get_user_model
 
+from ..cache import aload_user, load_user
+
 
 User = get_user_model()
 
 
+def get_token_user_id(token):
+    try:
+        return AccessToken(token)["user_id"]
+    except (TokenError, KeyError):
+        return None
+
+
 class JWTAuth(HttpBearer):
     def authenticate(self, request, token):
+        user_id = get_token_user_id(token)
+        if user_id is None:
+            return None
+
+        if settings.JWT_AUTH["MODE"] == "stateless":
+            return load_user(user_id)
+
+        try:
+            return User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            return None
+
+
+class AsyncJWTAuth(HttpBearer):
+    is_async = True
+
+    async def authenticate(self, request, token):
+        user_id = get_token_user_id(token)
+        if user_id is None:
+            return None
+
+        if settings.JWT_AUTH["MODE"] == "stateless":
+            return await aload_user(user_id)
+
         try:
-            access_token = AccessToken(token)
-            user_id = access_token["user_id"]
-            user = User.objects.get(id=user_id)
-            return user
-        except (TokenError, User.DoesNotExist):
-            return None
\ No newline at end of file
+            return await User.objects.aget(id=user_id)
+        except User.DoesNotExist:
+            return None
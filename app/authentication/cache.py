@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from app.core.cache import LRUCache
+from app.core.metrics import auth_user_cache
+
+
+User = get_user_model()
+
+
+USER_FIELDS = tuple(field.attname for field in User._meta.concrete_fields)
+
+
+def load_user(user_id):
+    """
+    Return a fresh ``User`` instance for ``user_id``, reading the row from the
+    cache when possible. Every call builds a new instance so request handlers
+    can mutate it without touching the shared cache entry.
+    """
+    key = str(user_id)
+    row = user_cache.get(key)
+    auth_user_cache.inc(result="miss" if row is None else "hit")
+    if row is None:
+        row = (
+            User.objects
+            .filter(id=user_id)
+            .values_list(*USER_FIELDS)
+            .first()
+        )
+        if row is None:
+            return None
+        user_cache.set(key, row)
+
+    return User.from_db("default", USER_FIELDS, row)
+
+
+async def aload_user(user_id):
+    key = str(user_id)
+    row = user_cache.get(key)
+    auth_user_cache.inc(result="miss" if row is None else "hit")
+    if row is None:
+        row = await (
+            User.objects
+            .filter(id=user_id)
+            .values_list(*USER_FIELDS)
+            .afirst()
+        )
+        if row is None:
+            return None
+        user_cache.set(key, row)
+
+    return User.from_db("default", USER_FIELDS, row)
+
+
+def invalidate_user(user_id):
+    user_cache.invalidate(str(user_id))
+
+
+user_cache = LRUCache(
+    max_size=settings.JWT_AUTH["USER_CACHE_SIZE"],
+    ttl=settings.JWT_AUTH["USER_CACHE_TTL"],
+)
@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.hashers import check_password
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
+from .cache import invalidate_user
 from .utils import auth_result, apply_password_policy
 
 
@@ -64,6 +65,7 @@ class AuthService:
                 setattr(data_obj, field, value)
 
         data_obj.save()
+        invalidate_user(data_obj.id)
         return data_obj
     
     @staticmethod
@@ -85,5 +87,6 @@ class AuthService:
         
         user_obj.set_password(new_password)
         user_obj.save()
+        invalidate_user(user_obj.id)
 
         return {"message": "Password updated successfully."}
\ No newline at end of file
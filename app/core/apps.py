@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.core'
+
+    def ready(self):
+        # Job handlers register themselves in each app's jobs module.
+        autodiscover_modules("jobs")
+
+        # Query observers (app/core/queryobserver.py) see every connection,
+        # including those opened later by sync_to_async worker threads.
+        from app.core import queryobserver
+        connection_created.connect(queryobserver.install)
+        for connection in connections.all(initialized_only=True):
+            queryobserver.install(connection=connection)
@@ -0,0 +1,148 @@
+import statistics
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.scheduler.api.task.search_index import TaskSearchIndex
+from app.scheduler.api.task.summary_services import TaskSummaryServices
+from app.scheduler.models import SubTask, Tag, TaggedItem, Task, TaskCategory
+
+
+User = get_user_model()
+
+
+# Metrics where a higher value is an improvement; everything else in a
+# result row is better when it goes down.
+HIGHER_IS_BETTER = {"throughput_rps"}
+
+
+def seed_dataset(prefix: str, users: int, tasks: int, subtasks: int, tags: int, categories: int,
+                 days: int = 5) -> list:
+    """
+    Create ``users`` users, each owning ``tasks`` tasks (spread over the next
+    ``days`` days; the default five keeps them all in the task list),
+    ``subtasks`` subtasks per task and ``tags``/``categories`` of each.
+    Returns one dict per user with its access token and the ids of what it
+    owns.
+    """
+    today = timezone.now().date()
+    dataset = []
+
+    with transaction.atomic():
+        user_objs = User.objects.bulk_create([
+            User(username=f"{prefix}_{i}", email=f"{prefix}_{i}@example.com", password="!")
+            for i in range(users)
+        ])
+        # Some backends do not return ids from bulk_create.
+        user_objs = list(User.objects.filter(username__startswith=f"{prefix}_").order_by("id"))
+
+        for user in user_objs:
+            tag_objs = Tag.objects.bulk_create([
+                Tag(user=user, title=f"tag {i}") for i in range(tags)
+            ])
+            category_objs = TaskCategory.objects.bulk_create([
+                TaskCategory(user=user, title=f"category {i}") for i in range(categories)
+            ])
+            task_objs = Task.objects.bulk_create([
+                Task(
+                    user=user,
+                    title=f"task {i}",
+                    description="benchmark task",
+                    category=category_objs[i % categories] if categories else None,
+                    scheduled_date=today + timedelta(days=i % days),
+                )
+                for i in range(tasks)
+            ])
+
+            TaskSummaryServices.record(user.id, added=[TaskSummaryServices.entry(task) for task in task_objs])
+
+            SubTask.objects.bulk_create([
+                SubTask(parent_task=task, title=f"subtask {i}")
+                for task in task_objs
+                for i in range(subtasks)
+            ])
+            if tag_objs:
+                TaggedItem.objects.bulk_create([
+                    TaggedItem(task=task, tag=tag_objs[i % len(tag_objs)])
+                    for i, task in enumerate(task_objs)
+                ])
+            TaskSearchIndex.refresh(task.id for task in task_objs)
+
+            dataset.append({
+                "user": user,
+                "token": str(AccessToken.for_user(user)),
+                "task_ids": [task.id for task in task_objs],
+                "tag_ids": [tag.id for tag in tag_objs],
+                "category_ids": [category.id for category in category_objs],
+            })
+
+    return dataset
+
+
+def drop_dataset(prefix: str):
+    User.objects.filter(username__startswith=f"{prefix}_").delete()
+
+
+def summarize(latencies: list, queries: list = None, elapsed: float = None, errors: int = 0) -> dict:
+    """Latency percentiles in milliseconds plus optional query and throughput figures."""
+    latencies = sorted(latencies)
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    else:
+        cuts = latencies * 99
+
+    summary = {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(cuts[49] * 1000, 3) if cuts else 0.0,
+        "p95_ms": round(cuts[94] * 1000, 3) if cuts else 0.0,
+        "p99_ms": round(cuts[98] * 1000, 3) if cuts else 0.0,
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+    if queries is not None:
+        summary["queries_per_request"] = round(statistics.fmean(queries), 2) if queries else 0.0
+    if elapsed:
+        summary["throughput_rps"] = round(len(latencies) / elapsed, 1)
+
+    return summary
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Compare two benchmark result documents section by section. Returns one
+    ``(section, scenario, metric, before, after, change, regressed)`` row per
+    metric present in both; ``change`` is relative (0.1 == +10%).
+    """
+    rows = []
+    for section in ("scenarios", "load"):
+        before_section = baseline.get(section, {})
+        for scenario, after in current.get(section, {}).items():
+            before = before_section.get(scenario)
+            if before is None:
+                continue
+
+            for metric, after_value in after.items():
+                before_value = before.get(metric)
+                if metric in ("requests", "errors") or before_value is None:
+                    continue
+
+                if before_value:
+                    change = (after_value - before_value) / before_value
+                else:
+                    change = 0.0 if not after_value else float("inf")
+
+                if metric in HIGHER_IS_BETTER:
+                    regressed = change < -threshold
+                else:
+                    regressed = change > threshold
+                    # Query counts are exact, any increase is a regression.
+                    if metric == "queries_per_request":
+                        regressed = after_value > before_value
+
+                rows.append((section, scenario, metric, before_value, after_value, change, regressed))
+
+    return rows
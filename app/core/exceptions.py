@@ -17,4 +17,8 @@ class UnauthorizedError(HttpError):
 
 class ForbiddenError(HttpError):
     def __init__(self, message="Forbidden"):
-        super().__init__(403, message)
\ No newline at end of file
+        super().__init__(403, message)
+
+class GoneError(HttpError):
+    def __init__(self, message="Gone"):
+        super().__init__(410, message)
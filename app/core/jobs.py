@@ -0,0 +1,262 @@
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import groupby
+from typing import Callable, Dict, Iterable, List, Optional
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from app.core import metrics
+from app.core.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    """
+    A registered job type. ``func`` receives the payloads of up to
+    ``batch_size`` jobs of this type at once and runs in one transaction
+    with their removal from the queue, so a batch takes effect exactly once
+    or is retried as a whole. ``concurrency`` caps how many of its jobs
+    workers hold at a time; the cap is checked when claiming, so workers
+    claiming at the same instant can briefly exceed it.
+    """
+
+    name: str
+    func: Callable[[List[dict]], None]
+    batch_size: int = 1
+    max_attempts: int = 3
+    queue: str = "default"
+    concurrency: Optional[int] = None
+
+
+handlers: Dict[str, JobHandler] = {}
+
+
+def job(name: str, batch_size: int = 1, max_attempts: int = 3, queue: str = "default",
+        concurrency: Optional[int] = None):
+    """Register the decorated ``func(payloads)`` as the handler of jobs called ``name``."""
+    def register(func):
+        if name in handlers:
+            raise ValueError(f"Job '{name}' is already registered")
+        handlers[name] = JobHandler(name, func, batch_size, max_attempts, queue, concurrency)
+        return func
+    return register
+
+
+def enqueue(name: str, payload: dict = None, unique_key: str = None, delay: timedelta = None) -> None:
+    enqueue_many(name, [payload or {}], unique_keys=[unique_key], delay=delay)
+
+
+def enqueue_many(name: str, payloads: Iterable[dict], unique_keys: Iterable[Optional[str]] = None,
+                 delay: timedelta = None) -> None:
+    """
+    Queue one job per payload. Called inside a request's transaction, the
+    jobs commit or roll back with the request's writes.
+    """
+    handler = handlers.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown job '{name}'")
+
+    payloads = list(payloads)
+    unique_keys = list(unique_keys) if unique_keys is not None else [None] * len(payloads)
+    run_at = timezone.now() + (delay or timedelta())
+    Job.objects.bulk_create(
+        [
+            Job(
+                name=name,
+                queue=handler.queue,
+                payload=payload,
+                unique_key=unique_key,
+                max_attempts=handler.max_attempts,
+                run_at=run_at,
+            )
+            for payload, unique_key in zip(payloads, unique_keys)
+        ],
+        # A queued job with the same unique_key already covers it.
+        ignore_conflicts=any(unique_keys),
+    )
+
+
+class JobWorker:
+    """
+    Claims due jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``, so any number
+    of workers (threads or processes) share a queue without blocking each
+    other, and runs them in batches per handler.
+
+    A claimed job is leased to its worker for ``JOBS_LEASE_SECONDS``; jobs
+    of a worker that died are queued again once their lease expires, so
+    handlers must tolerate running twice.
+    """
+
+    def __init__(self, queues: List[str], claim_size: int = None, worker_id: str = None):
+        self.queues = queues
+        self.claim_size = claim_size or settings.JOBS_CLAIM_SIZE
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self._last_reap = 0.0
+
+    def run(self, stop: threading.Event, burst: bool = False):
+        """Work until ``stop`` is set, or in ``burst`` mode until the queues are empty."""
+        while not stop.is_set():
+            if time.monotonic() - self._last_reap >= settings.JOBS_LEASE_SECONDS / 2:
+                self.reap()
+
+            if not self.run_once():
+                if burst:
+                    return
+                stop.wait(settings.JOBS_POLL_INTERVAL)
+
+    def run_once(self) -> int:
+        """Claim and run one round of jobs; returns how many were claimed."""
+        jobs = self.claim()
+        for name, batch in groupby(jobs, key=lambda claimed: claimed.name):
+            batch = list(batch)
+            handler = handlers.get(name)
+            size = handler.batch_size if handler else len(batch)
+            for start in range(0, len(batch), size):
+                self._run_batch(name, handler, batch[start:start + size])
+
+        metrics.registry.maybe_flush()
+        return len(jobs)
+
+    def claim(self) -> List[Job]:
+        now = timezone.now()
+        with transaction.atomic():
+            jobs = list(
+                Job.objects
+                .select_for_update(skip_locked=True)
+                .filter(status=Job.STATUS_QUEUED, queue__in=self.queues, run_at__lte=now)
+                .order_by("run_at", "id")
+                .only("id", "name", "payload", "attempts", "max_attempts", "run_at")[:self.claim_size]
+            )
+            jobs = self._within_concurrency(jobs)
+            if not jobs:
+                return []
+
+            # The key only deduplicates queued jobs. Dropping it here lets a
+            # retry or a reap queue this job again next to a newer one with
+            # the same key instead of violating job_unique_queued.
+            Job.objects.filter(id__in=[claimed.id for claimed in jobs]).update(
+                status=Job.STATUS_RUNNING,
+                attempts=F("attempts") + 1,
+                locked_at=now,
+                locked_by=self.worker_id,
+                unique_key=None,
+            )
+
+        for claimed in jobs:
+            claimed.attempts += 1
+            metrics.job_wait.observe(max((now - claimed.run_at).total_seconds(), 0), name=claimed.name)
+
+        # Batches are formed per handler; keep each handler's jobs together.
+        return sorted(jobs, key=lambda claimed: (claimed.name, claimed.run_at, claimed.id))
+
+    def reap(self) -> int:
+        """Queue again the jobs whose worker's lease expired."""
+        self._last_reap = time.monotonic()
+        cutoff = timezone.now() - timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+        try:
+            requeued = Job.objects.filter(status=Job.STATUS_RUNNING, locked_at__lt=cutoff).update(
+                status=Job.STATUS_QUEUED, locked_at=None, locked_by=""
+            )
+        except DatabaseError:
+            # The next reap tries again; the worker keeps running.
+            logger.exception("Could not requeue jobs with an expired lease")
+            _drop_broken_connection()
+            return 0
+
+        if requeued:
+            logger.warning("Requeued %s jobs with an expired lease", requeued)
+        return requeued
+
+    def _within_concurrency(self, jobs: List[Job]) -> List[Job]:
+        limited = {
+            claimed.name for claimed in jobs
+            if claimed.name in handlers and handlers[claimed.name].concurrency
+        }
+        if not limited:
+            return jobs
+
+        running = dict(
+            Job.objects
+            .filter(status=Job.STATUS_RUNNING, name__in=limited)
+            .values_list("name")
+            .annotate(count=Count("id"))
+        )
+        kept = []
+        for claimed in jobs:
+            handler = handlers.get(claimed.name)
+            if handler and handler.concurrency:
+                if running.get(claimed.name, 0) >= handler.concurrency:
+                    continue
+                running[claimed.name] = running.get(claimed.name, 0) + 1
+            kept.append(claimed)
+        return kept
+
+    def _run_batch(self, name: str, handler: Optional[JobHandler], batch: List[Job]):
+        if handler is None:
+            self._fail(name, batch, f"No handler registered for job '{name}'", retry=False)
+            return
+
+        exhausted = [claimed for claimed in batch if claimed.attempts > claimed.max_attempts]
+        if exhausted:
+            self._fail(name, exhausted, "Lease expired on the last attempt", retry=False)
+            batch = [claimed for claimed in batch if claimed.attempts <= claimed.max_attempts]
+            if not batch:
+                return
+
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                handler.func([claimed.payload for claimed in batch])
+                Job.objects.filter(id__in=[claimed.id for claimed in batch]).delete()
+        except Exception as e:
+            logger.exception("Job batch '%s' of %s failed", name, len(batch))
+            self._fail(name, batch, f"{type(e).__name__}: {e}", retry=True)
+        else:
+            metrics.jobs_processed.inc(len(batch), name=name, result="done")
+        finally:
+            metrics.job_batch_duration.observe(time.perf_counter() - start, name=name)
+
+    def _fail(self, name: str, batch: List[Job], error: str, retry: bool):
+        now = timezone.now()
+        try:
+            for claimed in batch:
+                if retry and claimed.attempts < claimed.max_attempts:
+                    Job.objects.filter(id=claimed.id).update(
+                        status=Job.STATUS_QUEUED, run_at=now + self._backoff(claimed.attempts),
+                        locked_at=None, locked_by="", last_error=error
+                    )
+                    metrics.jobs_processed.inc(name=name, result="retry")
+                else:
+                    Job.objects.filter(id=claimed.id).update(
+                        status=Job.STATUS_FAILED, locked_at=None, last_error=error
+                    )
+                    metrics.jobs_processed.inc(name=name, result="failed")
+        except DatabaseError:
+            # Jobs not updated stay running until their lease expires and
+            # reap() queues them again.
+            logger.exception("Could not record the failure of job batch '%s'", name)
+            _drop_broken_connection()
+
+    @staticmethod
+    def _backoff(attempts: int) -> timedelta:
+        # Exponential with jitter, so failing jobs do not retry in lockstep.
+        ceiling = min(settings.JOBS_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOBS_RETRY_MAX_SECONDS)
+        return timedelta(seconds=random.uniform(ceiling / 2, ceiling))
+
+
+def _drop_broken_connection():
+    # Outside a transaction, close a connection the error left unusable so
+    # the worker's next query reconnects instead of failing forever.
+    if not connection.in_atomic_block:
+        connection.close_if_unusable_or_obsolete()
@@ -0,0 +1,296 @@
+import asyncio
+import json
+import platform
+import time
+import uuid
+from datetime import timedelta
+
+import orjson
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.utils import timezone
+
+from app.core.benchmark import compare_results, drop_dataset, seed_dataset, summarize
+from app.core.middlewares.metrics import QueryCounter
+from app.core.queryobserver import observe_queries
+
+
+class Scenario:
+    """
+    One benchmarked endpoint. ``build(state, i)`` returns the method, path
+    and JSON body of the i-th request for a seeded user; ``on_response`` may
+    record ids created by the request for later scenarios, which list the
+    scenario that creates them in ``requires``.
+    """
+
+    def __init__(self, name, build, on_response=None, load=False, requires=None):
+        self.name = name
+        self.build = build
+        self.on_response = on_response
+        self.load = load
+        self.requires = requires
+
+
+def _full_task_body(state, i):
+    today = timezone.now().date()
+    return {
+        "title": f"bench task {i}",
+        "description": "created by the benchmark",
+        "category": state["category_ids"][i % len(state["category_ids"])] if state["category_ids"] else None,
+        "scheduled_date": (today + timedelta(days=i % 5)).isoformat(),
+        "tags": state["tag_ids"][:2],
+        "subTasks": [{"title": f"step {n}", "is_completed": False} for n in range(3)],
+    }
+
+
+def _pick(ids, i):
+    return ids[i % len(ids)]
+
+
+def _remember(key):
+    def on_response(state, response):
+        if response.status_code == 201:
+            state.setdefault(key, []).append(orjson.loads(response.content)["id"])
+    return on_response
+
+
+SCENARIOS = [
+    Scenario("tasks.list", lambda s, i: ("GET", "/api/schedule/tasks/", None), load=True),
+    Scenario("tasks.full_create", lambda s, i: ("POST", "/api/schedule/tasks/full-create/", _full_task_body(s, i))),
+    Scenario(
+        "tasks.full_update",
+        lambda s, i: ("PUT", f"/api/schedule/tasks/{_pick(s['task_ids'], i)}/update/", _full_task_body(s, i)),
+    ),
+    Scenario("tags.list", lambda s, i: ("GET", "/api/schedule/tags/", None), load=True),
+    Scenario(
+        "tags.create",
+        lambda s, i: ("POST", "/api/schedule/tags/", {"title": f"bench tag {s['run']}-{i}"}),
+        _remember("created_tags"),
+    ),
+    Scenario(
+        "tags.update",
+        lambda s, i: ("PUT", f"/api/schedule/tags/{s['created_tags'][i]}/", {"title": f"bench tag {s['run']}-{i}*"}),
+        requires="tags.create",
+    ),
+    Scenario(
+        "tags.delete",
+        lambda s, i: ("DELETE", f"/api/schedule/tags/{s['created_tags'][i]}/", None),
+        requires="tags.create",
+    ),
+    Scenario("categories.list", lambda s, i: ("GET", "/api/schedule/categories/", None), load=True),
+    Scenario(
+        "categories.create",
+        lambda s, i: ("POST", "/api/schedule/categories/", {"title": f"bench category {s['run']}-{i}"}),
+        _remember("created_categories"),
+    ),
+    Scenario(
+        "categories.update",
+        lambda s, i: (
+            "PUT", f"/api/schedule/categories/{s['created_categories'][i]}/",
+            {"title": f"bench category {s['run']}-{i}*"},
+        ),
+        requires="categories.create",
+    ),
+    Scenario(
+        "categories.delete",
+        lambda s, i: ("DELETE", f"/api/schedule/categories/{s['created_categories'][i]}/", None),
+        requires="categories.create",
+    ),
+    Scenario(
+        "planetary.hours",
+        lambda s, i: (
+            "GET",
+            f"/api/planetary/?lat=35.6892&lon=51.389&city=Tehran&date="
+            f"{(timezone.now().date() + timedelta(days=i % 30)).isoformat()}",
+            None,
+        ),
+        load=True,
+    ),
+    Scenario("auth.me", lambda s, i: ("GET", "/api/auth/users/me/", None), load=True),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed benchmark users, drive the API endpoints through the Django test "
+        "client and an async load generator, and report latency percentiles, "
+        "queries per request and throughput. Results can be written as JSON "
+        "and compared against a previous run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5)
+        parser.add_argument("--tasks", type=int, default=100, help="Tasks per user.")
+        parser.add_argument("--subtasks", type=int, default=3, help="Subtasks per task.")
+        parser.add_argument("--tags", type=int, default=10, help="Tags per user.")
+        parser.add_argument("--categories", type=int, default=5, help="Categories per user.")
+        parser.add_argument("--iterations", type=int, default=50, help="Requests per scenario.")
+        parser.add_argument("--concurrency", type=int, default=10, help="Async clients; 0 skips the load phase.")
+        parser.add_argument("--scenario", action="append", default=None, help="Only run the named scenarios.")
+        parser.add_argument("--output", default=None, help="Write the results to this JSON file.")
+        parser.add_argument("--compare", default=None, help="Baseline JSON file to diff the results against.")
+        parser.add_argument("--threshold", type=float, default=0.10, help="Relative change reported as a regression.")
+        parser.add_argument("--fail-on-regression", action="store_true")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded users.")
+
+    def handle(self, *args, **options):
+        scenarios = SCENARIOS
+        if options["scenario"]:
+            unknown = set(options["scenario"]) - {scenario.name for scenario in SCENARIOS}
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+            selected = set(options["scenario"])
+            selected |= {scenario.requires for scenario in SCENARIOS if scenario.name in selected and scenario.requires}
+            scenarios = [scenario for scenario in SCENARIOS if scenario.name in selected]
+
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"], "rb") as f:
+                baseline = orjson.loads(f.read())
+
+        run = uuid.uuid4().hex[:8]
+        prefix = f"bench_{run}"
+        self.stdout.write(
+            f"seeding users={options['users']} tasks={options['tasks']} "
+            f"subtasks={options['subtasks']} tags={options['tags']} categories={options['categories']}"
+        )
+        states = seed_dataset(
+            prefix, options["users"], options["tasks"], options["subtasks"], options["tags"], options["categories"]
+        )
+        for state in states:
+            state["run"] = run
+
+        try:
+            results = {
+                "meta": self._meta(options),
+                "scenarios": {
+                    scenario.name: self._run_sync(scenario, states, options["iterations"])
+                    for scenario in scenarios
+                },
+                "load": {},
+            }
+            if options["concurrency"] > 0:
+                results["load"] = asyncio.run(self._run_load(
+                    [scenario for scenario in scenarios if scenario.load],
+                    states, options["iterations"], options["concurrency"]
+                ))
+        finally:
+            if not options["keep"]:
+                drop_dataset(prefix)
+
+        self._print(results)
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+                f.write("\n")
+
+        if baseline is not None:
+            regressions = self._print_comparison(baseline, results, options["threshold"])
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"{regressions} metrics regressed beyond {options['threshold']:.0%}")
+
+    def _meta(self, options):
+        return {
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "async_task_api": settings.ASYNC_TASK_API,
+            "jwt_auth_mode": settings.JWT_AUTH["MODE"],
+            **{
+                key: options[key]
+                for key in ("users", "tasks", "subtasks", "tags", "categories", "iterations", "concurrency")
+            },
+        }
+
+    def _run_sync(self, scenario, states, iterations):
+        client = Client()
+        latencies, queries = [], []
+        errors = 0
+
+        start = time.perf_counter()
+        for i in range(iterations):
+            state = states[i % len(states)]
+            method, path, body = scenario.build(state, i // len(states))
+
+            counter = QueryCounter()
+            request_start = time.perf_counter()
+            with observe_queries(counter):
+                response = client.generic(
+                    method, path,
+                    data=orjson.dumps(body) if body is not None else "",
+                    content_type="application/json",
+                    headers={"Authorization": f"Bearer {state['token']}"},
+                )
+            latency = time.perf_counter() - request_start
+
+            if response.status_code >= 400:
+                errors += 1
+                continue
+
+            latencies.append(latency)
+            queries.append(counter.count)
+            if scenario.on_response:
+                scenario.on_response(state, response)
+
+        return summarize(latencies, queries, time.perf_counter() - start, errors)
+
+    async def _run_load(self, scenarios, states, iterations, concurrency):
+        results = {}
+        for scenario in scenarios:
+            remaining = iter(range(iterations * concurrency))
+            latencies = []
+            errors = 0
+
+            async def worker():
+                nonlocal errors
+                client = AsyncClient()
+                for i in remaining:
+                    state = states[i % len(states)]
+                    method, path, body = scenario.build(state, i // len(states))
+
+                    request_start = time.perf_counter()
+                    response = await client.generic(
+                        method, path,
+                        data=orjson.dumps(body) if body is not None else "",
+                        content_type="application/json",
+                        headers={"Authorization": f"Bearer {state['token']}"},
+                    )
+                    if response.status_code >= 400:
+                        errors += 1
+                    else:
+                        latencies.append(time.perf_counter() - request_start)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            results[scenario.name] = summarize(latencies, elapsed=time.perf_counter() - start, errors=errors)
+
+        return results
+
+    def _print(self, results):
+        for section in ("scenarios", "load"):
+            if results[section]:
+                self.stdout.write(f"\n{section}:")
+            for name, summary in results[section].items():
+                self.stdout.write(
+                    f"  {name:<20} n={summary['requests']:<5} err={summary['errors']:<3} "
+                    f"p50={summary['p50_ms']:.2f}ms p95={summary['p95_ms']:.2f}ms "
+                    f"p99={summary['p99_ms']:.2f}ms "
+                    + (f"queries={summary['queries_per_request']:.1f} " if "queries_per_request" in summary else "")
+                    + f"throughput={summary['throughput_rps']:.1f}/s"
+                )
+
+    def _print_comparison(self, baseline, results, threshold):
+        rows = compare_results(baseline, results, threshold)
+        regressions = [row for row in rows if row[-1]]
+
+        self.stdout.write(f"\ncompared with baseline: {len(regressions)} regressions")
+        for section, scenario, metric, before, after, change, regressed in rows:
+            if regressed or abs(change) > threshold:
+                marker = "REGRESSION" if regressed else "improved"
+                self.stdout.write(
+                    f"  {marker:<10} {section}.{scenario}.{metric}: {before} -> {after} ({change:+.1%})"
+                )
+
+        return len(regressions)
@@ -0,0 +1,59 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.authentication.api.auth import JWTAuth
+from app.authentication.cache import user_cache
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Compare queries and latency of JWTAuth in db and stateless modes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        requests = options["requests"]
+
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username="bench_auth_user",
+                email="bench_auth_user@example.com",
+                password="bench-password",
+            )
+            token = str(AccessToken.for_user(user))
+
+            for mode in ("db", "stateless"):
+                queries, elapsed = self._run(mode, token, requests)
+                self.stdout.write(
+                    f"{mode:<10} requests={requests} queries={queries} "
+                    f"queries/request={queries / requests:.3f} "
+                    f"avg={elapsed / requests * 1_000_000:.1f}us"
+                )
+
+            transaction.set_rollback(True)
+
+        user_cache.clear()
+
+    def _run(self, mode, token, requests):
+        auth = JWTAuth()
+        user_cache.clear()
+        jwt_settings = {**settings.JWT_AUTH, "MODE": mode}
+
+        with override_settings(JWT_AUTH=jwt_settings):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                for _ in range(requests):
+                    auth.authenticate(None, token)
+                elapsed = time.perf_counter() - start
+
+        return len(ctx.captured_queries), elapsed
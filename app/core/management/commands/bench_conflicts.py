@@ -0,0 +1,100 @@
+import json
+import time as timer
+from datetime import time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models.functions import Mod
+from django.utils import timezone
+
+from app.core.benchmark import seed_dataset, summarize
+from app.scheduler.api.task.conflicts import TaskConflictServices
+from app.scheduler.models import Task
+
+
+# Timed tasks per day cycle through these slots; each runs 90 minutes, so
+# neighbouring slots overlap and every probe below finds conflicts.
+SLOTS = 12
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed busy calendars and time the overlap lookup behind "
+        "TASK_CONFLICT_MODE for new and existing tasks: client-side latency "
+        "of the query and server-side execution time from EXPLAIN ANALYZE. "
+        "Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5)
+        parser.add_argument("--tasks", type=int, default=20000, help="Tasks per user.")
+        parser.add_argument("--days", type=int, default=365, help="Days the tasks are spread over.")
+        parser.add_argument("--probes", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Conflict lookups are only benchmarked on PostgreSQL")
+
+        with transaction.atomic():
+            state = self._seed(options["users"], options["tasks"], options["days"])
+            self._run(state, options["days"], options["probes"])
+            transaction.set_rollback(True)
+
+    def _seed(self, users, tasks, days):
+        self.stdout.write(f"Seeding {users} users with {tasks} tasks over {days} days each...")
+        dataset = seed_dataset("bench_conflicts", users, tasks, 0, 0, 0, days=days)
+
+        seeded = Task.objects.filter(user__in=[state["user"] for state in dataset]).annotate(slot=Mod("id", SLOTS))
+        for slot in range(SLOTS):
+            seeded.filter(slot=slot).update(start_time=time(8 + slot), end_time=time(9 + slot, 30))
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(Task._meta.db_table)}")
+
+        return dataset[len(dataset) // 2]
+
+    def _run(self, state, days, probes):
+        user_obj = state["user"]
+        today = timezone.now().date()
+        existing = list(
+            Task.objects.filter(pk__in=state["task_ids"][:probes]).only("id", "scheduled_date", "start_time", "end_time")
+        )
+        cases = {
+            "new task": [
+                Task(user=user_obj, scheduled_date=today + timedelta(days=i % days),
+                     start_time=time(10, 15), end_time=time(11))
+                for i in range(probes)
+            ],
+            "existing task": existing,
+        }
+
+        for name, tasks in cases.items():
+            latencies, executions, found = [], [], 0
+            for task in tasks:
+                start = timer.perf_counter()
+                conflicts = TaskConflictServices.find(user_obj, task)
+                latencies.append(timer.perf_counter() - start)
+                found += len(conflicts)
+
+            plan = None
+            for task in tasks[:50]:
+                plan = self._explain(user_obj, task)
+                executions.append(plan["Execution Time"] / 1000)
+
+            summary = summarize(latencies)
+            server = summarize(executions)
+            self.stdout.write(
+                f"  {name:<14} client p50={summary['p50_ms']:.3f}ms p95={summary['p95_ms']:.3f}ms "
+                f"server p50={server['p50_ms']:.3f}ms p95={server['p95_ms']:.3f}ms "
+                f"conflicts/probe={found / len(tasks):.1f} indexes={', '.join(self._indexes(plan['Plan']))}"
+            )
+
+    def _explain(self, user_obj, task):
+        queryset = TaskConflictServices._queryset(user_obj, task)
+        return json.loads(queryset.explain(format="json", analyze=True))[0]
+
+    def _indexes(self, node):
+        names = {node["Index Name"]} if "Index Name" in node else set()
+        for child in node.get("Plans", ()):
+            names |= set(self._indexes(child))
+        return sorted(names)
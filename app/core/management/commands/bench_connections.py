@@ -0,0 +1,78 @@
+import time
+from copy import deepcopy
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request cost of getting a database connection with "
+        "no reuse, persistent connections and a psycopg3 pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        base = connections[options["database"]].settings_dict
+        modes = [
+            ("no reuse", {"CONN_MAX_AGE": 0}, False),
+            ("persistent", {"CONN_MAX_AGE": None, "CONN_HEALTH_CHECKS": True}, False),
+        ]
+        if base["ENGINE"] == "django.db.backends.postgresql":
+            modes.append(("pool", {"CONN_MAX_AGE": 0}, True))
+        else:
+            self.stdout.write(f"{base['ENGINE']} does not support pooling, skipping the pool mode")
+
+        for name, overrides, pooled in modes:
+            opened, elapsed = self._run(base, overrides, pooled, options["requests"])
+            self.stdout.write(
+                f"{name:<11} requests={options['requests']} connections opened={opened} "
+                f"avg={elapsed / options['requests'] * 1000:.3f}ms"
+            )
+
+    def _run(self, base, overrides, pooled, requests):
+        settings_dict = deepcopy(base)
+        settings_dict.update(overrides)
+        settings_dict["OPTIONS"].pop("pool", None)
+        if pooled:
+            settings_dict["OPTIONS"]["pool"] = {"min_size": 1, "max_size": 1}
+
+        # A separate alias keeps the benchmark's pool apart from the app's.
+        backend = connections[DEFAULT_DB_ALIAS].__class__
+        conn = backend(settings_dict, alias=f"bench_{int(pooled)}")
+
+        opened = 0
+
+        def count(sender, connection, **kwargs):
+            nonlocal opened
+            if connection is conn:
+                opened += 1
+
+        connection_created.connect(count)
+        try:
+            start = time.perf_counter()
+            for _ in range(requests):
+                # The same steps Django's request_started/request_finished
+                # signal handlers and a one-query view go through.
+                conn.close_if_unusable_or_obsolete()
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+                conn.close_if_unusable_or_obsolete()
+            elapsed = time.perf_counter() - start
+
+            if pooled:
+                # Every checkout fires connection_created; the pool knows how
+                # many server connections it really opened.
+                opened = conn.pool.get_stats()["connections_num"]
+        finally:
+            connection_created.disconnect(count)
+            conn.close()
+            if pooled:
+                conn.close_pool()
+
+        return opened, elapsed
@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import threading
+import time as timer
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from app.core.benchmark import seed_dataset
+from app.core.jobs import JobWorker
+from app.scheduler.models import DeadlineReminder, Task
+from app.scheduler.reminders.services import DeadlineReminderServices
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed tasks with deadlines spread around today and time the reminder "
+        "scheduler over them: the first scan that queues every due reminder, "
+        "the rescan that finds nothing new, and delivery through the job "
+        "worker into a FileNotifier. Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--tasks", type=int, default=10000, help="Tasks per user.")
+        parser.add_argument("--days", type=int, default=60,
+                            help="Deadlines are spread over this many days, starting a week ago.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Deadline reminders are only benchmarked on PostgreSQL")
+
+        sink = tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False)
+        sink.close()
+        try:
+            with override_settings(
+                DEADLINE_REMINDER_NOTIFIER="app.scheduler.reminders.notifiers.FileNotifier",
+                DEADLINE_REMINDER_FILE=sink.name,
+            ), transaction.atomic():
+                self._seed(options["users"], options["tasks"], options["days"])
+                self._run(sink.name)
+                transaction.set_rollback(True)
+        finally:
+            os.unlink(sink.name)
+
+    def _seed(self, users, tasks, days):
+        self.stdout.write(f"Seeding {users} users with {tasks} tasks each...")
+        start = timer.perf_counter()
+        dataset = seed_dataset("bench_reminders", users, tasks, 0, 0, 0, days=days)
+
+        # Deadlines from a week ago on, one task in four completed.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {connection.ops.quote_name(Task._meta.db_table)} "
+                "SET dead_line = %s::date + (id %% %s)::int - 7, is_completed = (id %% 4 = 0) "
+                "WHERE user_id = ANY(%s)",
+                [timezone.now().date(), days, [state["user"].id for state in dataset]]
+            )
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(Task._meta.db_table)}")
+        self.stdout.write(f"  seeded {users * tasks} tasks in {timer.perf_counter() - start:.1f}s")
+
+    def _run(self, sink):
+        now = timezone.now()
+        for kind, first, last in DeadlineReminderServices.due_ranges(now):
+            due = Task.objects.filter(
+                dead_line__range=[first, last], is_completed=False, is_recurring=False
+            ).count()
+            self.stdout.write(f"  {kind:<9} deadlines {first}..{last}: {due} open tasks")
+
+        _, first, last = DeadlineReminderServices.due_ranges(now)[1]
+        plan = json.loads(
+            DeadlineReminderServices._scan_queryset(DeadlineReminder.KIND_OVERDUE, first, last, None)
+            .values_list("id", "dead_line")[:settings.DEADLINE_REMINDER_BATCH_SIZE]
+            .explain(format="json")
+        )[0]["Plan"]
+        self.stdout.write(f"  scan uses {', '.join(self._indexes(plan)) or 'no index'}")
+
+        start = timer.perf_counter()
+        queued = DeadlineReminderServices.schedule(now)
+        elapsed = timer.perf_counter() - start
+        self.stdout.write(f"  first scan: queued {queued} reminders in {elapsed:.2f}s ({queued / elapsed:,.0f}/s)")
+
+        start = timer.perf_counter()
+        again = DeadlineReminderServices.schedule(now)
+        self.stdout.write(f"  rescan: queued {again} in {(timer.perf_counter() - start) * 1000:.1f}ms")
+
+        start = timer.perf_counter()
+        JobWorker(["default"]).run(threading.Event(), burst=True)
+        elapsed = timer.perf_counter() - start
+        with open(sink, "rb") as lines:
+            sent = sum(1 for _ in lines)
+        self.stdout.write(f"  delivery: sent {sent} reminders in {elapsed:.2f}s ({sent / elapsed:,.0f}/s)")
+
+    def _indexes(self, node):
+        names = {node["Index Name"]} if "Index Name" in node else set()
+        for child in node.get("Plans", ()):
+            names |= set(self._indexes(child))
+        return sorted(names)
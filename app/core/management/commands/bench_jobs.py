@@ -0,0 +1,72 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from app.core.jobs import JobWorker, enqueue_many, handlers, job
+from app.core.models import Job
+
+
+QUEUE = "bench"
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue no-op jobs on a separate 'bench' queue and time how fast "
+        "burst workers drain it at each concurrency. The queue is emptied "
+        "afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=10000)
+        parser.add_argument("--concurrency", type=int, action="append", dest="concurrencies",
+                            help="Worker threads; repeat to compare. Defaults to 1 and 4.")
+        parser.add_argument("--batch-size", type=int, action="append", dest="batch_sizes",
+                            help="Jobs per handler call; repeat to compare. Defaults to 1 and 50.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("SKIP LOCKED claiming is only benchmarked on PostgreSQL")
+        if Job.objects.filter(queue=QUEUE).exists():
+            raise CommandError(f"The '{QUEUE}' queue is not empty")
+
+        for batch_size in options["batch_sizes"] or [1, 50]:
+            name = f"bench.noop.{batch_size}"
+            if name not in handlers:
+                job(name, batch_size=batch_size, queue=QUEUE)(lambda payloads: None)
+
+            for concurrency in options["concurrencies"] or [1, 4]:
+                try:
+                    elapsed = self._drain(name, options["jobs"], concurrency)
+                finally:
+                    Job.objects.filter(queue=QUEUE).delete()
+                self.stdout.write(
+                    f"batch {batch_size:>3}, {concurrency} workers: {options['jobs']} jobs in "
+                    f"{elapsed:.2f}s ({options['jobs'] / elapsed:,.0f} jobs/s)"
+                )
+
+    def _drain(self, name, jobs, concurrency):
+        for start in range(0, jobs, 5000):
+            enqueue_many(name, [{"n": n} for n in range(start, min(start + 5000, jobs))])
+
+        stop = threading.Event()
+        threads = [threading.Thread(target=self._work, args=(stop,)) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        left = Job.objects.filter(queue=QUEUE).count()
+        if left:
+            raise CommandError(f"{left} jobs were left on the queue")
+        return elapsed
+
+    @staticmethod
+    def _work(stop):
+        try:
+            JobWorker([QUEUE]).run(stop, burst=True)
+        finally:
+            connection.close()
@@ -0,0 +1,89 @@
+import gc
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+from app.core.benchmark import seed_dataset
+from app.core.renderers import dumps
+from app.scheduler.api.task.filters import TaskFilterSchema
+from app.scheduler.api.task.services import TaskServices
+
+
+MODES = ("orm", "rows")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the ORM and values_list read models of the task list on one "
+        "large page: CPU time of this process and peak Python memory per "
+        "task, from query to rendered JSON. The dataset is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=10000)
+        parser.add_argument("--subtasks", type=int, default=3)
+        parser.add_argument("--tags", type=int, default=4)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        tasks = options["tasks"]
+
+        with transaction.atomic():
+            state = seed_dataset("bench_read_models", 1, tasks, options["subtasks"], options["tags"], 3, days=tasks)[0]
+            filters = TaskFilterSchema(scheduled_from=state["user"].date_joined.date()).get_filter_expression()
+
+            with override_settings(TASK_PAGE_SIZE_MAX=tasks):
+                bodies = {}
+                results = {}
+                for mode in MODES:
+                    bodies[mode], results[mode] = self._measure(mode, state["user"], filters, tasks, options["repeat"])
+
+            transaction.set_rollback(True)
+
+        if bodies["orm"] != bodies["rows"]:
+            raise CommandError("The read models rendered different responses")
+
+        for mode in MODES:
+            cpu, memory = results[mode]
+            self.stdout.write(
+                f"{mode:<5} cpu={cpu / tasks * 1e6:.1f}us/task peak_memory={memory / tasks:.0f}B/task "
+                f"({cpu * 1000:.1f}ms, {memory / 1024 / 1024:.1f}MiB per {tasks}-task page)"
+            )
+
+        (orm_cpu, orm_memory), (rows_cpu, rows_memory) = results["orm"], results["rows"]
+        self.stdout.write(
+            f"rows vs orm: cpu {(rows_cpu - orm_cpu) / orm_cpu:+.0%}, "
+            f"peak memory {(rows_memory - orm_memory) / orm_memory:+.0%}"
+        )
+
+    def _measure(self, mode, user_obj, filters, limit, repeat):
+        def render():
+            page, _ = TaskServices.get_all_tasks(user_obj, filters=filters, limit=limit)
+            return dumps(page)
+
+        with override_settings(TASK_LIST_READ_MODEL=mode):
+            body = render()
+            if body.count(b'"id":') < limit:
+                raise CommandError(f"{mode} returned a short page; the filter window is too narrow")
+
+            cpu_times = []
+            for _ in range(repeat):
+                gc.collect()
+                start = time.process_time()
+                render()
+                cpu_times.append(time.process_time() - start)
+
+            # tracemalloc slows allocation down, so memory is a separate run.
+            gc.collect()
+            tracemalloc.start()
+            try:
+                render()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        return body, (statistics.median(cpu_times), peak)
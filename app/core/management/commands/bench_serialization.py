@@ -0,0 +1,73 @@
+import json
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import List
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from ninja.responses import NinjaJSONEncoder
+from pydantic import TypeAdapter
+
+from app.core.renderers import dumps
+from app.scheduler.api.schemas import FullTaskSchemaOut
+
+
+class Command(BaseCommand):
+    help = "Compare response serialization paths for a list of task dicts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=1000)
+        parser.add_argument("--rounds", type=int, default=20)
+
+    def handle(self, *args, **options):
+        tasks = _build_tasks(options["tasks"])
+        adapter = TypeAdapter(List[FullTaskSchemaOut])
+
+        def validated():
+            return adapter.dump_python(adapter.validate_python(tasks))
+
+        paths = {
+            "pydantic + json (ninja default)": lambda: json.dumps(validated(), cls=NinjaJSONEncoder),
+            "pydantic + orjson": lambda: dumps(validated()),
+            "trusted dict + orjson": lambda: dumps(tasks),
+        }
+
+        baseline = None
+        for name, serialize in paths.items():
+            serialize()
+            start = time.perf_counter()
+            for _ in range(options["rounds"]):
+                serialize()
+            elapsed = (time.perf_counter() - start) / options["rounds"] * 1000
+
+            baseline = baseline or elapsed
+            self.stdout.write(
+                f"{name:<32} {elapsed:8.2f} ms/response  x{baseline / elapsed:.1f}"
+            )
+
+
+def _build_tasks(count):
+    now = timezone.now()
+    today = date.today()
+    return [
+        {
+            "id": i,
+            "title": f"Task {i}",
+            "description": "Lorem ipsum dolor sit amet " * 3,
+            "category": i % 5 or None,
+            "priority_level": "M",
+            "scheduled_date": today + timedelta(days=i % 7),
+            "dead_line": today + timedelta(days=10),
+            "start_time": dt_time(9, 0),
+            "end_time": dt_time(10, 30),
+            "is_completed": bool(i % 2),
+            "created_at": now,
+            "updated_at": datetime.now(tz=now.tzinfo),
+            "subTasks": [
+                {"id": i * 10 + j, "title": f"Subtask {j}", "is_completed": False}
+                for j in range(3)
+            ],
+            "tags": [{"id": j, "title": f"Tag {j}"} for j in range(2)],
+        }
+        for i in range(count)
+    ]
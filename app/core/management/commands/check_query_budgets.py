@@ -0,0 +1,295 @@
+import os
+from datetime import datetime, time, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from app.authentication.services import AuthService
+from app.scheduler.api.agenda.services import AgendaServices
+from app.core.benchmark import seed_dataset
+from app.core.querybudget import QueryRecorder, check_budget, load_budgets, save_budgets
+from app.scheduler.api.category.services import CategoryServices
+from app.scheduler.api.recurrence.services import RecurrenceServices
+from app.scheduler.api.sync.services import SyncServices
+from app.scheduler.api.tag.services import TagServices
+from app.scheduler.api.task.bulk_services import BulkTaskServices
+from app.scheduler.api.task.search_services import TaskSearchServices
+from app.scheduler.api.task.services import TaskServices
+from app.scheduler.api.versioning import bump_data_version
+from app.scheduler.models import DeadlineReminder, SubTask, Task, TaskCategory
+from app.scheduler.reminders.services import DeadlineReminderServices
+
+
+User = get_user_model()
+
+# Recorded on PostgreSQL: bulk inserts there are a single INSERT ... UNNEST,
+# so the shapes of other backends do not match.
+BUDGET_FILE = Path(settings.BASE_DIR) / "app" / "core" / "query_budgets.json"
+
+# (tasks, subtasks per task, tags, categories). Every case runs against both
+# datasets; a query count that differs between them is an N+1. Tasks are
+# spread over five days, so every day touched by a case keeps other tasks
+# and the per-day summary rows are updated rather than created.
+DATASETS = [(6, 2, 2, 2), (12, 4, 4, 3)]
+
+PASSWORD = "budget-password"
+
+
+class Case:
+    """
+    A service call measured by the budget check. ``prepare(state)`` runs
+    outside the recorder and returns the keyword arguments of ``call``.
+    """
+
+    def __init__(self, name, call, prepare=None):
+        self.name = name
+        self.call = call
+        self.prepare = prepare or (lambda state: {})
+
+
+def _full_task_data(state, subtasks=()):
+    return {
+        "title": "budget task",
+        "description": "",
+        "category": state["category_ids"][0],
+        "priority_level": "H",
+        "scheduled_date": timezone.now().date(),
+        "dead_line": None,
+        "start_time": None,
+        "end_time": None,
+        "is_completed": False,
+        "tags": state["tag_ids"][:2],
+        "subTasks": [*subtasks, {"title": "new step", "is_completed": False}],
+    }
+
+
+def _update_full_task_kwargs(state):
+    task_id = state["task_ids"][0]
+    subtasks = [
+        {"id": subtask_id, "title": "renamed", "is_completed": True}
+        for subtask_id in SubTask.objects.filter(parent_task_id=task_id).values_list("id", flat=True)[:1]
+    ]
+    return {"user_obj": state["user"], "task_id": task_id, "data": _full_task_data(state, subtasks)}
+
+
+def _today_start():
+    return datetime.combine(timezone.now().date(), datetime.min.time())
+
+
+def _with_settings(call, **overrides):
+    def wrapped(**kwargs):
+        with override_settings(**overrides):
+            return call(**kwargs)
+    return wrapped
+
+
+def _with_series(state):
+    # Two daily series starting today (seeded tasks repeat every five days),
+    # with one completed and one cancelled occurrence each.
+    today = timezone.now().date()
+    for task_id in state["task_ids"][:10:5]:
+        RecurrenceServices.set_rule(state["user"], task_id, {"freq": "daily"})
+        RecurrenceServices.update_occurrence(state["user"], task_id, today, {"is_completed": True})
+        RecurrenceServices.update_occurrence(state["user"], task_id, today + timedelta(days=1), {"is_cancelled": True})
+    return state["user"]
+
+
+def _due_reminders(state):
+    # Every task due today with a queued "due soon" reminder.
+    today = timezone.localdate()
+    Task.objects.filter(pk__in=state["task_ids"]).update(dead_line=today)
+    DeadlineReminder.objects.bulk_create([
+        DeadlineReminder(task_id=task_id, kind=DeadlineReminder.KIND_DUE_SOON, dead_line=today)
+        for task_id in state["task_ids"]
+    ])
+    return {"kind": DeadlineReminder.KIND_DUE_SOON, "task_ids": state["task_ids"]}
+
+
+def _user_with_password(state):
+    user = state["user"]
+    user.set_password(PASSWORD)
+    user.save(update_fields=["password"])
+    return user
+
+
+CASES = [
+    Case("TaskServices.get_all_tasks", lambda user_obj: TaskServices.get_all_tasks(user_obj=user_obj),
+         lambda s: {"user_obj": s["user"]}),
+    Case("TaskServices.get_all_tasks[recurring]", lambda user_obj: TaskServices.get_all_tasks(user_obj=user_obj),
+         lambda s: {"user_obj": _with_series(s)}),
+    Case("TaskServices.export_tasks", lambda user_obj: list(TaskServices.export_tasks(user_obj=user_obj)),
+         lambda s: {"user_obj": s["user"]}),
+    Case("TaskServices.get_task_by_id", TaskServices.get_task_by_id,
+         lambda s: {"user_obj": s["user"], "task_id": s["task_ids"][-1]}),
+    Case("TaskServices.create_task", TaskServices.create_task,
+         lambda s: {"user_obj": s["user"], "task_data": {"title": "budget task", "category": s["category_ids"][0]}}),
+    Case("TaskServices.create_full_task", TaskServices.create_full_task,
+         lambda s: {"user_obj": s["user"], "task_data": _full_task_data(s)}),
+    Case("TaskServices.update_full_task", TaskServices.update_full_task, _update_full_task_kwargs),
+    Case("TaskServices.update_task", TaskServices.update_task,
+         lambda s: {"user_obj": s["user"], "task_id": s["task_ids"][0],
+                    "data": {"title": "budget task", "category": s["category_ids"][0]}}),
+    Case("TaskServices.update_task_partial", TaskServices.update_task_partial,
+         lambda s: {"user_obj": s["user"], "task_id": s["task_ids"][-1], "data": {"is_completed": True}}),
+    Case("TaskServices.update_task_partial[conflicts]",
+         _with_settings(TaskServices.update_task_partial, TASK_CONFLICT_MODE="flag"),
+         lambda s: {"user_obj": s["user"], "task_id": s["task_ids"][-1],
+                    "data": {"start_time": time(9), "end_time": time(10)}}),
+    Case("TaskServices.delete_task", TaskServices.delete_task,
+         lambda s: {"user_obj": s["user"], "task_id": s["task_ids"][-1]}),
+    Case("TaskSearchServices.search", TaskSearchServices.search,
+         lambda s: {"user_obj": s["user"], "query": "task"}),
+    Case("BulkTaskServices.apply", BulkTaskServices.apply,
+         lambda s: {"user_obj": s["user"], "operations": [
+             {"op": "create", "id": None, "data": _full_task_data(s)},
+             {"op": "update", "id": s["task_ids"][0], "data": _full_task_data(s)},
+             {"op": "delete", "id": s["task_ids"][5], "data": None},
+         ]}),
+
+    Case("TagServices.get_all_tags", TagServices.get_all_tags, lambda s: {"user_obj": s["user"]}),
+    Case("TagServices.get_tag_by_id", TagServices.get_tag_by_id,
+         lambda s: {"user_obj": s["user"], "tag_id": s["tag_ids"][0]}),
+    Case("TagServices.create_tag", TagServices.create_tag,
+         lambda s: {"user_obj": s["user"], "data": {"title": "budget tag"}}),
+    Case("TagServices.update_tag", TagServices.update_tag,
+         lambda s: {"user_obj": s["user"], "tag_id": s["tag_ids"][0], "data": {"title": "budget tag"}}),
+    Case("TagServices.delete_tag", TagServices.delete_tag,
+         lambda s: {"user_obj": s["user"], "tag_id": s["tag_ids"][0]}),
+    Case("TagServices.delete_tag[deferred]",
+         _with_settings(TagServices.delete_tag, TASK_SEARCH_REFRESH="deferred"),
+         lambda s: {"user_obj": s["user"], "tag_id": s["tag_ids"][0]}),
+
+    Case("CategoryServices.get_all_categories", lambda user: list(CategoryServices.get_all_categories(user)),
+         lambda s: {"user": s["user"]}),
+    Case("CategoryServices.get_catgeory_by_id", CategoryServices.get_catgeory_by_id,
+         lambda s: {"user": s["user"], "category_id": s["category_ids"][0]}),
+    Case("CategoryServices.create_category", CategoryServices.create_category,
+         lambda s: {"user": s["user"], "title": "budget category"}),
+    Case("CategoryServices.update_category", CategoryServices.update_category,
+         lambda s: {"data_obj": TaskCategory.objects.get(pk=s["category_ids"][0]),
+                    "new_data": {"title": "budget category"}}),
+    Case("CategoryServices.delete_category", CategoryServices.delete_category,
+         lambda s: {"user": s["user"], "id": s["category_ids"][0]}),
+
+    Case("AgendaServices.get_agenda", AgendaServices.get_agenda,
+         lambda s: {"user_obj": s["user"], "date_from": _today_start(), "date_to": _today_start() + timedelta(days=7)}),
+    Case("AgendaServices.get_agenda[recurring]", AgendaServices.get_agenda,
+         lambda s: {"user_obj": _with_series(s), "date_from": _today_start(),
+                    "date_to": _today_start() + timedelta(days=7)}),
+    Case("AgendaServices.get_free_slots", AgendaServices.get_free_slots,
+         lambda s: {"user_obj": s["user"], "date_from": _today_start(), "date_to": _today_start() + timedelta(days=7)}),
+
+    Case("RecurrenceServices.set_rule", RecurrenceServices.set_rule,
+         lambda s: {"user_obj": s["user"], "task_id": s["task_ids"][0],
+                    "data": {"freq": "weekly", "weekdays": [0, 2, 4], "count": 30}}),
+    Case("RecurrenceServices.update_occurrence", RecurrenceServices.update_occurrence,
+         lambda s: {"user_obj": _with_series(s), "task_id": s["task_ids"][0],
+                    "occurrence_date": timezone.now().date() + timedelta(days=2), "data": {"is_completed": True}}),
+
+    Case("DeadlineReminderServices.deliver",
+         _with_settings(DeadlineReminderServices.deliver,
+                        DEADLINE_REMINDER_NOTIFIER="app.scheduler.reminders.notifiers.FileNotifier",
+                        DEADLINE_REMINDER_FILE=os.devnull),
+         _due_reminders),
+
+    Case("SyncServices.get_changes", SyncServices.get_changes,
+         lambda s: {"user_obj": s["user"],
+                    "since": SyncServices._encode_token(timezone.now() - timedelta(hours=1))}),
+
+    Case("AuthService.register_user", AuthService.register_user,
+         lambda s: {"username": f"{s['user'].username}_new", "email": f"{s['user'].username}_new@example.com",
+                    "password": PASSWORD, "first_name": "", "last_name": ""}),
+    Case("AuthService.login_user", AuthService.login_user,
+         lambda s: {"username": _user_with_password(s).username, "password": PASSWORD}),
+    Case("AuthService.refresh_access_token", AuthService.refresh_access_token,
+         lambda s: {"refresh_token": str(RefreshToken.for_user(s["user"]))}),
+    Case("AuthService.update_user_info", AuthService.update_user_info,
+         lambda s: {"data_obj": s["user"], "new_data": {"first_name": "Budget"}}),
+    Case("AuthService.reset_password", AuthService.reset_password,
+         lambda s: {"user_obj": _user_with_password(s),
+                    "data": {"current_password": PASSWORD, "new_password": f"{PASSWORD}-2"}}),
+]
+
+
+def measure(cases) -> dict:
+    """
+    Run ``cases`` against every dataset in a rolled-back transaction and
+    return ``{name: [(count, shapes) per dataset]}``.
+    """
+    measured = {case.name: [] for case in cases}
+
+    # Fast hashing keeps the auth cases quick; it does not change queries.
+    with override_settings(
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+    ), transaction.atomic():
+        for index, (tasks, subtasks, tags, categories) in enumerate(DATASETS):
+            state = seed_dataset(f"query_budget_{index}", 1, tasks, subtasks, tags, categories)[0]
+            # Users always have a data version row once they wrote anything.
+            bump_data_version(state["user"].id)
+
+            for case in cases:
+                with transaction.atomic():
+                    state["user"].refresh_from_db()
+                    kwargs = case.prepare(state)
+                    with QueryRecorder() as recorder:
+                        case.call(**kwargs)
+                    measured[case.name].append((recorder.count, recorder.shapes()))
+                    transaction.set_rollback(True)
+
+        transaction.set_rollback(True)
+
+    return measured
+
+
+class Command(BaseCommand):
+    help = (
+        "Run every service method against two seeded datasets, record the "
+        "queries it executes and fail when a method exceeds its checked-in "
+        "query budget or its query count grows with the data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--update", action="store_true", help="Rewrite the budget file with the measured queries.")
+        parser.add_argument("--budget-file", default=str(BUDGET_FILE))
+        parser.add_argument("--case", action="append", default=None, help="Only check the named cases.")
+
+    def handle(self, *args, **options):
+        cases = CASES
+        if options["case"]:
+            cases = [case for case in CASES if case.name in options["case"]]
+            if not cases:
+                raise CommandError("No matching cases")
+
+        if connection.vendor != "postgresql":
+            raise CommandError("Query budgets are recorded on PostgreSQL")
+
+        measured = measure(cases)
+
+        budgets = load_budgets(options["budget_file"])
+
+        if options["update"]:
+            for name, measurements in measured.items():
+                count, shapes = max(measurements, key=lambda measurement: measurement[0])
+                budgets[name] = {"queries": count, "shapes": shapes}
+            save_budgets(options["budget_file"], budgets)
+            self.stdout.write(f"Recorded budgets for {len(measured)} cases in {options['budget_file']}")
+
+        failures = []
+        for name, measurements in measured.items():
+            budget = budgets.get(name)
+            case_failures = check_budget(name, budget, measurements)
+            failures.extend(case_failures)
+
+            count = max(count for count, _ in measurements)
+            allowed = budget["queries"] if budget else "-"
+            status = "FAIL" if case_failures else ("under" if budget and count < allowed else "ok")
+            self.stdout.write(f"  {status:<5} {name:<42} queries={count} budget={allowed}")
+
+        if failures:
+            raise CommandError("Query budget exceeded:\n" + "\n".join(failures))
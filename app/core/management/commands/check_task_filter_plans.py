@@ -0,0 +1,163 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Mod
+from django.utils import timezone
+
+from app.core.benchmark import seed_dataset
+from app.scheduler.api.task.filters import TaskFilterSchema
+from app.scheduler.api.task.services import TaskServices
+from app.scheduler.models import TaggedItem, Task
+
+
+# Tables whose rows grow with the data; a sequential scan over either of
+# them means a filter combination has no index behind it.
+CHECKED_TABLES = {Task._meta.db_table, TaggedItem._meta.db_table}
+
+
+# (name, params(state, today)) for every supported filter combination.
+COMBINATIONS = [
+    ("default window", lambda s, today: {}),
+    ("scheduled_date", lambda s, today: {"scheduled_date": today + timedelta(days=10)}),
+    ("scheduled range", lambda s, today: {"scheduled_from": today + timedelta(days=30),
+                                          "scheduled_to": today + timedelta(days=60)}),
+    ("deadline range", lambda s, today: {"deadline_from": today + timedelta(days=30),
+                                         "deadline_to": today + timedelta(days=40)}),
+    ("priority", lambda s, today: {"priority": ["H"]}),
+    ("priority many", lambda s, today: {"priority": ["L", "M"]}),
+    ("completed", lambda s, today: {"is_completed": True}),
+    ("not completed", lambda s, today: {"is_completed": False}),
+    ("category", lambda s, today: {"category": s["category_ids"][0]}),
+    ("tags any", lambda s, today: {"tags": s["tag_ids"][:2]}),
+    ("tags all", lambda s, today: {"tags": s["tag_ids"][:2], "tags_match": "all"}),
+    ("free text", lambda s, today: {"q": "1234"}),
+    ("free text prefix", lambda s, today: {"q": "task 12"}),
+    ("priority + range", lambda s, today: {"priority": ["H"], "scheduled_from": today,
+                                           "scheduled_to": today + timedelta(days=30)}),
+    ("completed + range", lambda s, today: {"is_completed": False, "scheduled_from": today,
+                                            "scheduled_to": today + timedelta(days=7)}),
+    ("category + completed", lambda s, today: {"category": s["category_ids"][1], "is_completed": True}),
+    ("deadline + priority", lambda s, today: {"deadline_from": today, "deadline_to": today + timedelta(days=14),
+                                              "priority": ["H", "M"]}),
+    ("tags any + range", lambda s, today: {"tags": s["tag_ids"][:1], "scheduled_from": today,
+                                           "scheduled_to": today + timedelta(days=30)}),
+    ("tags all + completed", lambda s, today: {"tags": s["tag_ids"][:2], "tags_match": "all",
+                                               "is_completed": False}),
+    ("free text + priority", lambda s, today: {"q": "task", "priority": ["H"]}),
+    ("everything", lambda s, today: {"scheduled_from": today, "scheduled_to": today + timedelta(days=90),
+                                     "deadline_from": today, "priority": ["H", "M"], "is_completed": False,
+                                     "category": s["category_ids"][2], "tags": s["tag_ids"][:3], "q": "task"}),
+]
+
+
+def seed(users: int, tasks: int, days: int) -> dict:
+    """
+    Seed ``users`` users with ``tasks`` tasks each, spread so that every
+    filter has a realistic selectivity, and return the state of one of them.
+    """
+    dataset = seed_dataset("filter_plans", users, tasks, 0, 8, 4, days=days)
+
+    # seed_dataset gives every task the same priority, no deadline and
+    # one tag; spread them out so each filter has realistic selectivity.
+    seeded = Task.objects.filter(user__in=[state["user"] for state in dataset]).annotate(bucket=Mod("id", 20))
+    seeded.filter(bucket__lt=2).update(priority_level=Task.PRIORITY_LEVEL_HIGH)
+    seeded.filter(bucket__gte=2, bucket__lt=8).update(priority_level=Task.PRIORITY_LEVEL_LOW)
+    seeded.filter(bucket__gte=10, bucket__lt=15).update(is_completed=True)
+    seeded.filter(bucket__in=[0, 4, 8, 12, 16]).update(dead_line=F("scheduled_date") + timedelta(days=3))
+
+    extra_tags = []
+    for state in dataset:
+        tag_ids = state["tag_ids"]
+        extra_tags.extend(
+            TaggedItem(task_id=task_id, tag_id=tag_ids[(i + 1) % len(tag_ids)])
+            for i, task_id in enumerate(state["task_ids"])
+            if i % 3 == 0
+        )
+    TaggedItem.objects.bulk_create(extra_tags)
+
+    with connection.cursor() as cursor:
+        for table in CHECKED_TABLES:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+
+    return dataset[len(dataset) // 2]
+
+
+def check_plans(state):
+    """
+    EXPLAIN the first and the next page of the task list for every
+    combination; yields ``(name, seq_scans, indexes, plans)``, where
+    ``seq_scans`` are the checked tables scanned sequentially.
+    """
+    today = timezone.now().date()
+
+    for name, params in COMBINATIONS:
+        filters = TaskFilterSchema(**params(state, today)).get_filter_expression()
+        plans = [_explain(state["user"], filters)]
+
+        # The next page adds the keyset condition to the same filters.
+        first_page = TaskServices.get_all_tasks(state["user"], filters=filters)[1]
+        if first_page:
+            plans.append(_explain(state["user"], filters, cursor=first_page))
+
+        scans = [node for plan in plans for node in _nodes(plan)]
+        seq_scans = sorted({
+            node["Relation Name"] for node in scans
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in CHECKED_TABLES
+        })
+        indexes = sorted({node["Index Name"] for node in scans if "Index Name" in node})
+        yield name, seq_scans, indexes, plans
+
+
+def _explain(user_obj, filters, cursor=None):
+    queryset, _ = TaskServices._task_page_queryset(user_obj, filters=filters, cursor=cursor)
+    return json.loads(queryset.explain(format="json"))[0]["Plan"]
+
+
+def _nodes(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _nodes(child)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large task dataset, EXPLAIN the task list query for every "
+        "supported filter combination and fail when any of them plans a "
+        "sequential scan over tasks or tagged items. Everything is rolled "
+        "back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--tasks", type=int, default=5000, help="Tasks per user.")
+        parser.add_argument("--days", type=int, default=365, help="Days the tasks are spread over.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Query plans are only checked on PostgreSQL")
+
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['users']} users with {options['tasks']} tasks each...")
+            state = seed(options["users"], options["tasks"], options["days"])
+            failures = self._check(state, options["verbose_plans"])
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError("Sequential scans planned for: " + ", ".join(failures))
+
+    def _check(self, state, verbose):
+        failures = []
+        for name, seq_scans, indexes, plans in check_plans(state):
+            if seq_scans:
+                failures.append(name)
+            status = "FAIL" if seq_scans else "ok"
+            detail = f"seq scan on {', '.join(seq_scans)}" if seq_scans else ", ".join(indexes)
+            self.stdout.write(f"  {status:<4} {name:<22} {detail}")
+            if verbose:
+                self.stdout.write(json.dumps(plans, indent=2))
+
+        return failures
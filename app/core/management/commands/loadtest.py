@@ -0,0 +1,101 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a running server with concurrent keep-alive clients and report "
+        "throughput and latency percentiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url")
+        parser.add_argument("--token", default=None)
+        parser.add_argument("--method", default="GET")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme != "http":
+            raise CommandError("Only plain http:// targets are supported")
+
+        latencies, errors, elapsed = asyncio.run(self._run(url, options))
+
+        latencies.sort()
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+        self.stdout.write(
+            f"requests={len(latencies) + errors} errors={errors} "
+            f"concurrency={options['concurrency']} elapsed={elapsed:.2f}s "
+            f"throughput={len(latencies) / elapsed:.1f} req/s"
+        )
+        self.stdout.write(
+            f"p50={quantiles[49] * 1000:.2f}ms p95={quantiles[94] * 1000:.2f}ms "
+            f"p99={quantiles[98] * 1000:.2f}ms max={latencies[-1] * 1000:.2f}ms"
+        )
+
+    async def _run(self, url, options):
+        path = url.path or "/"
+        if url.query:
+            path = f"{path}?{url.query}"
+
+        headers = [f"Host: {url.netloc}", "Connection: keep-alive"]
+        if options["token"]:
+            headers.append(f"Authorization: Bearer {options['token']}")
+        request = (
+            f"{options['method']} {path} HTTP/1.1\r\n" + "\r\n".join(headers) + "\r\n\r\n"
+        ).encode()
+
+        remaining = options["requests"]
+        latencies = []
+        errors = 0
+
+        async def client():
+            nonlocal remaining, errors
+            reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+            try:
+                while remaining > 0:
+                    remaining -= 1
+                    start = time.perf_counter()
+                    writer.write(request)
+                    status = await _read_response(reader)
+                    if status < 400:
+                        latencies.append(time.perf_counter() - start)
+                    else:
+                        errors += 1
+            finally:
+                writer.close()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options["concurrency"])))
+        return latencies, errors, time.perf_counter() - start
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed the connection")
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+
+    return status
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.scheduler.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS. Sync "
+        "tokens that old are rejected anyway, so nothing reads them."
+    )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(f"Deleted {deleted} tombstones older than {cutoff:%Y-%m-%d %H:%M}")
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.scheduler.api.task.search_index import TaskSearchIndex
+from app.scheduler.models import Task
+
+
+class Command(BaseCommand):
+    help = "Recompute Task.search_vector for every task, e.g. after changing TASK_SEARCH_CONFIG."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        updated = 0
+
+        while True:
+            task_ids = list(
+                Task.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not task_ids:
+                break
+
+            with transaction.atomic():
+                TaskSearchIndex.refresh(task_ids)
+            updated += len(task_ids)
+            last_id = task_ids[-1]
+
+        self.stdout.write(f"Rebuilt the search vector of {updated} tasks")
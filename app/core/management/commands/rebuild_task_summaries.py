@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from app.core.jobs import enqueue_many
+from app.scheduler.api.task.summary_services import TaskSummaryServices
+
+
+class Command(BaseCommand):
+    help = "Recount TaskDaySummary from the tasks, inline or as jobs for `manage.py run_jobs`."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", dest="user_ids")
+        parser.add_argument("--defer", action="store_true", help="Queue one job per user instead.")
+
+    def handle(self, *args, **options):
+        user_ids = options["user_ids"] or list(get_user_model().objects.values_list("id", flat=True))
+
+        if options["defer"]:
+            enqueue_many(
+                "scheduler.rebuild_task_summary",
+                [{"user_id": user_id} for user_id in user_ids],
+                unique_keys=[f"summary:{user_id}" for user_id in user_ids],
+            )
+            self.stdout.write(f"Queued the summary rebuild of {len(user_ids)} users")
+            return
+
+        for start in range(0, len(user_ids), 500):
+            TaskSummaryServices.rebuild(user_ids[start:start + 500])
+        self.stdout.write(f"Rebuilt the summary of {len(user_ids)} users")
@@ -0,0 +1,26 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.scheduler.reminders.services import DeadlineReminderScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue deadline reminders as tasks near or pass their deadline; "
+        "`manage.py run_jobs` delivers them. Run one per database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Scan once and exit.")
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+        try:
+            DeadlineReminderScheduler().run(stop, once=options["once"])
+        except RuntimeError as e:
+            raise CommandError(str(e))
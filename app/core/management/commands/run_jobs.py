@@ -0,0 +1,49 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from app.core.jobs import JobWorker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued jobs (app/core/jobs.py). Each of --concurrency threads "
+        "claims its own jobs, so several processes can serve the same queues."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queue", action="append", dest="queues",
+                            help="Queue to serve; repeat for several. Defaults to 'default'.")
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--burst", action="store_true", help="Exit once the queues are empty.")
+
+    def handle(self, *args, **options):
+        queues = options["queues"] or ["default"]
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            # Finish the batches in hand, then exit.
+            stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        threads = [
+            threading.Thread(target=self._work, args=(queues, stop, options["burst"]), name=f"jobs-{index}")
+            for index in range(options["concurrency"])
+        ]
+        self.stdout.write(f"Running {len(threads)} workers on {', '.join(queues)}")
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=0.5)
+
+    @staticmethod
+    def _work(queues, stop, burst):
+        try:
+            JobWorker(queues).run(stop, burst=burst)
+        finally:
+            connection.close()
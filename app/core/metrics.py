@@ -0,0 +1,267 @@
+import glob
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import defaultdict
+
+import orjson
+
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric(ABC):
+    type = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self):
+        """Yield ``(sample_name, label_pairs, value)`` tuples."""
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = defaultdict(float)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] += amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+
+class Histogram(Metric):
+    """
+    Bucket counts are stored per bucket and only made cumulative when the
+    samples are read, so ``observe`` is a bisect plus two additions.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [count per bucket..., +Inf count, sum]
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[index] += 1
+            row[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = [(key, list(row)) for key, row in self._values.items()]
+
+        bounds = [_format_bound(bound) for bound in self.buckets] + ["+Inf"]
+        for key, row in values:
+            labels = tuple(zip(self.labelnames, key))
+            total = 0
+            for bound, count in zip(bounds, row):
+                total += count
+                yield f"{self.name}_bucket", labels + (("le", bound),), total
+            yield f"{self.name}_count", labels, total
+            yield f"{self.name}_sum", labels, row[-1]
+
+
+class Registry:
+    """
+    In-process metric registry rendered in the Prometheus text format.
+
+    Every worker process keeps its own registry. With ``multiprocess_dir``
+    set, each process periodically dumps its samples to ``<dir>/<pid>.json``
+    and rendering sums the samples of every file in the directory, so a
+    scrape that lands on any gunicorn worker sees the whole server. Files of
+    exited workers are kept so their counters do not go backwards; clear the
+    directory when the server is restarted.
+    """
+
+    def __init__(self, multiprocess_dir=None, flush_interval=5.0):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._metrics = {}
+        self._last_flush = 0.0
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def collect(self) -> dict:
+        return {
+            name: [(sample, labels, value) for sample, labels, value in metric.samples()]
+            for name, metric in self._metrics.items()
+        }
+
+    def maybe_flush(self):
+        if not self.multiprocess_dir:
+            return
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self._last_flush = now
+            self.flush()
+
+    def flush(self):
+        if not self.multiprocess_dir:
+            return
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        path = os.path.join(self.multiprocess_dir, f"{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(self.collect()))
+        os.replace(tmp_path, path)
+
+    def render(self) -> str:
+        if self.multiprocess_dir:
+            self.flush()
+            collected = self._merge_files()
+        else:
+            collected = self.collect()
+
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for sample, labels, value in collected.get(name, ()):
+                lines.append(f"{sample}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def _merge_files(self) -> dict:
+        merged = defaultdict(dict)
+        for path in glob.glob(os.path.join(self.multiprocess_dir, "*.json")):
+            try:
+                with open(path, "rb") as f:
+                    collected = orjson.loads(f.read())
+            except (OSError, orjson.JSONDecodeError):
+                continue
+
+            for name, samples in collected.items():
+                for sample, labels, value in samples:
+                    key = (sample, tuple(tuple(pair) for pair in labels))
+                    merged[name][key] = merged[name].get(key, 0) + value
+
+        return {
+            name: [(sample, labels, value) for (sample, labels), value in samples.items()]
+            for name, samples in merged.items()
+        }
+
+
+def _format_bound(bound) -> str:
+    return repr(float(bound))
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return "{" + pairs + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _build_registry() -> Registry:
+    from django.conf import settings
+
+    options = settings.METRICS
+    return Registry(
+        multiprocess_dir=options["MULTIPROCESS_DIR"],
+        flush_interval=options["FLUSH_INTERVAL"],
+    )
+
+
+registry = _build_registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency per API operation.",
+    ("route", "method", "status"),
+)
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request",
+    "Number of SQL queries executed per request.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds_per_request",
+    "Total time spent in SQL per request.",
+    ("route",),
+)
+auth_user_cache = registry.counter(
+    "auth_user_cache_lookups_total",
+    "Stateless JWT user cache lookups.",
+    ("result",),
+)
+planetary_cache = registry.counter(
+    "planetary_cache_lookups_total",
+    "Planetary hours cache lookups per day.",
+    ("result",),
+)
+planetary_days_computed = registry.counter(
+    "planetary_days_computed_total",
+    "Days of planetary hours computed from sunrise/sunset.",
+)
+jobs_processed = registry.counter(
+    "jobs_processed_total",
+    "Background jobs finished per handler and result (done, retry, failed).",
+    ("name", "result"),
+)
+job_batch_duration = registry.histogram(
+    "job_batch_duration_seconds",
+    "Time spent running one batch of background jobs.",
+    ("name",),
+)
+job_wait = registry.histogram(
+    "job_wait_seconds",
+    "Delay between a background job becoming due and a worker starting it.",
+    ("name",),
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600),
+)
+deadline_reminders = registry.counter(
+    "deadline_reminders_total",
+    "Deadline reminders per kind and outcome (queued, sent, stale).",
+    ("kind", "result"),
+)
+deadline_reminder_scan = registry.histogram(
+    "deadline_reminder_scan_seconds",
+    "Time the deadline reminder scheduler spends scanning and queueing per wakeup.",
+)
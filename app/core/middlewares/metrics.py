@@ -0,0 +1,66 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from app.core import metrics
+from app.core.queryobserver import observe_queries
+
+
+class QueryCounter:
+    """Query observer counting queries and DB time for one request."""
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def record(self, sql, elapsed):
+        self.count += 1
+        self.duration += elapsed
+
+
+class MetricsMiddleware:
+    """
+    Records latency, query count and DB time of every request, labelled by
+    the matched URL pattern (one per Ninja operation path) so the series
+    stay bounded. Unmatched requests are grouped under ``<unmatched>``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        queries = QueryCounter()
+        start = time.perf_counter()
+        with observe_queries(queries):
+            response = self.get_response(request)
+        self._record(request, response, queries, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        queries = QueryCounter()
+        start = time.perf_counter()
+        with observe_queries(queries):
+            response = await self.get_response(request)
+        self._record(request, response, queries, time.perf_counter() - start)
+        return response
+
+    def _record(self, request, response, queries, elapsed):
+        match = getattr(request, "resolver_match", None)
+        route = f"/{match.route}" if match is not None else "<unmatched>"
+
+        metrics.http_request_duration.observe(
+            elapsed, route=route, method=request.method, status=response.status_code
+        )
+        metrics.db_queries_per_request.observe(queries.count, route=route)
+        metrics.db_query_duration.observe(queries.duration, route=route)
+        metrics.registry.maybe_flush()
@@ -0,0 +1,118 @@
+import heapq
+import logging
+import random
+import time
+from contextlib import nullcontext
+
+import orjson
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from app.core.queryobserver import observe_queries
+
+
+logger = logging.getLogger("app.profiling")
+
+
+class QueryProfile:
+    """
+    Query observer collecting the query count, total DB time and the N
+    slowest statements of one request. A new instance is created for every
+    profiled request, so nothing is shared between concurrent requests.
+    """
+
+    __slots__ = ("count", "duration", "slowest", "keep")
+
+    def __init__(self, keep=5):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+        self.keep = keep
+
+    def record(self, sql, elapsed):
+        self.count += 1
+        self.duration += elapsed
+
+        if self.keep:
+            entry = (elapsed, self.count, sql)
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+
+class RequestProfilerMiddleware:
+    """
+    Logs one structured line per sampled request with wall time, query count,
+    DB time and the slowest queries. Requests slower than ``SLOW_REQUEST_MS``
+    are always logged as warnings; if they were not sampled the line only
+    carries the wall time.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        options = settings.REQUEST_PROFILER
+        self.sample_rate = options["SAMPLE_RATE"]
+        self.slow_request_ms = options["SLOW_REQUEST_MS"]
+        self.slowest_queries = options["SLOWEST_QUERIES"]
+        self.max_sql_length = options["MAX_SQL_LENGTH"]
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        profile = self._new_profile()
+        start = time.perf_counter()
+        with self._capture(profile):
+            response = self.get_response(request)
+        self._report(request, response, profile, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        profile = self._new_profile()
+        start = time.perf_counter()
+        with self._capture(profile):
+            response = await self.get_response(request)
+        self._report(request, response, profile, time.perf_counter() - start)
+        return response
+
+    def _new_profile(self):
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            return QueryProfile(keep=self.slowest_queries)
+        return None
+
+    def _capture(self, profile):
+        return observe_queries(profile) if profile is not None else nullcontext()
+
+    def _report(self, request, response, profile, elapsed):
+        duration_ms = elapsed * 1000
+        slow = duration_ms >= self.slow_request_ms
+        if profile is None and not slow:
+            return
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(duration_ms, 2),
+            "slow": slow,
+        }
+
+        if profile is not None:
+            record["queries"] = profile.count
+            record["db_ms"] = round(profile.duration * 1000, 2)
+            record["slowest_queries"] = [
+                {"ms": round(query_time * 1000, 2), "sql": sql[:self.max_sql_length]}
+                for query_time, _, sql in sorted(profile.slowest, reverse=True)
+            ]
+
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            orjson.dumps(record).decode()
+        )
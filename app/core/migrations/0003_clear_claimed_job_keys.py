@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def clear_claimed_keys(apps, schema_editor):
+    # Claimed jobs no longer keep their unique_key; drop the keys of jobs
+    # claimed before, so requeueing them cannot hit job_unique_queued.
+    Job = apps.get_model('core', 'Job')
+    Job.objects.exclude(status='queued').exclude(unique_key=None).update(unique_key=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_claimed_keys, migrations.RunPython.noop),
+    ]
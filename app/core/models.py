@@ -1,6 +1,51 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 
 
 class User(AbstractUser):
     email = models.EmailField(unique=True)
+
+
+class Job(models.Model):
+    """
+    A unit of deferred work for ``manage.py run_jobs``; see app/core/jobs.py.
+    Finished jobs are deleted, failed ones kept with their last error.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    name = models.CharField(max_length=100)
+    queue = models.CharField(max_length=50, default="default")
+    payload = models.JSONField(default=dict)
+    # At most one queued job per key; enqueueing a duplicate is a no-op.
+    # Cleared when the job is claimed.
+    unique_key = models.CharField(max_length=200, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # The claim query: ready jobs of a queue in run_at order.
+            models.Index(fields=["queue", "run_at", "id"], condition=Q(status="queued"), name="job_ready"),
+            # Expired leases of crashed workers.
+            models.Index(fields=["locked_at"], condition=Q(status="running"), name="job_running"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["unique_key"], condition=Q(status="queued"), name="job_unique_queued"),
+        ]
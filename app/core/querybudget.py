@@ -0,0 +1,97 @@
+import json
+import re
+from collections import Counter
+
+from django.db import connection
+
+
+SQL_TABLE = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE)\s+[`"]?(\w+)[`"]?', re.IGNORECASE)
+SQL_SAVEPOINT = re.compile(r"^(ROLLBACK TO SAVEPOINT|RELEASE SAVEPOINT|SAVEPOINT)\b", re.IGNORECASE)
+
+
+def query_shape(sql: str) -> str:
+    """
+    Reduce a statement to its verb and the tables it touches, e.g.
+    ``SELECT scheduler_task scheduler_taskcategory``. Literals, column lists
+    and the length of ``IN (...)`` lists do not change the shape.
+    """
+    sql = sql.strip()
+    savepoint = SQL_SAVEPOINT.match(sql)
+    if savepoint:
+        return savepoint.group(1).upper()
+
+    verb = sql.split(None, 1)[0].upper() if sql else ""
+    tables = list(dict.fromkeys(SQL_TABLE.findall(sql)))
+    return " ".join([verb, *tables])
+
+
+class QueryRecorder:
+    """
+    Context manager recording every statement executed on ``using`` while
+    active, including queries Django runs for transactions and savepoints.
+    Unlike ``CaptureQueriesContext`` it does not need ``DEBUG`` or
+    ``force_debug_cursor``.
+    """
+
+    def __init__(self, using=connection):
+        self.connection = using
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._wrapper.__exit__(*exc_info)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def shapes(self) -> dict:
+        return dict(sorted(Counter(query_shape(sql) for sql in self.statements).items()))
+
+
+def load_budgets(path) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_budgets(path, budgets: dict):
+    with open(path, "w") as f:
+        json.dump(budgets, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def check_budget(name: str, budget: dict, measurements: list) -> list:
+    """
+    Compare the measurements of one case (one ``(count, shapes)`` pair per
+    dataset size) with its budget. Returns a list of failure messages.
+    """
+    failures = []
+    counts = [count for count, _ in measurements]
+    if len(set(counts)) > 1:
+        failures.append(f"{name}: query count grows with the data ({' -> '.join(map(str, counts))}), likely N+1")
+
+    if budget is None:
+        failures.append(f"{name}: no budget recorded")
+        return failures
+
+    count, shapes = max(measurements, key=lambda measurement: measurement[0])
+    if count > budget["queries"]:
+        failures.append(f"{name}: {count} queries, budget is {budget['queries']}")
+
+    for shape, shape_count in shapes.items():
+        allowed = budget["shapes"].get(shape, 0)
+        if shape_count > allowed:
+            failures.append(f"{name}: {shape_count}x '{shape}', budget allows {allowed}")
+
+    return failures
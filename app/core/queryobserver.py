@@ -0,0 +1,46 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_observers: ContextVar[tuple] = ContextVar("query_observers", default=())
+
+
+@contextmanager
+def observe_queries(observer):
+    """
+    Report every statement run while active to ``observer.record(sql,
+    elapsed)``, on any connection and in any thread that inherits the
+    current context. ``sync_to_async`` copies the context into the thread
+    running the ORM, so this also sees the queries of async views, unlike
+    a ``connection.execute_wrapper`` entered on the calling thread.
+    """
+    token = _observers.set(_observers.get() + (observer,))
+    try:
+        yield observer
+    finally:
+        _observers.reset(token)
+
+
+def install(sender=None, connection=None, **kwargs):
+    """
+    ``connection_created`` receiver adding the dispatching wrapper to each
+    ``DatabaseWrapper`` once. It goes first in ``execute_wrappers``:
+    ``execute_wrapper()`` blocks pop the last entry when they exit.
+    """
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _dispatch)
+
+
+def _dispatch(execute, sql, params, many, context):
+    observers = _observers.get()
+    if not observers:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        for observer in observers:
+            observer.record(sql, elapsed)
@@ -0,0 +1,64 @@
+from datetime import date, datetime, time
+
+import orjson
+from django.http import HttpResponse
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+
+# Dates and times are passed to _default: orjson writes microseconds, the
+# API has always sent milliseconds.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+# Covers what orjson can't encode natively (pydantic models, Decimal,
+# lazy translation strings, ...), same as Ninja's default encoder.
+_fallback_encoder = NinjaJSONEncoder()
+
+
+def dumps(data) -> bytes:
+    return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+
+
+def _datetime(value: datetime) -> str:
+    text = value.isoformat()
+    if value.microsecond:
+        text = text[:23] + text[26:]
+    if text.endswith("+00:00"):
+        text = text[:-6] + "Z"
+    return text
+
+
+def _time(value: time) -> str:
+    text = value.isoformat()
+    return text[:12] if value.microsecond else text
+
+
+# The same output as DjangoJSONEncoder, dispatched on the exact type.
+_TEMPORAL = {datetime: _datetime, date: date.isoformat, time: _time}
+
+
+def _default(value):
+    encode = _TEMPORAL.get(type(value))
+    if encode is not None:
+        return encode(value)
+    return _fallback_encoder.default(value)
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+
+    def render(self, request, data, *, response_status):
+        return dumps(data)
+
+
+class TrustedResponse(HttpResponse):
+    """
+    JSON response for dicts that the service layer already built in the
+    shape of the operation's response schema. Ninja passes ``HttpResponse``
+    objects through untouched, so the data skips Pydantic output validation;
+    the declared ``response=`` schema is then only used for the OpenAPI docs.
+    """
+
+    def __init__(self, data, status=200, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(dumps(data), status=status, **kwargs)
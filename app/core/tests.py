@@ -1,3 +1,176 @@
-from django.test import TestCase
+import asyncio
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import orjson
+from asgiref.sync import sync_to_async
+from django.db import OperationalError, connection
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from app.core import jobs, metrics
+from app.core.management.commands.check_query_budgets import BUDGET_FILE, CASES, measure
+from app.core.middlewares.metrics import MetricsMiddleware
+from app.core.models import Job
+from app.core.middlewares.profiling import RequestProfilerMiddleware
+from app.core.querybudget import check_budget, load_budgets
+from app.core.views import metrics_view
+
+
+PROFILE_EVERY_REQUEST = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 1,
+    "SLOW_REQUEST_MS": 60_000,
+    "SLOWEST_QUERIES": 5,
+    "MAX_SQL_LENGTH": 500,
+}
+
+
+def run_query():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        # Worker threads of sync_to_async keep their own connection.
+        connection.close()
+
+
+def sync_view(request):
+    run_query()
+    return HttpResponse()
+
+
+async def async_view(request):
+    # What the ORM does under ASGI: the query runs in another thread, on
+    # that thread's connection.
+    await sync_to_async(run_query)()
+    return HttpResponse()
+
+
+@override_settings(REQUEST_PROFILER=PROFILE_EVERY_REQUEST)
+class RequestProfilerMiddlewareTests(SimpleTestCase):
+    databases = {"default"}
+
+    def _profile(self, view):
+        request = RequestFactory().get("/profiled/")
+        middleware = RequestProfilerMiddleware(view)
+        with self.assertLogs("app.profiling", "INFO") as logs:
+            if asyncio.iscoroutinefunction(view):
+                asyncio.run(middleware(request))
+            else:
+                middleware(request)
+        return orjson.loads(logs.records[0].getMessage())
+
+    def test_counts_queries_of_sync_views(self):
+        record = self._profile(sync_view)
+        self.assertEqual(record["queries"], 1)
+        self.assertEqual(record["slowest_queries"][0]["sql"], "SELECT 1")
+
+    def test_counts_queries_run_in_sync_to_async_threads(self):
+        record = self._profile(async_view)
+        self.assertEqual(record["queries"], 1)
+        self.assertGreater(record["db_ms"], 0)
+
+
+class MetricsMiddlewareTests(SimpleTestCase):
+    databases = {"default"}
+
+    def _queries(self, view):
+        request = RequestFactory().get("/measured/")
+        middleware = MetricsMiddleware(view)
+        with mock.patch.object(metrics.db_queries_per_request, "observe") as observe:
+            if asyncio.iscoroutinefunction(view):
+                asyncio.run(middleware(request))
+            else:
+                middleware(request)
+        observe.assert_called_once()
+        return observe.call_args.args[0]
+
+    def test_counts_queries_of_sync_views(self):
+        self.assertEqual(self._queries(sync_view), 1)
+
+    def test_counts_queries_run_in_sync_to_async_threads(self):
+        self.assertEqual(self._queries(async_view), 1)
+
+
+class MetricsViewTests(SimpleTestCase):
+    def _get(self, **headers):
+        return metrics_view(RequestFactory().get("/metrics", headers=headers))
+
+    @override_settings(METRICS={"ENABLED": True, "TOKEN": ""})
+    def test_refuses_without_a_token_configured(self):
+        self.assertEqual(self._get().status_code, 403)
+        self.assertEqual(self._get(Authorization="Bearer ").status_code, 403)
+
+    @override_settings(METRICS={"ENABLED": True, "TOKEN": "secret"})
+    def test_requires_the_bearer_token(self):
+        self.assertEqual(self._get().status_code, 403)
+        self.assertEqual(self._get(Authorization="Bearer wrong").status_code, 403)
+        response = self._get(Authorization="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"# TYPE http_request_duration_seconds histogram", response.content)
+
+
+@skipUnless(connection.vendor == "postgresql", "The query budgets are recorded on PostgreSQL")
+class QueryBudgetTests(TestCase):
+    def test_every_case_has_a_budget(self):
+        self.assertEqual(set(load_budgets(BUDGET_FILE)), {case.name for case in CASES})
+
+    def test_services_stay_within_their_query_budgets(self):
+        budgets = load_budgets(BUDGET_FILE)
+        for name, measurements in measure(CASES).items():
+            with self.subTest(name):
+                self.assertEqual(check_budget(name, budgets.get(name), measurements), [])
+
+
+def failing_job(payloads):
+    raise RuntimeError("boom")
+
+
+@mock.patch.dict(jobs.handlers, {"tests.failing": jobs.JobHandler("tests.failing", failing_job)})
+class JobWorkerTests(TestCase):
+    def setUp(self):
+        self.worker = jobs.JobWorker(["default"])
+
+    def _claim_keyed_job(self):
+        jobs.enqueue("tests.failing", {"n": 1}, unique_key="key")
+        claimed = self.worker.claim()
+        # A newer job with the same key is queued while the first one runs.
+        jobs.enqueue("tests.failing", {"n": 2}, unique_key="key")
+        return claimed
+
+    def test_enqueue_skips_a_queued_duplicate(self):
+        jobs.enqueue("tests.failing", {"n": 1}, unique_key="key")
+        jobs.enqueue("tests.failing", {"n": 2}, unique_key="key")
+        self.assertEqual(list(Job.objects.values_list("payload", flat=True)), [{"n": 1}])
+
+    def test_retry_requeues_next_to_a_queued_job_with_the_same_key(self):
+        claimed = self._claim_keyed_job()
+        with self.assertLogs("app.core.jobs", "ERROR"):
+            self.worker._run_batch("tests.failing", jobs.handlers["tests.failing"], claimed)
+
+        self.assertEqual(
+            sorted(Job.objects.values_list("payload__n", "status", "unique_key", "last_error")),
+            [(1, Job.STATUS_QUEUED, None, "RuntimeError: boom"), (2, Job.STATUS_QUEUED, "key", "")],
+        )
+
+    def test_reap_requeues_next_to_a_queued_job_with_the_same_key(self):
+        claimed = self._claim_keyed_job()
+        Job.objects.filter(id=claimed[0].id).update(locked_at=timezone.now() - timedelta(days=1))
+
+        with self.assertLogs("app.core.jobs", "WARNING"):
+            self.assertEqual(self.worker.reap(), 1)
+        self.assertEqual(Job.objects.filter(status=Job.STATUS_QUEUED).count(), 2)
+
+    def test_database_errors_while_failing_a_batch_leave_it_to_the_lease(self):
+        jobs.enqueue("tests.failing", {"n": 1})
+        claimed = self.worker.claim()
+
+        with mock.patch.object(QuerySet, "update", side_effect=OperationalError("gone")), \
+                self.assertLogs("app.core.jobs", "ERROR"):
+            self.worker._fail("tests.failing", claimed, "boom", retry=True)
+            self.assertEqual(self.worker.reap(), 0)
+
+        self.assertEqual(Job.objects.get().status, Job.STATUS_RUNNING)
@@ -1,3 +1,15 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
 
-# Create your views here.
+from app.core.metrics import registry
+
+
+def metrics_view(request):
+    # Route latencies and traffic are not public: no token, no metrics.
+    token = settings.METRICS["TOKEN"]
+    auth_header = request.headers.get("Authorization", "")
+    if not token or not constant_time_compare(auth_header, f"Bearer {token}"):
+        return HttpResponseForbidden()
+
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -4,7 +4,8 @@ from typing import List
 from anydi import auto
 
 from .services import PlanetaryClass
-from  .schema import PlanetHoursSchema, PlanetRequestQuerySchema
+from  .schema import PlanetDaySchema, PlanetHoursSchema, PlanetRangeQuerySchema, PlanetRequestQuerySchema
+from app.core.exceptions import BadRequestError
 
 
 # def inject_service(service_cls):
@@ -28,4 +29,18 @@ def get_hours(request, params: PlanetRequestQuerySchema = Query(), service: Plan
         city_name=params.city,
         date=params.date
     )
-    return hours
\ No newline at end of file
+    return hours
+
+
+@router.get("/range/", response=List[PlanetDaySchema])
+def get_hours_range(request, params: PlanetRangeQuerySchema = Query(), service: PlanetaryClass = auto):
+    try:
+        return service.get_planet_hours_range(
+            latitude=params.lat,
+            longitude=params.lon,
+            city_name=params.city,
+            start=params.start,
+            end=params.end
+        )
+    except ValueError as e:
+        raise BadRequestError(str(e))
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from app.core.cache import LRUCache
+
+
+class PlanetaryCache:
+    """
+    Two-level cache for planetary hours keyed by quantized coordinates and
+    date: an in-process LRU in front of an optional shared Django cache
+    backend (redis, memcached, database, ...).
+    """
+
+    def __init__(self, max_size=2048, precision=2, backend=None, timeout=None):
+        self.precision = precision
+        self.local = LRUCache(max_size=max_size)
+        self.shared = caches[backend] if backend else None
+        self.timeout = timeout
+        self.shared_hits = 0
+
+    @classmethod
+    def from_settings(cls):
+        options = settings.PLANETARY_CACHE
+        return cls(
+            max_size=options["MAX_SIZE"],
+            precision=options["PRECISION"],
+            backend=options["BACKEND"],
+            timeout=options["TIMEOUT"],
+        )
+
+    def quantize(self, latitude: float, longitude: float):
+        return round(latitude, self.precision), round(longitude, self.precision)
+
+    def get(self, latitude: float, longitude: float, date):
+        key = self._key(latitude, longitude, date)
+
+        hours = self.local.get(key)
+        if hours is None and self.shared is not None:
+            hours = self.shared.get(key)
+            if hours is not None:
+                self.shared_hits += 1
+                self.local.set(key, hours)
+
+        return hours
+
+    def set(self, latitude: float, longitude: float, date, hours: list):
+        key = self._key(latitude, longitude, date)
+
+        self.local.set(key, hours)
+        if self.shared is not None:
+            self.shared.set(key, hours, self.timeout)
+
+    def stats(self) -> dict:
+        return {**self.local.stats(), "shared_hits": self.shared_hits}
+
+    def _key(self, latitude: float, longitude: float, date) -> str:
+        return f"planetary:{latitude}:{longitude}:{date.isoformat()}"
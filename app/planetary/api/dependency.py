@@ -1,4 +1,5 @@
 from anydi import Container
+from .cache import PlanetaryCache
 from .services import PlanetaryClass
 
 def get_service() -> Container:
@@ -6,6 +7,6 @@ def get_service() -> Container:
 
     @container.provider(scope="singleton")
     def service() -> PlanetaryClass:
-        return PlanetaryClass()
+        return PlanetaryClass(cache=PlanetaryCache.from_settings())
     
     return container
\ No newline at end of file
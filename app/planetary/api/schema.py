@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 from ninja import Schema, FilterSchema
 
 
@@ -15,3 +15,16 @@ class PlanetRequestQuerySchema(FilterSchema):
     lon: float
     city: str
     date: Optional[str] = None
+
+
+class PlanetDaySchema(Schema):
+    date: date
+    hours: List[PlanetHoursSchema]
+
+
+class PlanetRangeQuerySchema(FilterSchema):
+    lat: float
+    lon: float
+    city: str
+    start: str
+    end: str
@@ -1,11 +1,15 @@
 from datetime import datetime, timedelta
 from astral import LocationInfo
-from astral.sun import sun
+from astral.sun import sun, sunrise as sun_rise
+from django.conf import settings
+
+from app.core.metrics import planetary_cache, planetary_days_computed
 
 
 class PlanetaryClass:
 
-    def __init__(self):
+    def __init__(self, cache=None):
+        self.cache = cache
         self.PLANETS = ["Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon"]
         self.DAY_PLANET = {
             5: "Saturn",    # saturday
@@ -16,8 +20,61 @@ class PlanetaryClass:
             3: "Jupiter",
             4: "Venus",     # Friday
         }
+        # Ruling planet of each of the 24 hours, per weekday.
+        self.HOUR_PLANETS = {
+            weekday: [
+                self.PLANETS[(self.PLANETS.index(first_planet) + i) % 7].lower()
+                for i in range(24)
+            ]
+            for weekday, first_planet in self.DAY_PLANET.items()
+        }
 
     def get_planet_hours(self, latitude: float, longitude: float, city_name: str, date: str = None):
+        today = datetime.today().date() if not date else self._get_time(date).date()
+        return self._get_days(latitude, longitude, city_name, [today])[0]
+
+    def get_planet_hours_range(self, latitude: float, longitude: float, city_name: str, start: str, end: str):
+        start_date = self._get_time(start).date()
+        end_date = self._get_time(end).date()
+
+        if end_date < start_date:
+            raise ValueError("'end' must not be before 'start'")
+
+        span = (end_date - start_date).days + 1
+        max_days = settings.PLANETARY_RANGE_MAX_DAYS
+        if span > max_days:
+            raise ValueError(f"Date range can span at most {max_days} days")
+
+        days = [start_date + timedelta(days=i) for i in range(span)]
+        hours = self._get_days(latitude, longitude, city_name, days)
+
+        return [{"date": day, "hours": day_hours} for day, day_hours in zip(days, hours)]
+
+    def _get_days(self, latitude: float, longitude: float, city_name: str, days: list) -> list:
+        if self.cache is None:
+            return self._compute_days(latitude, longitude, city_name, days)
+
+        # Sunrise/sunset barely move within the quantization step, so compute
+        # with the rounded coordinates and share the result across callers.
+        latitude, longitude = self.cache.quantize(latitude, longitude)
+        hours = [self.cache.get(latitude, longitude, day) for day in days]
+
+        missing = [i for i, day_hours in enumerate(hours) if day_hours is None]
+        planetary_cache.inc(len(days) - len(missing), result="hit")
+        planetary_cache.inc(len(missing), result="miss")
+        if missing:
+            # One pass over the span between the first and last miss is cheaper
+            # than computing each missing day on its own.
+            first, last = missing[0], missing[-1]
+            computed = self._compute_days(latitude, longitude, city_name, days[first:last + 1])
+            for i, day_hours in enumerate(computed, start=first):
+                if hours[i] is None:
+                    hours[i] = day_hours
+                    self.cache.set(latitude, longitude, days[i], day_hours)
+
+        return hours
+
+    def _compute_days(self, latitude: float, longitude: float, city_name: str, days: list) -> list:
         location = LocationInfo(
             name=city_name,
             region='Custom',
@@ -26,57 +83,51 @@ class PlanetaryClass:
             longitude=longitude
         )
 
-        today = datetime.today().date() if not date else self._get_time(date).date()
-
-        sun_times = sun(
-        observer=location.observer,
-        date=today,
-        tzinfo=location.timezone
-        )
-        sunrise, sunset = sun_times["sunrise"], sun_times["sunset"]
-
-        tomorrow = today + timedelta(days=1)
-        sun_times_tommorow = sun(
-        observer=location.observer,
-        date=tomorrow,
-        tzinfo=location.timezone
-        )
-        next_sunrise = sun_times_tommorow["sunrise"]
-
+        planetary_days_computed.inc(len(days))
+
+        sunrises, sunsets = [], []
+        for day in days:
+            sun_times = sun(
+                observer=location.observer,
+                date=day,
+                tzinfo=location.timezone
+            )
+            sunrises.append(sun_times["sunrise"])
+            sunsets.append(sun_times["sunset"])
+
+        # Each day's night ends at the next day's sunrise, so only the day
+        # after the range needs an extra lookup.
+        sunrises.append(sun_rise(
+            observer=location.observer,
+            date=days[-1] + timedelta(days=1),
+            tzinfo=location.timezone
+        ))
+
+        return [
+            self._build_hours(day.weekday(), sunrises[i], sunsets[i], sunrises[i + 1])
+            for i, day in enumerate(days)
+        ]
+
+    def _build_hours(self, weekday: int, sunrise: datetime, sunset: datetime, next_sunrise: datetime) -> list:
         day_length = (sunset - sunrise) / 12
         night_length = (next_sunrise - sunset) / 12
 
-        weekday = today.weekday()
-        first_planet = self.DAY_PLANET[weekday]
-        start_index = self.PLANETS.index(first_planet)
-
-        hours = []
-        current_time = sunrise
-
-        for i in range(12):
-            planet = self.PLANETS[(start_index + i) % 7]
-            end_time = current_time + day_length
-            hours.append({
-                "hour": i + 1, 
-                "planet": planet.lower(),
-                "start_time": current_time,
-                "end_time": end_time
-            })
-            current_time = end_time
-
-        for i in range(12):
-            planet = self.PLANETS[(start_index + 12 + i) % 7]
-            end_time = current_time + night_length
-            hours.append({
-                "hour": i + 13, 
-                "planet": planet.lower(),
-                "start_time": current_time,
-                "end_time": end_time
-            })
-            current_time = end_time
-
-    
-        return hours
+        # Hour boundaries as offsets from sunrise: 13 day edges, then 12 more
+        # night edges counted from the end of the twelfth day hour.
+        night_start = sunrise + day_length * 12
+        boundaries = [sunrise + day_length * k for k in range(13)]
+        boundaries += [night_start + night_length * k for k in range(1, 13)]
+
+        planets = self.HOUR_PLANETS[weekday]
+        return [
+            {
+                "hour": i + 1,
+                "planet": planets[i],
+                "start_time": boundaries[i],
+                "end_time": boundaries[i + 1]
+            }
+            for i in range(24)
+        ]
 
 
     def _get_time(self, date: str) -> datetime:
@@ -84,4 +135,3 @@ class PlanetaryClass:
             return datetime.strptime(date, "%Y-%m-%d")
         except ValueError as e:
             raise ValueError(f"Invalid date format '{date}', expected YYYY-MM-DD") from e
-
@@ -0,0 +1,14 @@
+from ninja import Field, Schema
+from datetime import datetime, time
+from typing import Optional
+
+
+class AgendaQuerySchema(Schema):
+    date_from: datetime = Field(..., alias="from")
+    date_to: datetime = Field(..., alias="to")
+
+
+class FreeSlotsQuerySchema(AgendaQuerySchema):
+    min_minutes: int = Field(30, ge=1, le=24 * 60)
+    day_start: Optional[time] = None
+    day_end: Optional[time] = None
@@ -0,0 +1,59 @@
+from typing import List
+from ninja import Query, Router
+from django.core.exceptions import ValidationError
+
+from app.authentication.api.auth import JWTAuth
+from app.core.exceptions import BadRequestError
+from app.core.renderers import TrustedResponse
+from app.scheduler.api.schemas import FreeSlotSchema, FullTaskSchemaOut
+from app.scheduler.api.versioning import get_data_version, make_list_etag, not_modified
+from .filters import AgendaQuerySchema, FreeSlotsQuerySchema
+from .services import AgendaServices
+
+
+router = Router(tags=["Agenda"], auth=JWTAuth())
+
+
+@router.get("/agenda/", response=List[FullTaskSchemaOut])
+def get_agenda(request, params: AgendaQuerySchema = Query()):
+    etag = make_list_etag(request, "agenda", get_data_version(request.auth.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    try:
+        tasks = AgendaServices.get_agenda(
+            user_obj=request.auth,
+            date_from=params.date_from,
+            date_to=params.date_to
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+
+    response = TrustedResponse(tasks)
+    response["ETag"] = etag
+    return response
+
+
+@router.get("/free-slots/", response=List[FreeSlotSchema])
+def get_free_slots(request, params: FreeSlotsQuerySchema = Query()):
+    etag = make_list_etag(request, "free-slots", get_data_version(request.auth.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    try:
+        slots = AgendaServices.get_free_slots(
+            user_obj=request.auth,
+            date_from=params.date_from,
+            date_to=params.date_to,
+            min_minutes=params.min_minutes,
+            day_start=params.day_start,
+            day_end=params.day_end
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+
+    response = TrustedResponse(slots)
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,174 @@
+from bisect import bisect_right
+from datetime import datetime, time, timedelta
+from typing import List
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.backends.postgresql.psycopg_any import NumericRange
+from django.db.models import F, Q
+from django.utils import timezone
+
+from app.scheduler.models import Task
+from app.scheduler.api.recurrence.occurrences import OccurrenceServices
+from app.scheduler.api.task.read_models import TaskReadModel, TaskRow
+from app.scheduler.api.task.utils import EPOCH, busy_range
+
+
+class AgendaServices:
+    """
+    Calendar reads over ``Task.busy_range``. Both queries are overlap
+    searches on the (user, busy_range) GiST index, so they cost the number
+    of tasks in the window rather than the number the user owns.
+
+    Task times are wall-clock times without a zone. Request bounds that
+    carry an offset are converted to the current time zone and compared as
+    naive datetimes. Recurring tasks take part through their occurrences in
+    the window, expanded by ``OccurrenceServices``.
+    """
+
+    @staticmethod
+    def get_agenda(user_obj, date_from: datetime, date_to: datetime) -> List[TaskRow]:
+        """Timed tasks overlapping the window plus untimed tasks on the days it covers."""
+        date_from, date_to = AgendaServices._window(date_from, date_to)
+        last_day = (date_to - timedelta(microseconds=1)).date()
+
+        window = AgendaServices._range(date_from, date_to)
+        queryset = Task.objects.filter(
+            Q(busy_range__overlap=window)
+            | Q(start_time__isnull=True, scheduled_date__range=[date_from.date(), last_day]),
+            user=user_obj,
+            is_recurring=False,
+        ).order_by("scheduled_date", F("start_time").asc(nulls_first=True), "id")
+        tasks = TaskReadModel.fetch(user_obj, queryset)
+
+        occurrences = [
+            occurrence for occurrence in OccurrenceServices.between(user_obj, date_from.date(), last_day)
+            if occurrence.start_time is None or AgendaServices._overlaps(occurrence, window)
+        ]
+        if not occurrences:
+            return tasks
+
+        return sorted(tasks + occurrences, key=lambda task: (
+            task.scheduled_date, task.start_time is not None, task.start_time or time.min, task.id
+        ))
+
+    @staticmethod
+    def get_free_slots(user_obj, date_from: datetime, date_to: datetime, min_minutes: int = 30,
+                       day_start: time = None, day_end: time = None) -> List[dict]:
+        """
+        Gaps of at least ``min_minutes`` between tasks that have both a start
+        and an end time, optionally limited to ``day_start``..``day_end`` on
+        each day. Tasks without an end time are reminders and block nothing.
+        """
+        date_from, date_to = AgendaServices._window(date_from, date_to)
+        if day_start and day_end and day_end <= day_start:
+            raise ValidationError("'day_end' must be after 'day_start'")
+
+        window = AgendaServices._range(date_from, date_to)
+        ranges = list(
+            Task.objects
+            .filter(
+                user=user_obj,
+                is_recurring=False,
+                end_time__isnull=False,
+                busy_range__overlap=window
+            )
+            .order_by("busy_range")
+            .values_list("busy_range", flat=True)
+        )
+        occurrence_ranges = [
+            busy_range(occurrence.scheduled_date, occurrence.start_time, occurrence.end_time)
+            for occurrence in OccurrenceServices.between(
+                user_obj, date_from.date(), (date_to - timedelta(microseconds=1)).date()
+            )
+            if occurrence.start_time and occurrence.end_time
+        ]
+        if occurrence_ranges:
+            ranges = sorted(ranges + occurrence_ranges, key=lambda busy: busy.lower)
+        busy = AgendaServices._merge(ranges)
+        busy_ends = [upper for _, upper in busy]
+        min_seconds = min_minutes * 60
+
+        slots = []
+        for opening_start, opening_end in AgendaServices._openings(date_from, date_to, day_start, day_end):
+            cursor = opening_start
+            # First busy interval that ends after the opening starts.
+            index = bisect_right(busy_ends, opening_start)
+            while index < len(busy) and busy[index][0] < opening_end:
+                lower, upper = busy[index]
+                if lower - cursor >= min_seconds:
+                    slots.append(AgendaServices._slot(cursor, lower))
+                cursor = max(cursor, upper)
+                index += 1
+
+            if opening_end - cursor >= min_seconds:
+                slots.append(AgendaServices._slot(cursor, opening_end))
+
+        return slots
+
+    @staticmethod
+    def _window(date_from: datetime, date_to: datetime):
+        if timezone.is_aware(date_from):
+            date_from = timezone.make_naive(date_from)
+        if timezone.is_aware(date_to):
+            date_to = timezone.make_naive(date_to)
+
+        if date_to <= date_from:
+            raise ValidationError("'to' must be after 'from'")
+
+        max_days = settings.AGENDA_MAX_DAYS
+        if date_to - date_from > timedelta(days=max_days):
+            raise ValidationError(f"The window can span at most {max_days} days")
+
+        return date_from, date_to
+
+    @staticmethod
+    def _openings(date_from: datetime, date_to: datetime, day_start: time, day_end: time) -> List[tuple]:
+        """The parts of the window free slots may fall in, as epoch-second pairs."""
+        if day_start is None and day_end is None:
+            return [(AgendaServices._seconds(date_from), AgendaServices._seconds(date_to))]
+
+        openings = []
+        day = date_from.date()
+        while day <= date_to.date():
+            start = datetime.combine(day, day_start or time.min)
+            end = datetime.combine(day, day_end) if day_end else datetime.combine(day + timedelta(days=1), time.min)
+            start, end = max(start, date_from), min(end, date_to)
+            if start < end:
+                openings.append((AgendaServices._seconds(start), AgendaServices._seconds(end)))
+            day += timedelta(days=1)
+
+        return openings
+
+    @staticmethod
+    def _merge(ranges) -> List[tuple]:
+        """Collapse ranges sorted by their lower bound into disjoint (lower, upper) pairs."""
+        merged = []
+        for busy_range in ranges:
+            if merged and busy_range.lower <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], busy_range.upper))
+            else:
+                merged.append((busy_range.lower, busy_range.upper))
+        return merged
+
+    @staticmethod
+    def _overlaps(task: TaskRow, window: NumericRange) -> bool:
+        # Same bounds as Task.busy_range: no end time occupies the start second.
+        occupied = busy_range(task.scheduled_date, task.start_time, task.end_time or task.start_time)
+        upper = occupied.upper if task.end_time else occupied.lower + 1
+        return occupied.lower < window.upper and window.lower < upper
+
+    @staticmethod
+    def _range(date_from: datetime, date_to: datetime) -> NumericRange:
+        return NumericRange(AgendaServices._seconds(date_from), AgendaServices._seconds(date_to))
+
+    @staticmethod
+    def _seconds(value: datetime) -> int:
+        return (value - EPOCH) // timedelta(seconds=1)
+
+    @staticmethod
+    def _slot(start: int, end: int) -> dict:
+        return {
+            "start": EPOCH + timedelta(seconds=start),
+            "end": EPOCH + timedelta(seconds=end),
+            "minutes": (end - start) // 60,
+        }
@@ -1,3 +1,4 @@
+from django.http import HttpResponse
 from ninja import Router
 from app.authentication.api.auth import JWTAuth
 from typing import List
@@ -5,6 +6,7 @@ from typing import List
 from app.core.exceptions import BadRequestError, NotFoundError
 from app.scheduler.api.schemas import TaskCategorySchema, TaskCategorySchemaIn
 from app.scheduler.models import TaskCategory
+from app.scheduler.api.versioning import get_data_version, make_list_etag, not_modified
 from .services import CategoryServices
 
 
@@ -13,7 +15,13 @@ router = Router(tags=["Categories"], auth=JWTAuth())
 
 
 @router.get("/", response=List[TaskCategorySchema])
-def get_categories(request):
+def get_categories(request, response: HttpResponse):
+    etag = make_list_etag(request, "categories", get_data_version(request.auth.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    response["ETag"] = etag
     categories =  CategoryServices.get_all_categories(request.auth)
     return categories
 
@@ -1,5 +1,7 @@
-from django.db import IntegrityError
-from app.scheduler.models import TaskCategory
+from django.db import IntegrityError, transaction
+from app.scheduler.models import TaskCategory, Tombstone
+from app.scheduler.api.tombstones import record_deletions
+from app.scheduler.api.versioning import bump_data_version
 
 
 class CategoryServices:
@@ -27,7 +29,8 @@ class CategoryServices:
                 title=title.strip().capitalize(),
                 user=user
             )
-            
+            bump_data_version(user.id)
+
             return category
         except IntegrityError:
             raise ValueError("The category already exists")
@@ -39,6 +42,7 @@ class CategoryServices:
         try:
             data_obj.title = title.strip().capitalize()
             data_obj.save()
+            bump_data_version(data_obj.user_id)
 
             return data_obj
         except IntegrityError:
@@ -52,7 +56,10 @@ class CategoryServices:
                 pk=id,
                 user=user
             )
-            category.delete()
+            with transaction.atomic():
+                record_deletions(user.id, Tombstone.KIND_CATEGORY, [category.id])
+                category.delete()
+                bump_data_version(user.id)
             return True
         except TaskCategory.DoesNotExist:
             return False
\ No newline at end of file
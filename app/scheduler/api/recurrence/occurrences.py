@@ -0,0 +1,177 @@
+import heapq
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from app.scheduler.models import Task, TaskOccurrence, TaskRecurrence
+from app.scheduler.api.task.read_models import OccurrenceRow, TaskReadModel, TaskRow
+from app.scheduler.api.task.utils import decode_cursor
+from .rules import RULE_COLUMNS, Rule, between
+
+
+@dataclass
+class SeriesFilter:
+    """
+    The task list filters as they apply to occurrences. ``master`` filters
+    the series themselves (priority, category, tags, text); the date and
+    completion filters are checked per occurrence, whose deadline keeps the
+    series' distance from scheduled date to deadline. With ``overdue``,
+    occurrences before ``scheduled_from`` whose deadline is still ahead are
+    included too, like the default window of the list.
+    """
+
+    master: Q = field(default_factory=Q)
+    scheduled_from: Optional[date] = None
+    scheduled_to: Optional[date] = None
+    deadline_from: Optional[date] = None
+    deadline_to: Optional[date] = None
+    is_completed: Optional[bool] = None
+    overdue: bool = False
+
+    def window(self, series: TaskRow, today: date) -> Optional[Tuple[date, date]]:
+        lows, highs = [series.scheduled_date], []
+        offset = series.dead_line - series.scheduled_date if series.dead_line else None
+
+        if self.scheduled_from:
+            lows.append(self.scheduled_from - offset if self.overdue and offset else self.scheduled_from)
+        if self.scheduled_to:
+            highs.append(self.scheduled_to)
+        if self.deadline_from or self.deadline_to:
+            if offset is None:
+                return None
+            if self.deadline_from:
+                lows.append(self.deadline_from - offset)
+            if self.deadline_to:
+                highs.append(self.deadline_to - offset)
+
+        low = max(lows)
+        high = min(highs) if highs else max(low, today) + timedelta(days=settings.RECURRENCE_HORIZON_DAYS)
+        return (low, high) if low <= high else None
+
+    def accepts(self, occurrence: OccurrenceRow) -> bool:
+        return self.is_completed is None or occurrence.is_completed == self.is_completed
+
+
+class OccurrenceServices:
+    """
+    Lazy expansion of recurring tasks. Only the requested window (or page)
+    is expanded, and only the exceptions stored for it are read; a user
+    without recurring tasks costs one query on the partial
+    ``task_user_recurring`` index.
+    """
+
+    @staticmethod
+    def page(user_obj, series_filter: SeriesFilter, cursor: str = None, limit: int = None) -> List[OccurrenceRow]:
+        """
+        Up to ``limit + 1`` occurrences after ``cursor`` in the list's
+        (scheduled_date, id) order, ready to merge with a page of tasks.
+        """
+        series = OccurrenceServices._series(user_obj, series_filter.master)
+        if not series:
+            return []
+
+        after = decode_cursor(cursor) if cursor else None
+        today = timezone.now().date()
+        streams = []
+        for row, rule in series:
+            window = series_filter.window(row, today)
+            if window and after:
+                window = (max(window[0], after[0]), window[1])
+            if window and window[0] <= window[1]:
+                streams.append(OccurrenceServices._stream(row, rule, window, after))
+
+        candidates = heapq.merge(*streams, key=lambda candidate: candidate[:2])
+        occurrences = []
+        # Exceptions are read for the span of each batch of candidates; a
+        # batch only falls short of the page when occurrences are cancelled
+        # or filtered out by completion.
+        while len(occurrences) <= limit:
+            batch = list(islice(candidates, limit + 1 - len(occurrences)))
+            if not batch:
+                break
+
+            exceptions = OccurrenceServices._exceptions(
+                {row.id for _, _, row in batch}, batch[0][0], batch[-1][0]
+            )
+            for day, _, row in batch:
+                occurrence = OccurrenceServices._occurrence(row, day, exceptions.get((row.id, day)))
+                if occurrence and series_filter.accepts(occurrence):
+                    occurrences.append(occurrence)
+
+        return occurrences
+
+    @staticmethod
+    def between(user_obj, day_from: date, day_to: date) -> List[OccurrenceRow]:
+        """Every occurrence from ``day_from`` to ``day_to`` inclusive, in (date, id) order."""
+        series = OccurrenceServices._series(user_obj)
+        if not series:
+            return []
+
+        exceptions = OccurrenceServices._exceptions({row.id for row, _ in series}, day_from, day_to)
+        occurrences = []
+        for row, rule in series:
+            for day in between(rule, day_from, day_to):
+                occurrence = OccurrenceServices._occurrence(row, day, exceptions.get((row.id, day)))
+                if occurrence:
+                    occurrences.append(occurrence)
+
+        occurrences.sort(key=lambda occurrence: (occurrence.scheduled_date, occurrence.id))
+        return occurrences
+
+    @staticmethod
+    def _series(user_obj, master=Q()) -> List[Tuple[TaskRow, Rule]]:
+        rows = TaskReadModel.fetch(
+            user_obj,
+            Task.objects.filter(master, user=user_obj, is_recurring=True).order_by("id")
+        )
+        if not rows:
+            return []
+
+        rules = {
+            task_id: values
+            for task_id, *values in TaskRecurrence.objects.filter(
+                task_id__in=[row.id for row in rows]
+            ).values_list(*RULE_COLUMNS)
+        }
+        return [(row, Rule.of(row.scheduled_date, *rules[row.id])) for row in rows if row.id in rules]
+
+    @staticmethod
+    def _stream(row: TaskRow, rule: Rule, window: Tuple[date, date], after) -> Iterator[tuple]:
+        for day in between(rule, *window):
+            if after is None or (day, row.id) > after:
+                yield day, row.id, row
+
+    @staticmethod
+    def _exceptions(task_ids, day_from: date, day_to: date) -> Dict[tuple, tuple]:
+        values = TaskOccurrence.objects.filter(
+            task_id__in=task_ids, occurrence_date__range=[day_from, day_to]
+        ).values_list("task_id", "occurrence_date", "is_cancelled", "is_completed", "start_time", "end_time")
+        return {(task_id, day): rest for task_id, day, *rest in values}
+
+    @staticmethod
+    def _occurrence(row: TaskRow, day: date, exception: Optional[tuple]) -> Optional[OccurrenceRow]:
+        is_cancelled, is_completed, start_time, end_time = exception or (False, False, None, None)
+        if is_cancelled:
+            return None
+
+        return OccurrenceRow(
+            row.id,
+            row.title,
+            row.description,
+            row.category,
+            row.priority_level,
+            day,
+            day + (row.dead_line - row.scheduled_date) if row.dead_line else None,
+            start_time or row.start_time,
+            end_time or row.end_time,
+            is_completed,
+            row.created_at,
+            row.updated_at,
+            row.subTasks,
+            row.tags,
+            recurring_task=row.id,
+        )
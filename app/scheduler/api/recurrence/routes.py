@@ -0,0 +1,59 @@
+from datetime import date
+from ninja import Router
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+
+from app.authentication.api.auth import JWTAuth
+from app.core.exceptions import BadRequestError, NotFoundError
+from app.core.renderers import TrustedResponse
+from app.scheduler.api.schemas import (
+    TaskOccurrenceSchemaIn, TaskOccurrenceSchemaOut, TaskRecurrenceSchemaIn, TaskRecurrenceSchemaOut
+)
+from .services import RecurrenceServices
+
+
+router = Router(tags=["Recurrence"], auth=JWTAuth())
+
+
+@router.get("/{id}/recurrence/", response=TaskRecurrenceSchemaOut)
+def get_recurrence(request, id: int):
+    try:
+        rule = RecurrenceServices.get_rule(user_obj=request.auth, task_id=id)
+    except ObjectDoesNotExist as e:
+        raise NotFoundError(str(e))
+    return TrustedResponse(rule)
+
+
+@router.put("/{id}/recurrence/", response=TaskRecurrenceSchemaOut)
+def set_recurrence(request, id: int, data: TaskRecurrenceSchemaIn):
+    try:
+        rule = RecurrenceServices.set_rule(user_obj=request.auth, task_id=id, data=data.model_dump())
+    except ObjectDoesNotExist as e:
+        raise NotFoundError(str(e))
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+    return TrustedResponse(rule)
+
+
+@router.delete("/{id}/recurrence/", response={204: None})
+def delete_recurrence(request, id: int):
+    try:
+        RecurrenceServices.delete_rule(user_obj=request.auth, task_id=id)
+    except ObjectDoesNotExist as e:
+        raise NotFoundError(str(e))
+    return 204, None
+
+
+@router.put("/{id}/occurrences/{occurrence_date}/", response=TaskOccurrenceSchemaOut)
+def update_occurrence(request, id: int, occurrence_date: date, data: TaskOccurrenceSchemaIn):
+    try:
+        occurrence = RecurrenceServices.update_occurrence(
+            user_obj=request.auth,
+            task_id=id,
+            occurrence_date=occurrence_date,
+            data=data.model_dump(exclude_unset=True)
+        )
+    except ObjectDoesNotExist as e:
+        raise NotFoundError(str(e))
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+    return TrustedResponse(occurrence)
@@ -0,0 +1,130 @@
+from calendar import monthrange
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Optional, Tuple
+from django.conf import settings
+
+from app.scheduler.models import TaskRecurrence
+
+
+# Occurrences are expanded in blocks of CHUNK_DAYS days aligned on the
+# proleptic ordinal, and blocks are cached, so overlapping windows (and the
+# pages of one list) share the work.
+CHUNK_DAYS = 28
+
+RULE_COLUMNS = ("task_id", "freq", "interval", "weekdays", "until", "count")
+
+
+class Rule(NamedTuple):
+    """Hashable form of a ``TaskRecurrence`` together with its series start."""
+
+    dtstart: date
+    freq: str
+    interval: int
+    weekdays: Tuple[int, ...]
+    until: Optional[date]
+    count: Optional[int]
+
+    @classmethod
+    def of(cls, dtstart: date, freq: str, interval: int, weekdays: int,
+           until: Optional[date], count: Optional[int]) -> 'Rule':
+        days = tuple(day for day in range(7) if weekdays & (1 << day))
+        if freq == TaskRecurrence.FREQ_WEEKLY and not days:
+            days = (dtstart.weekday(),)
+        return cls(dtstart, freq, interval, days, until, count)
+
+
+def between(rule: Rule, start: date, end: date) -> Iterator[date]:
+    """Occurrence dates of ``rule`` from ``start`` to ``end`` inclusive, in order."""
+    start = max(start, rule.dtstart)
+    for index in range(start.toordinal() // CHUNK_DAYS, end.toordinal() // CHUNK_DAYS + 1):
+        dates, ended = _chunk(rule, index)
+        for day in dates:
+            if day > end:
+                return
+            if day >= start:
+                yield day
+        if ended:
+            return
+
+
+def includes(rule: Rule, day: date) -> bool:
+    return day >= rule.dtstart and day in _chunk(rule, day.toordinal() // CHUNK_DAYS)[0]
+
+
+@lru_cache(maxsize=settings.RECURRENCE_CACHE_SIZE)
+def _chunk(rule: Rule, index: int) -> Tuple[Tuple[date, ...], bool]:
+    """The occurrences in block ``index`` and whether the series ends in it."""
+    chunk_start = date.fromordinal(max(index * CHUNK_DAYS, 1))
+    chunk_end = date.fromordinal((index + 1) * CHUNK_DAYS - 1)
+    if chunk_end < rule.dtstart:
+        return (), False
+
+    dates = []
+    for seq, day in CANDIDATES[rule.freq](rule, max(chunk_start, rule.dtstart)):
+        if (rule.count is not None and seq >= rule.count) or (rule.until and day > rule.until):
+            return tuple(dates), True
+        if day > chunk_end:
+            return tuple(dates), False
+        dates.append(day)
+
+
+# Each generator jumps straight to the first occurrence on or after ``lo``
+# and yields (sequence number in the series, date) from there on; the
+# sequence number is what COUNT is checked against.
+
+def _daily(rule: Rule, lo: date):
+    step = rule.interval
+    seq = -(-(lo - rule.dtstart).days // step)
+    while True:
+        yield seq, rule.dtstart + timedelta(days=seq * step)
+        seq += 1
+
+
+def _weekly(rule: Rule, lo: date):
+    first_week = [day for day in rule.weekdays if day >= rule.dtstart.weekday()]
+    week0 = rule.dtstart - timedelta(days=rule.dtstart.weekday())
+    period = 7 * rule.interval
+
+    week = (lo - week0).days // period
+    seq = len(first_week) + (week - 1) * len(rule.weekdays) if week else 0
+    while True:
+        week_start = week0 + timedelta(days=week * period)
+        for day in (rule.weekdays if week else first_week):
+            occurrence = week_start + timedelta(days=day)
+            if occurrence >= lo:
+                yield seq, occurrence
+            seq += 1
+        week += 1
+
+
+def _monthly(rule: Rule, lo: date):
+    # Months without the start's day of month are skipped, as in RFC 5545.
+    def month_date(step):
+        month = rule.dtstart.month - 1 + step * rule.interval
+        year, month = rule.dtstart.year + month // 12, month % 12 + 1
+        if rule.dtstart.day <= monthrange(year, month)[1]:
+            return date(year, month, rule.dtstart.day)
+        return None
+
+    months = (lo.year - rule.dtstart.year) * 12 + lo.month - rule.dtstart.month
+    step = max(0, -(-months // rule.interval))
+    if rule.dtstart.day <= 28:
+        seq = step
+    else:
+        seq = sum(1 for previous in range(step) if month_date(previous))
+
+    while True:
+        occurrence = month_date(step)
+        if occurrence:
+            if occurrence >= lo:
+                yield seq, occurrence
+            seq += 1
+        step += 1
+
+
+CANDIDATES = {
+    TaskRecurrence.FREQ_DAILY: _daily,
+    TaskRecurrence.FREQ_WEEKLY: _weekly,
+    TaskRecurrence.FREQ_MONTHLY: _monthly,
+}
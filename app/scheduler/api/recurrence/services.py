@@ -0,0 +1,145 @@
+from datetime import date
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from app.scheduler.models import Task, TaskOccurrence, TaskRecurrence
+from app.scheduler.api.task.utils import validate_times
+from app.scheduler.api.versioning import bump_data_version
+from .rules import Rule, includes
+
+
+class RecurrenceServices:
+    """
+    Rules and per-occurrence exceptions of recurring tasks. Every write
+    touches the series' ``updated_at`` so delta sync re-sends it.
+    """
+
+    @staticmethod
+    def get_rule(user_obj, task_id: int) -> dict:
+        recurrence = TaskRecurrence.objects.filter(task_id=task_id, task__user=user_obj).first()
+        if not recurrence:
+            raise ObjectDoesNotExist(f"Task with ID {task_id} has no recurrence")
+
+        return RecurrenceServices._serialize_rule(recurrence)
+
+    @staticmethod
+    def set_rule(user_obj, task_id: int, data: dict) -> dict:
+        weekdays = data.get("weekdays") or []
+        if any(day < 0 or day > 6 for day in weekdays):
+            raise ValidationError("Weekdays go from 0 (Monday) to 6 (Sunday)")
+        if weekdays and data["freq"] != TaskRecurrence.FREQ_WEEKLY:
+            raise ValidationError("Weekdays only apply to weekly rules")
+        if data.get("until") and data.get("count"):
+            raise ValidationError("Set either 'until' or 'count', not both")
+
+        with transaction.atomic():
+            task = RecurrenceServices._lock_task(user_obj, task_id)
+            if data.get("until") and data["until"] < task.scheduled_date:
+                raise ValidationError("'until' cannot be before the task's scheduled date")
+
+            recurrence = TaskRecurrence(
+                task=task,
+                freq=data["freq"],
+                interval=data.get("interval") or 1,
+                weekdays=sum(1 << day for day in set(weekdays)),
+                until=data.get("until"),
+                count=data.get("count"),
+            )
+            # One upsert instead of update_or_create's read and savepoints.
+            TaskRecurrence.objects.bulk_create(
+                [recurrence],
+                update_conflicts=True,
+                unique_fields=["task"],
+                update_fields=["freq", "interval", "weekdays", "until", "count", "updated_at"]
+            )
+            RecurrenceServices._touch(user_obj, task, is_recurring=True)
+
+        return RecurrenceServices._serialize_rule(recurrence)
+
+    @staticmethod
+    def delete_rule(user_obj, task_id: int):
+        """Turn the series back into a single task on its start date."""
+        with transaction.atomic():
+            task = RecurrenceServices._lock_task(user_obj, task_id)
+            deleted, _ = TaskRecurrence.objects.filter(task=task).delete()
+            if not deleted:
+                raise ObjectDoesNotExist(f"Task with ID {task_id} has no recurrence")
+
+            TaskOccurrence.objects.filter(task=task).delete()
+            RecurrenceServices._touch(user_obj, task, is_recurring=False)
+
+    @staticmethod
+    def update_occurrence(user_obj, task_id: int, occurrence_date: date, data: dict) -> dict:
+        """
+        Store what differs for one occurrence. Fields left out of ``data``
+        keep their stored value; null times follow the series.
+        """
+        with transaction.atomic():
+            task = RecurrenceServices._lock_task(user_obj, task_id)
+            recurrence = TaskRecurrence.objects.filter(task=task).first()
+            if not recurrence:
+                raise ObjectDoesNotExist(f"Task with ID {task_id} has no recurrence")
+
+            rule = Rule.of(
+                task.scheduled_date, recurrence.freq, recurrence.interval,
+                recurrence.weekdays, recurrence.until, recurrence.count
+            )
+            if not includes(rule, occurrence_date):
+                raise ValidationError(f"Task with ID {task_id} does not occur on {occurrence_date}")
+
+            occurrence = TaskOccurrence.objects.filter(task=task, occurrence_date=occurrence_date).first()
+            occurrence = occurrence or TaskOccurrence(task=task, occurrence_date=occurrence_date)
+            for attr, value in data.items():
+                if attr in ("is_cancelled", "is_completed") and value is None:
+                    continue
+                setattr(occurrence, attr, value)
+
+            validate_times(
+                start_time=occurrence.start_time or task.start_time,
+                end_time=occurrence.end_time or task.end_time
+            )
+            occurrence.save()
+            RecurrenceServices._touch(user_obj, task)
+
+        return RecurrenceServices._serialize_occurrence(occurrence)
+
+    @staticmethod
+    def _lock_task(user_obj, task_id: int) -> Task:
+        task = (
+            Task.objects
+            .filter(user=user_obj, pk=task_id)
+            .only("id", "scheduled_date", "start_time", "end_time")
+            .select_for_update()
+            .first()
+        )
+        if not task:
+            raise ObjectDoesNotExist(f"Task with ID {task_id} not found")
+        return task
+
+    @staticmethod
+    def _touch(user_obj, task: Task, **fields):
+        Task.objects.filter(pk=task.pk).update(updated_at=timezone.now(), **fields)
+        bump_data_version(user_obj.id)
+
+    @staticmethod
+    def _serialize_rule(recurrence: TaskRecurrence) -> dict:
+        return {
+            "task": recurrence.task_id,
+            "freq": recurrence.freq,
+            "interval": recurrence.interval,
+            "weekdays": [day for day in range(7) if recurrence.weekdays & (1 << day)],
+            "until": recurrence.until,
+            "count": recurrence.count,
+        }
+
+    @staticmethod
+    def _serialize_occurrence(occurrence: TaskOccurrence) -> dict:
+        return {
+            "task": occurrence.task_id,
+            "occurrence_date": occurrence.occurrence_date,
+            "is_cancelled": occurrence.is_cancelled,
+            "is_completed": occurrence.is_completed,
+            "start_time": occurrence.start_time,
+            "end_time": occurrence.end_time,
+        }
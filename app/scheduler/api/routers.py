@@ -1,14 +1,25 @@
+from django.conf import settings
 from ninja import Router
+from .agenda.routes import router as AgendaRouter
 from .category.routes import router as CategoryRouter
-from .task.routes import router as TaskRouter
+from .recurrence.routes import router as RecurrenceRouter
+from .sync.routes import router as SyncRouter
 from .tag.routes import router as TagRouter
 
+if settings.ASYNC_TASK_API:
+    from .task.async_routes import router as TaskRouter
+else:
+    from .task.routes import router as TaskRouter
+
 
 
 router = Router()
 router.add_router("categories", CategoryRouter)
 router.add_router("tasks", TaskRouter)
+router.add_router("tasks", RecurrenceRouter)
 router.add_router("tags", TagRouter)
+router.add_router("sync", SyncRouter)
+router.add_router("", AgendaRouter)
 
 
 
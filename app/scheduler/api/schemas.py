@@ -77,9 +77,28 @@ class TaskSchemaOut(Schema):
 class FullTaskSchemaOut(TaskSchemaOut):
     subTasks: List[SubTaskSchema] = Field(default_factory=list)
     tags: List[TagsSchemaOut] = Field(default_factory=list)
+    # Set on occurrences of a recurring task, to the series' id.
+    recurring_task: Optional[int] = None
 
-    class Config:
-        use_enum_values = True
+
+class FullTaskWriteSchemaOut(FullTaskSchemaOut):
+    # Ids of overlapping tasks; only present when TASK_CONFLICT_MODE is on.
+    conflicts: Optional[List[int]] = None
+
+
+class TaskDaySummarySchema(Schema):
+    scheduled_date: date
+    total: int
+    completed: int
+    low: int
+    medium: int
+    high: int
+
+
+class FreeSlotSchema(Schema):
+    start: datetime
+    end: datetime
+    minutes: int
 
 
 class FullTaskSchemaIn(TaskSchemaIn):
@@ -88,3 +107,91 @@ class FullTaskSchemaIn(TaskSchemaIn):
 
     class Config:
         use_enum_values = True
+
+
+class BulkTaskOperation(str, Enum):
+    create = "create"
+    update = "update"
+    delete = "delete"
+
+
+class BulkTaskOperationSchemaIn(Schema):
+    op: BulkTaskOperation
+    id: Optional[int] = None
+    data: Optional[FullTaskSchemaIn] = None
+
+
+class BulkTaskSchemaIn(Schema):
+    operations: List[BulkTaskOperationSchemaIn]
+
+
+class BulkTaskResultSchemaOut(Schema):
+    index: int
+    op: BulkTaskOperation
+    ok: bool
+    id: Optional[int] = None
+    task: Optional[FullTaskSchemaOut] = None
+    error: Optional[str] = None
+
+
+class BulkTaskSchemaOut(Schema):
+    results: List[BulkTaskResultSchemaOut]
+
+
+class RecurrenceFrequency(str, Enum):
+    daily = "daily"
+    weekly = "weekly"
+    monthly = "monthly"
+
+
+class TaskRecurrenceSchemaIn(Schema):
+    freq: RecurrenceFrequency
+    interval: int = Field(1, ge=1, le=366)
+    # Weekly rules: 0 is Monday, 6 Sunday. Empty repeats on the start's weekday.
+    weekdays: List[int] = Field(default_factory=list)
+    until: Optional[date] = None
+    count: Optional[int] = Field(None, ge=1)
+
+    class Config:
+        use_enum_values = True
+
+
+class TaskRecurrenceSchemaOut(Schema):
+    task: int
+    freq: RecurrenceFrequency
+    interval: int
+    weekdays: List[int]
+    until: Optional[date] = None
+    count: Optional[int] = None
+
+
+class TaskOccurrenceSchemaIn(Schema):
+    is_cancelled: Optional[bool] = None
+    is_completed: Optional[bool] = None
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+
+
+class TaskOccurrenceSchemaOut(Schema):
+    task: int
+    occurrence_date: date
+    is_cancelled: bool
+    is_completed: bool
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+
+
+class SyncDeletedSchemaOut(Schema):
+    tasks: List[int] = Field(default_factory=list)
+    tags: List[int] = Field(default_factory=list)
+    categories: List[int] = Field(default_factory=list)
+
+
+class SyncSchemaOut(Schema):
+    token: str
+    tasks: List[FullTaskSchemaOut]
+    recurrences: List[TaskRecurrenceSchemaOut]
+    occurrences: List[TaskOccurrenceSchemaOut]
+    tags: List[TagsSchemaOut]
+    categories: List[TaskCategorySchema]
+    deleted: SyncDeletedSchemaOut
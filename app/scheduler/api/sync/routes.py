@@ -0,0 +1,24 @@
+from typing import Optional
+from ninja import Router
+from django.core.exceptions import ValidationError
+
+from app.authentication.api.auth import JWTAuth
+from app.core.exceptions import BadRequestError, GoneError
+from app.core.renderers import TrustedResponse
+from app.scheduler.api.schemas import SyncSchemaOut
+from .services import SyncServices, SyncTokenExpired
+
+
+router = Router(tags=["Sync"], auth=JWTAuth())
+
+
+@router.get("/", response=SyncSchemaOut)
+def sync(request, since: Optional[str] = None):
+    try:
+        changes = SyncServices.get_changes(user_obj=request.auth, since=since)
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+    except SyncTokenExpired as e:
+        raise GoneError(str(e))
+
+    return TrustedResponse(changes)
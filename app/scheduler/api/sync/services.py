@@ -0,0 +1,102 @@
+import base64
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from app.scheduler.models import Tag, TaskCategory, TaskOccurrence, TaskRecurrence, Tombstone
+from app.scheduler.api.recurrence.services import RecurrenceServices
+from app.scheduler.api.tag.services import TagServices
+from app.scheduler.api.task.services import TaskServices
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+DELETED_KEYS = {
+    Tombstone.KIND_TASK: "tasks",
+    Tombstone.KIND_TAG: "tags",
+    Tombstone.KIND_CATEGORY: "categories",
+}
+
+
+class SyncTokenExpired(Exception):
+    pass
+
+
+class SyncServices:
+    """
+    Delta sync over ``updated_at`` and the tombstones left by deletes. Every
+    query is a range scan of a ``(user, updated_at)``/``(user, deleted_at)``
+    index, so a sync costs what changed rather than what the user owns.
+
+    Task payloads embed tag and category titles as of their last write; a
+    renamed or deleted tag/category reaches clients through ``tags``,
+    ``categories`` and ``deleted`` instead of re-sending every task using it.
+
+    Rule and occurrence writes touch their series, so a changed series is in
+    ``tasks`` with its rule in ``recurrences`` and its changed occurrences in
+    ``occurrences``. A re-sent task without a rule no longer recurs.
+    """
+
+    @staticmethod
+    def get_changes(user_obj, since=None) -> dict:
+        now = timezone.now()
+        watermark = SyncServices._decode_token(since) if since else None
+
+        retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        if watermark and watermark < now - retention:
+            raise SyncTokenExpired("Sync token expired, start over without 'since'")
+
+        tasks = TaskServices._fetch_tasks(user_obj)
+        tags = Tag.objects.filter(user=user_obj)
+        categories = TaskCategory.objects.filter(user=user_obj)
+        deleted = {key: [] for key in DELETED_KEYS.values()}
+
+        if watermark:
+            tasks = tasks.filter(updated_at__gt=watermark)
+            tags = tags.filter(updated_at__gt=watermark)
+            categories = categories.filter(updated_at__gt=watermark)
+
+            tombstones = Tombstone.objects.filter(
+                user=user_obj, deleted_at__gt=watermark
+            ).values_list("kind", "object_id")
+            for kind, object_id in tombstones:
+                deleted[DELETED_KEYS[kind]].append(object_id)
+
+        tasks = list(tasks.order_by("id"))
+        series_ids = [task.id for task in tasks if task.is_recurring]
+        recurrences = TaskRecurrence.objects.filter(task_id__in=series_ids).order_by("task_id")
+        occurrences = TaskOccurrence.objects.filter(task_id__in=series_ids)
+        if watermark:
+            occurrences = occurrences.filter(updated_at__gt=watermark)
+
+        next_watermark = now - timedelta(seconds=settings.SYNC_LAG_SECONDS)
+        if watermark:
+            next_watermark = max(next_watermark, watermark)
+
+        return {
+            "token": SyncServices._encode_token(next_watermark),
+            "tasks": [TaskServices._serialize_task(task) for task in tasks],
+            "recurrences": [RecurrenceServices._serialize_rule(recurrence) for recurrence in recurrences],
+            "occurrences": [
+                RecurrenceServices._serialize_occurrence(occurrence)
+                for occurrence in occurrences.order_by("task_id", "occurrence_date")
+            ],
+            "tags": [TagServices._serialize_tags(tag) for tag in tags.order_by("id")],
+            "categories": list(categories.order_by("id").values("id", "title")),
+            "deleted": deleted,
+        }
+
+    @staticmethod
+    def _encode_token(watermark: datetime) -> str:
+        micros = (watermark - EPOCH) // timedelta(microseconds=1)
+        return base64.urlsafe_b64encode(str(micros).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_token(token: str) -> datetime:
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            micros = int(base64.urlsafe_b64decode(padded).decode())
+            return EPOCH + timedelta(microseconds=micros)
+        except (ValueError, UnicodeDecodeError, OverflowError):
+            raise ValidationError("Invalid sync token")
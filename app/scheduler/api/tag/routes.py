@@ -1,17 +1,25 @@
 from typing import List
 from ninja import Router
 from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
 
 from app.authentication.api.auth import JWTAuth
 from app.core.exceptions import NotFoundError, BadRequestError
 from app.scheduler.api.schemas import TagsSchemaIn, TagsSchemaOut
+from app.scheduler.api.versioning import get_data_version, make_list_etag, not_modified
 from .services import TagServices
 
 
 router = Router(tags=["Tags"], auth=JWTAuth())
 
 @router.get("/", response=List[TagsSchemaOut])
-def get_tags(request):
+def get_tags(request, response: HttpResponse):
+    etag = make_list_etag(request, "tags", get_data_version(request.auth.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    response["ETag"] = etag
     return TagServices.get_all_tags(user_obj=request.auth)
 
 
@@ -1,8 +1,14 @@
+from django.conf import settings
+from django.db import transaction
 from django.db.models import QuerySet
 from django.db.utils import IntegrityError
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 
-from app.scheduler.models import Tag
+from app.scheduler.models import Tag, TaggedItem, Tombstone
+from app.core.jobs import enqueue
+from app.scheduler.api.task.search_index import TaskSearchIndex
+from app.scheduler.api.tombstones import record_deletions
+from app.scheduler.api.versioning import bump_data_version
 
 
 class TagServices:
@@ -29,7 +35,8 @@ class TagServices:
             user_obj=user_obj,
             title=title
         )
-        
+        bump_data_version(user_obj.id)
+
         return TagServices._serialize_tags(tag)
     
 
@@ -41,7 +48,13 @@ class TagServices:
             raise ObjectDoesNotExist(f"Tag with ID {tag_id} not found")
         
         tag.title = TagServices._validate_input_tag(data)
-        tag.save()
+        with transaction.atomic():
+            tag.save()
+            if settings.TASK_SEARCH_REFRESH == "deferred":
+                enqueue("scheduler.refresh_search", {"tag_id": tag.id}, unique_key=f"search:tag:{tag.id}")
+            else:
+                TaskSearchIndex.refresh_for_tag(tag.id)
+            bump_data_version(user_obj.id)
 
         return TagServices._serialize_tags(tag)
     
@@ -53,7 +66,17 @@ class TagServices:
         if not tag:
             raise ObjectDoesNotExist(f"Tag with ID {tag_id} not found")
 
-        tag.delete()
+        with transaction.atomic():
+            # The tagged items go with the tag, so their tasks have to be
+            # looked up before the delete.
+            task_ids = list(TaggedItem.objects.filter(tag=tag).values_list("task_id", flat=True))
+            record_deletions(user_obj.id, Tombstone.KIND_TAG, [tag.id])
+            tag.delete()
+            if settings.TASK_SEARCH_REFRESH == "deferred":
+                enqueue("scheduler.refresh_search", {"task_ids": task_ids})
+            else:
+                TaskSearchIndex.refresh(task_ids)
+            bump_data_version(user_obj.id)
 
 
     @staticmethod
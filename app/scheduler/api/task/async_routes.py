@@ -0,0 +1,214 @@
+
+from asgiref.sync import sync_to_async
+from ninja import Query, Router
+from typing import List
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import StreamingHttpResponse
+
+from app.authentication.api.auth import AsyncJWTAuth
+from app.core.exceptions import BadRequestError, NotFoundError
+from app.core.renderers import TrustedResponse
+from app.scheduler.api.versioning import aget_data_version, make_list_etag, not_modified
+from app.scheduler.api.schemas import BulkTaskSchemaIn, BulkTaskSchemaOut, FullTaskSchemaIn, FullTaskSchemaOut, FullTaskWriteSchemaOut, TaskDaySummarySchema, TaskSchemaIn, TaskUpdateSchema
+from .async_services import AsyncTaskServices
+from .bulk_services import BulkTaskServices
+from .filters import TaskFilterSchema, TaskPaginationSchema, TaskSearchQuerySchema, TaskSummaryQuerySchema
+from .search_services import TaskSearchServices
+from .summary_services import TaskSummaryServices
+
+
+router = Router(tags=["Tasks"], auth=AsyncJWTAuth())
+
+
+@router.get("/", response=List[FullTaskSchemaOut])
+async def get_all_tasks(
+    request,
+    filters: TaskFilterSchema = Query(),
+    pagination: TaskPaginationSchema = Query()
+):
+    etag = make_list_etag(request, "tasks", await aget_data_version(request.auth.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    try:
+        tasks, next_cursor = await AsyncTaskServices.get_all_tasks(
+            user_obj=request.auth,
+            filters=filters.get_filter_expression(),
+            series=filters.get_series_filter(),
+            cursor=pagination.cursor,
+            limit=pagination.limit
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+
+    response = TrustedResponse(tasks)
+    response["ETag"] = etag
+    if next_cursor:
+        response["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@router.get("/export/")
+async def export_tasks(request):
+    response = StreamingHttpResponse(
+        AsyncTaskServices.export_tasks(user_obj=request.auth),
+        content_type="application/x-ndjson"
+    )
+    response["Content-Disposition"] = 'attachment; filename="tasks.ndjson"'
+    return response
+
+
+@router.get("/search/", response=List[FullTaskSchemaOut])
+async def search_tasks(
+    request,
+    params: TaskSearchQuerySchema = Query(),
+    pagination: TaskPaginationSchema = Query()
+):
+    etag = make_list_etag(request, "task-search", await aget_data_version(request.auth.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    try:
+        tasks, next_cursor = await sync_to_async(TaskSearchServices.search)(
+            user_obj=request.auth,
+            query=params.q,
+            cursor=pagination.cursor,
+            limit=pagination.limit
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+
+    response = TrustedResponse(tasks)
+    response["ETag"] = etag
+    if next_cursor:
+        response["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@router.get("/summary/", response=List[TaskDaySummarySchema])
+async def get_task_summary(request, params: TaskSummaryQuerySchema = Query()):
+    etag = make_list_etag(request, "task-summary", await aget_data_version(request.auth.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    try:
+        summary = await sync_to_async(TaskSummaryServices.get_summary)(
+            user_obj=request.auth,
+            date_from=params.date_from,
+            date_to=params.date_to
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+
+    response = TrustedResponse(summary)
+    response["ETag"] = etag
+    return response
+
+
+@router.post("/full-create/", response={201: FullTaskWriteSchemaOut})
+async def full_task_create(request, data: FullTaskSchemaIn):
+    try:
+        task = await AsyncTaskServices.create_full_task(user_obj=request.auth, task_data=data.model_dump())
+        return TrustedResponse(task, status=201)
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+    except ValueError as e:
+        raise BadRequestError(str(e))
+    except Exception as e:
+        # Log the error
+        raise BadRequestError("Failed to create task")
+    
+
+@router.post("/bulk/", response=BulkTaskSchemaOut)
+async def bulk_tasks(request, data: BulkTaskSchemaIn):
+    try:
+        results = await sync_to_async(BulkTaskServices.apply)(
+            user_obj=request.auth,
+            operations=data.model_dump()["operations"]
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+    return TrustedResponse({"results": results})
+
+
+@router.post("/", response={201: FullTaskWriteSchemaOut})
+async def create_task(request, data: TaskSchemaIn):
+    try:
+        task = await AsyncTaskServices.create_task(user_obj=request.auth, task_data=data.dict())
+        return TrustedResponse(task, status=201)
+    except Exception as e:
+        raise BadRequestError(str(e))
+
+
+@router.get("/{id}/", response=FullTaskSchemaOut)
+async def get_task(request, id:int):
+    try:
+        task = await AsyncTaskServices.get_task_by_id(user_obj=request.auth, task_id=id)
+        return TrustedResponse(task)
+    except ObjectDoesNotExist as e:
+        raise NotFoundError(str(e))
+    except Exception as e:
+        raise BadRequestError(str(e))
+    
+
+@router.put("/{id}/", response=FullTaskWriteSchemaOut)
+async def update_task_put(request, id: int, data: TaskSchemaIn):
+    try:
+        task = await AsyncTaskServices.update_task(
+            user_obj=request.auth,
+            task_id=id,
+            data=data.model_dump()
+        )
+        return TrustedResponse(task)
+    
+    except ObjectDoesNotExist as e:
+        raise NotFoundError(str(e))
+    
+    except Exception as e:
+        raise BadRequestError(str(e))
+    
+
+@router.patch("/{id}/", response=FullTaskWriteSchemaOut)
+async def update_task_patch(request, id: int, data: TaskUpdateSchema):
+    try:
+        task = await AsyncTaskServices.update_task_partial(
+            user_obj=request.auth,
+            task_id=id,
+            data=data.model_dump(exclude_unset=True)
+        )
+        return TrustedResponse(task)
+    
+    except ObjectDoesNotExist as e:
+        raise NotFoundError(str(e))
+    
+    except Exception as e:
+        raise BadRequestError(str(e))
+
+
+@router.delete("/{id}/", response={204: None})
+async def delete_task(request, id: int):
+    try: 
+        await AsyncTaskServices.delete_task(user_obj=request.auth, task_id=id)
+        return 204, None
+    except ObjectDoesNotExist as e:
+        raise NotFoundError(str(e))
+    except Exception as e:
+        raise BadRequestError(str(e))
+    
+
+@router.put("/{id}/update/", response=FullTaskWriteSchemaOut)
+async def full_task_update(request, id: int, data: FullTaskSchemaIn):
+    try:
+        task = await AsyncTaskServices.update_full_task(
+            user_obj=request.auth,
+            task_id=id,
+            data=data.model_dump()
+        )
+        return TrustedResponse(task)
+    except ObjectDoesNotExist as e:
+        raise NotFoundError(str(e))
+    except Exception as e:
+        raise BadRequestError(str(e))
\ No newline at end of file
@@ -0,0 +1,135 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+
+from app.scheduler.models import Task, TaskCategory
+from app.scheduler.api.recurrence.occurrences import OccurrenceServices
+from .conflicts import TaskConflictServices
+from .read_models import TaskReadModel
+from .services import TaskServices
+
+
+class AsyncTaskServices:
+    """
+    Async counterpart of ``TaskServices`` for the ASGI deployment. Reads go
+    through Django's async ORM; writes touch the task, its day summary and
+    the data version in one ``transaction.atomic`` block, so they are
+    delegated to the sync service.
+    """
+
+    @staticmethod
+    async def get_all_tasks(user_obj, filters=None, series=None, cursor=None, limit=None):
+        queryset, limit = TaskServices._task_page_queryset(
+            user_obj=user_obj,
+            filters=filters,
+            cursor=cursor,
+            limit=limit
+        )
+
+        series = TaskServices._series_filter(filters, series)
+        occurrences = await sync_to_async(OccurrenceServices.page)(user_obj, series, cursor, limit) if series else []
+
+        if settings.TASK_LIST_READ_MODEL == "rows":
+            tasks = TaskServices._merge_occurrences(await TaskReadModel.afetch(user_obj, queryset), occurrences, limit)
+            return TaskServices._build_task_page(tasks, limit, serialize=False)
+
+        tasks = TaskServices._merge_occurrences([task async for task in queryset], occurrences, limit)
+        return TaskServices._build_task_page(tasks, limit)
+
+
+    @staticmethod
+    async def export_tasks(user_obj, chunk_size=None):
+        chunk_size = chunk_size or settings.TASK_EXPORT_CHUNK_SIZE
+        queryset = TaskServices._export_queryset(user_obj)
+
+        lines = []
+        async for task in queryset.aiterator(chunk_size=chunk_size):
+            lines.append(TaskServices._dump_task_line(task))
+            if len(lines) >= chunk_size:
+                yield b"".join(lines)
+                lines = []
+
+        if lines:
+            yield b"".join(lines)
+
+
+    @staticmethod
+    async def get_task_by_id(user_obj, task_id):
+        task = await AsyncTaskServices._get_task(user_obj, task_id)
+        if not task:
+            raise ObjectDoesNotExist(f"Task with ID {task_id} not found for user {user_obj.id}")
+
+        return TaskServices._serialize_task(task)
+
+
+    @staticmethod
+    async def create_task(user_obj, task_data: dict) -> dict:
+        category_id = task_data.pop("category", None)
+        category_instance = None
+
+        if category_id:
+            category_instance = await AsyncTaskServices._validate_category(
+                user_obj=user_obj,
+                category_id=category_id
+            )
+
+        task = Task(
+            user=user_obj,
+            category=category_instance,
+            **task_data
+        )
+        conflicts = await sync_to_async(TaskServices._save_task)(user_obj, task)
+
+        return TaskConflictServices.attach(TaskServices._serializer_task_basic(task), conflicts)
+
+
+    @staticmethod
+    async def create_full_task(user_obj, task_data: dict):
+        return await sync_to_async(TaskServices.create_full_task)(
+            user_obj=user_obj,
+            task_data=task_data
+        )
+
+
+    @staticmethod
+    async def update_full_task(user_obj, task_id: int, data: dict):
+        return await sync_to_async(TaskServices.update_full_task)(
+            user_obj=user_obj,
+            task_id=task_id,
+            data=data
+        )
+
+
+    @staticmethod
+    async def update_task(user_obj, task_id: int, data: dict):
+        return await sync_to_async(TaskServices.update_task)(
+            user_obj=user_obj,
+            task_id=task_id,
+            data=data
+        )
+
+
+    @staticmethod
+    async def update_task_partial(user_obj, task_id: int, data: dict):
+        return await sync_to_async(TaskServices.update_task_partial)(
+            user_obj=user_obj,
+            task_id=task_id,
+            data=data
+        )
+
+
+    @staticmethod
+    async def delete_task(user_obj, task_id):
+        await sync_to_async(TaskServices.delete_task)(user_obj=user_obj, task_id=task_id)
+
+
+    @staticmethod
+    async def _get_task(user_obj, task_id):
+        return await TaskServices._fetch_tasks(user_obj=user_obj).filter(pk=task_id).afirst()
+
+    @staticmethod
+    async def _validate_category(user_obj, category_id):
+        try:
+            return await TaskCategory.objects.aget(pk=category_id, user=user_obj)
+        except TaskCategory.DoesNotExist:
+            raise ValidationError(f"Category with ID {category_id} not found.")
@@ -0,0 +1,263 @@
+from collections import defaultdict
+from typing import List
+from django.conf import settings
+from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from app.scheduler.api.schemas import BulkTaskOperation
+from app.scheduler.models import SubTask, Tag, TaggedItem, Task, TaskCategory, Tombstone
+from app.scheduler.api.tombstones import record_deletions
+from app.scheduler.api.versioning import bump_data_version
+from .services import TaskServices
+from .search_index import TaskSearchIndex
+from .summary_services import TaskSummaryServices
+from .utils import validate_times, validate_dates
+
+
+class BulkTaskServices:
+    """
+    Applies a batch of create/update/delete operations for one user.
+
+    Every tag, category and task referenced by the batch is loaded with one
+    query each. Operations that fail validation are reported in their result
+    entry and skipped; the rest are written in a single transaction with
+    bulk statements.
+    """
+
+    UPDATE_FIELDS = [
+        "title", "description", "category", "priority_level", "scheduled_date",
+        "dead_line", "start_time", "end_time", "is_completed", "updated_at",
+    ]
+
+    @staticmethod
+    def apply(user_obj, operations: List[dict]) -> List[dict]:
+        max_operations = settings.TASK_BULK_MAX_OPERATIONS
+        if len(operations) > max_operations:
+            raise ValidationError(f"At most {max_operations} operations are allowed per request")
+
+        tag_titles = BulkTaskServices._fetch_tag_titles(user_obj, operations)
+        categories = BulkTaskServices._fetch_categories(user_obj, operations)
+        with transaction.atomic():
+            # Targets are locked (in id order, so overlapping batches cannot
+            # deadlock) and each summary entry removed below is the stored one.
+            tasks = Task.objects.filter(
+                user=user_obj,
+                id__in={op["id"] for op in operations if op.get("id")}
+            ).order_by("id").select_for_update().in_bulk()
+
+            results = []
+            creates, updates, deletes = [], [], []
+            summary_removed = []
+            touched_ids = set()
+
+            for index, op in enumerate(operations):
+                result = {
+                    "index": index, "op": op["op"], "ok": False,
+                    "id": op.get("id"), "task": None, "error": None,
+                }
+                results.append(result)
+
+                try:
+                    if op["op"] == BulkTaskOperation.create:
+                        task = Task(user=user_obj)
+                        BulkTaskServices._apply_task_data(task, op.get("data"), tag_titles, categories)
+                        creates.append((result, task, op["data"]))
+                        continue
+
+                    task = BulkTaskServices._get_target(op, tasks, touched_ids)
+                    if op["op"] == BulkTaskOperation.delete:
+                        deletes.append((result, task))
+                    else:
+                        summary_before = TaskSummaryServices.entry(task)
+                        BulkTaskServices._apply_task_data(task, op.get("data"), tag_titles, categories)
+                        updates.append((result, task, op["data"]))
+                        summary_removed.append(summary_before)
+                except ValidationError as e:
+                    result["error"] = "; ".join(e.messages)
+                except ValueError as e:
+                    result["error"] = str(e)
+
+            now = timezone.now()
+
+            if creates:
+                Task.objects.bulk_create([task for _, task, _ in creates])
+
+            if updates:
+                for _, task, _ in updates:
+                    task.updated_at = now
+                Task.objects.bulk_update([task for _, task, _ in updates], BulkTaskServices.UPDATE_FIELDS)
+
+            if deletes:
+                deleted_ids = [task.id for _, task in deletes]
+                Task.objects.filter(user=user_obj, id__in=deleted_ids).delete()
+                record_deletions(user_obj.id, Tombstone.KIND_TASK, deleted_ids)
+
+            written = creates + updates
+            BulkTaskServices._write_tags(written, updates)
+            subtasks = BulkTaskServices._write_subtasks(written, updates)
+            TaskSearchIndex.refresh(task.id for _, task, _ in written)
+
+            if written or deletes:
+                TaskSummaryServices.record(
+                    user_obj.id,
+                    removed=summary_removed + [TaskSummaryServices.entry(task) for _, task in deletes],
+                    added=[TaskSummaryServices.entry(task) for _, task, _ in written]
+                )
+                bump_data_version(user_obj.id)
+
+        for result, task, data in written:
+            task_response = TaskServices._serializer_task_basic(task)
+            task_response["subTasks"] = TaskServices._serialize_subtasks(subtasks[task.id])
+            task_response["tags"] = [
+                {"id": tag_id, "title": tag_titles[tag_id]} for tag_id in dict.fromkeys(data["tags"])
+            ]
+            result.update(ok=True, id=task.id, task=task_response)
+
+        for result, _ in deletes:
+            result["ok"] = True
+
+        return results
+
+
+    @staticmethod
+    def _get_target(op: dict, tasks: dict, touched_ids: set) -> Task:
+        task_id = op.get("id")
+        if not task_id:
+            raise ValueError(f"'id' is required for {op['op']} operations")
+
+        task = tasks.get(task_id)
+        if task is None:
+            raise ValueError(f"Task with ID {task_id} not found")
+
+        if task_id in touched_ids:
+            raise ValueError(f"Task with ID {task_id} appears more than once in the batch")
+        touched_ids.add(task_id)
+
+        return task
+
+    @staticmethod
+    def _apply_task_data(task: Task, data: dict, tag_titles: dict, categories: dict):
+        if data is None:
+            raise ValueError("'data' is required for create and update operations")
+
+        invalid_tags = set(data["tags"]) - tag_titles.keys()
+        if invalid_tags:
+            raise ValueError(f"Invalid tag IDs: {invalid_tags}")
+
+        category_id = data.get("category")
+        if category_id and category_id not in categories:
+            raise ValidationError(f"Category with ID {category_id} not found.")
+
+        scheduled_date = data.get("scheduled_date") or timezone.now().date()
+        validate_dates(scheduled_date, data.get("dead_line"))
+        validate_times(data.get("start_time"), data.get("end_time"))
+
+        task.title = data["title"]
+        task.description = data.get("description") or ""
+        task.category = categories.get(category_id)
+        task.priority_level = data.get("priority_level") or Task.PRIORITY_LEVEL_MEDIUM
+        task.scheduled_date = scheduled_date
+        task.dead_line = data.get("dead_line")
+        task.start_time = data.get("start_time")
+        task.end_time = data.get("end_time")
+        task.is_completed = bool(data.get("is_completed"))
+
+    @staticmethod
+    def _write_tags(written: list, updates: list):
+        current = defaultdict(dict)
+        if updates:
+            tagged_items = TaggedItem.objects.filter(
+                task_id__in=[task.id for _, task, _ in updates]
+            ).values_list("id", "task_id", "tag_id")
+            for tagged_item_id, task_id, tag_id in tagged_items:
+                current[task_id][tag_id] = tagged_item_id
+
+        to_create, to_delete = [], []
+        for _, task, data in written:
+            new_tags = set(data["tags"])
+            existing = current[task.id]
+            to_delete.extend(
+                tagged_item_id for tag_id, tagged_item_id in existing.items() if tag_id not in new_tags
+            )
+            to_create.extend(
+                TaggedItem(tag_id=tag_id, task=task) for tag_id in new_tags - existing.keys()
+            )
+
+        if to_delete:
+            TaggedItem.objects.filter(id__in=to_delete).delete()
+
+        if to_create:
+            TaggedItem.objects.bulk_create(to_create)
+
+    @staticmethod
+    def _write_subtasks(written: list, updates: list) -> dict:
+        current = defaultdict(set)
+        if updates:
+            subtask_rows = SubTask.objects.filter(
+                parent_task_id__in=[task.id for _, task, _ in updates]
+            ).values_list("id", "parent_task_id")
+            for subtask_id, task_id in subtask_rows:
+                current[task_id].add(subtask_id)
+
+        subtasks = defaultdict(list)
+        to_create, to_update, to_delete = [], [], []
+        for _, task, data in written:
+            existing = current[task.id]
+            kept = set()
+
+            for subtask_data in data["subTasks"]:
+                subtask_id = subtask_data.get("id")
+                subtask = SubTask(
+                    parent_task=task,
+                    title=subtask_data.get("title", ""),
+                    is_completed=subtask_data.get("is_completed", False)
+                )
+
+                if subtask_id in existing and subtask_id not in kept:
+                    subtask.id = subtask_id
+                    kept.add(subtask_id)
+                    to_update.append(subtask)
+                else:
+                    to_create.append(subtask)
+                subtasks[task.id].append(subtask)
+
+            to_delete.extend(existing - kept)
+
+        if to_delete:
+            SubTask.objects.filter(id__in=to_delete).delete()
+
+        # Kept subtasks are upserted on their id rather than bulk_update'd,
+        # which avoids a CASE per column and returns nothing to refetch.
+        if to_update or to_create:
+            SubTask.objects.bulk_create(
+                to_update + to_create,
+                update_conflicts=True,
+                unique_fields=["id"],
+                update_fields=["title", "is_completed"]
+            )
+
+        return subtasks
+
+    @staticmethod
+    def _fetch_tag_titles(user_obj, operations: List[dict]) -> dict:
+        tag_ids = {
+            tag_id
+            for op in operations if op.get("data")
+            for tag_id in op["data"]["tags"]
+        }
+        if not tag_ids:
+            return {}
+
+        return dict(Tag.objects.filter(user=user_obj, id__in=tag_ids).values_list("id", "title"))
+
+    @staticmethod
+    def _fetch_categories(user_obj, operations: List[dict]) -> dict:
+        category_ids = {
+            op["data"]["category"]
+            for op in operations if op.get("data") and op["data"].get("category")
+        }
+        if not category_ids:
+            return {}
+
+        return TaskCategory.objects.filter(user=user_obj).in_bulk(category_ids)
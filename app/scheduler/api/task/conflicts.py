@@ -0,0 +1,82 @@
+from typing import List, Optional
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import QuerySet
+
+from app.scheduler.models import Task
+from .utils import busy_range
+
+
+MODE_OFF = "off"
+MODE_FLAG = "flag"
+MODE_REJECT = "reject"
+
+# Advisory lock namespace (first key) for serializing a user's checked writes.
+LOCK_NAMESPACE = 2205
+
+
+class TaskConflictServices:
+    """
+    Overlap detection for task writes, selected with ``TASK_CONFLICT_MODE``:
+    "off" skips it, "flag" reports overlapping task ids next to the saved
+    task and "reject" refuses the write.
+
+    Only tasks with both a start and an end time take part, as in
+    ``AgendaServices.get_free_slots``. The lookup is one overlap query on
+    ``busy_range`` restricted to the task's day, answered from the
+    (user, scheduled_date) index or the (user, busy_range) GiST index
+    without loading the day into Python.
+    """
+
+    @staticmethod
+    def check(user_obj, task: Task) -> Optional[List[int]]:
+        """
+        Run inside the write's transaction, before the task is saved.
+        Returns ``None`` when detection is off, else the overlapping ids.
+        """
+        mode = settings.TASK_CONFLICT_MODE
+        if mode == MODE_OFF:
+            return None
+
+        if mode == MODE_REJECT:
+            # Two concurrent writes would otherwise both pass the check.
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s, %s)", [LOCK_NAMESPACE, user_obj.id])
+
+        conflicts = TaskConflictServices.find(user_obj, task)
+        if conflicts and mode == MODE_REJECT:
+            raise ValidationError(f"Task overlaps tasks {conflicts}")
+
+        return conflicts
+
+    @staticmethod
+    def find(user_obj, task: Task) -> List[int]:
+        queryset = TaskConflictServices._queryset(user_obj, task)
+        if queryset is None:
+            return []
+        return list(queryset)
+
+    @staticmethod
+    def _queryset(user_obj, task: Task) -> Optional[QuerySet]:
+        task_range = busy_range(task.scheduled_date, task.start_time, task.end_time)
+        if task_range is None:
+            return None
+
+        queryset = Task.objects.filter(
+            user=user_obj,
+            scheduled_date=task.scheduled_date,
+            end_time__isnull=False,
+            busy_range__overlap=task_range,
+        )
+        if task.pk:
+            queryset = queryset.exclude(pk=task.pk)
+
+        limit = settings.TASK_CONFLICT_MAX_REPORTED
+        return queryset.order_by("id").values_list("id", flat=True)[:limit]
+
+    @staticmethod
+    def attach(task_response: dict, conflicts: Optional[List[int]]) -> dict:
+        if conflicts is not None:
+            task_response["conflicts"] = conflicts
+        return task_response
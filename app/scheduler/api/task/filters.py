@@ -1,5 +1,102 @@
-from ninja import FilterSchema
-from typing import Optional
+from ninja import Field, FilterLookup, FilterSchema, Schema
+from datetime import date
+from typing import Annotated, List, Literal, Optional
+from django.db.models import Count, Exists, OuterRef, Q
+from pydantic import model_validator
+
+from app.scheduler.api.schemas import PriorityLevel
+from app.scheduler.models import TaggedItem
+from app.scheduler.api.recurrence.occurrences import SeriesFilter
+from .search_index import TaskSearchIndex
+
+
+# Filters checked per occurrence of a recurring task rather than on the series.
+OCCURRENCE_FIELDS = ("scheduled_date", "scheduled_from", "scheduled_to", "deadline_from", "deadline_to", "is_completed")
+
 
 class TaskFilterSchema(FilterSchema):
-    scheduled_date: Optional[str] = None
+    """
+    Filters of the task list, ANDed together. Every combination is served by
+    one of the composite ``(user, ...)`` indexes on ``Task`` or by the
+    ``TaggedItem`` indexes; ``check_task_filter_plans`` verifies that. With
+    no filter at all the list falls back to the default upcoming window.
+    """
+
+    scheduled_date: Optional[date] = None
+    scheduled_from: Annotated[Optional[date], FilterLookup("scheduled_date__gte")] = None
+    scheduled_to: Annotated[Optional[date], FilterLookup("scheduled_date__lte")] = None
+    deadline_from: Annotated[Optional[date], FilterLookup("dead_line__gte")] = None
+    deadline_to: Annotated[Optional[date], FilterLookup("dead_line__lte")] = None
+    priority: Annotated[Optional[List[PriorityLevel]], FilterLookup("priority_level__in")] = None
+    is_completed: Optional[bool] = None
+    category: Annotated[Optional[int], FilterLookup("category_id")] = None
+    tags: Optional[List[int]] = None
+    tags_match: Literal["any", "all"] = "any"
+    q: Optional[str] = Field(None, min_length=1, max_length=200)
+
+    @model_validator(mode="after")
+    def check_ranges(self):
+        if self.scheduled_from and self.scheduled_to and self.scheduled_to < self.scheduled_from:
+            raise ValueError("'scheduled_to' must not be before 'scheduled_from'")
+        if self.deadline_from and self.deadline_to and self.deadline_to < self.deadline_from:
+            raise ValueError("'deadline_to' must not be before 'deadline_from'")
+        if self.q is not None and not TaskSearchIndex.terms(self.q):
+            raise ValueError("'q' must contain at least one word")
+        return self
+
+    def get_series_filter(self) -> SeriesFilter:
+        """The same filters applied to recurring tasks; see ``SeriesFilter``."""
+        master = self.model_copy(update=dict.fromkeys(OCCURRENCE_FIELDS)).get_filter_expression()
+        scheduled_from = max(filter(None, [self.scheduled_date, self.scheduled_from]), default=None)
+        scheduled_to = min(filter(None, [self.scheduled_date, self.scheduled_to]), default=None)
+
+        return SeriesFilter(
+            master=master,
+            scheduled_from=scheduled_from,
+            scheduled_to=scheduled_to,
+            deadline_from=self.deadline_from,
+            deadline_to=self.deadline_to,
+            is_completed=self.is_completed,
+        )
+
+    def filter_tags(self, value):
+        if not value:
+            return Q()
+
+        tag_ids = set(value)
+        if self.tags_match == "any":
+            return Q(Exists(TaggedItem.objects.filter(task=OuterRef("pk"), tag_id__in=tag_ids)))
+
+        # Tasks carrying every tag: one group per task over the (tag, task)
+        # unique index, keeping those that matched all of them.
+        return Q(pk__in=(
+            TaggedItem.objects
+            .filter(tag_id__in=tag_ids)
+            .values("task_id")
+            .annotate(matched=Count("tag_id"))
+            .filter(matched=len(tag_ids))
+            .values("task_id")
+        ))
+
+    def filter_tags_match(self, value):
+        # Only modifies how ``tags`` is applied.
+        return Q()
+
+    def filter_q(self, value):
+        if value is None:
+            return Q()
+        return Q(search_vector=TaskSearchIndex.query(TaskSearchIndex.terms(value)))
+
+
+class TaskPaginationSchema(Schema):
+    cursor: Optional[str] = None
+    limit: Optional[int] = Field(None, ge=1)
+
+
+class TaskSummaryQuerySchema(Schema):
+    date_from: date = Field(..., alias="from")
+    date_to: date = Field(..., alias="to")
+
+
+class TaskSearchQuerySchema(Schema):
+    q: str = Field(..., min_length=1, max_length=200)
@@ -0,0 +1,129 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import List, Optional
+from django.db.models import QuerySet
+
+from app.scheduler.models import SubTask, TaggedItem
+
+
+@dataclass(slots=True)
+class SubTaskRow:
+    id: int
+    title: str
+    is_completed: bool
+
+
+@dataclass(slots=True)
+class TagRow:
+    id: int
+    title: str
+
+
+@dataclass(slots=True)
+class TaskRow:
+    """
+    A task as listed by the API. Field names follow ``FullTaskSchemaOut``,
+    so the renderer (orjson) dumps rows directly without building dicts.
+    """
+
+    id: int
+    title: str
+    description: str
+    category: Optional[int]
+    priority_level: str
+    scheduled_date: date
+    dead_line: Optional[date]
+    start_time: Optional[time]
+    end_time: Optional[time]
+    is_completed: bool
+    created_at: datetime
+    updated_at: datetime
+    subTasks: List[SubTaskRow] = field(default_factory=list)
+    tags: List[TagRow] = field(default_factory=list)
+    recurring_task: Optional[int] = None
+
+
+@dataclass(slots=True)
+class OccurrenceRow(TaskRow):
+    """
+    One occurrence of a recurring task, listed under the series' id on its
+    own date. ``recurring_task`` tells clients it is not a stored task.
+    """
+
+
+# Column order of TaskRow's positional fields.
+TASK_COLUMNS = (
+    "id", "title", "description", "category_id", "priority_level", "scheduled_date",
+    "dead_line", "start_time", "end_time", "is_completed", "created_at", "updated_at",
+)
+
+
+class TaskReadModel:
+    """
+    Read-only counterpart of ``TaskServices._fetch_tasks`` for list
+    endpoints: tasks, subtasks and tags are read with ``values_list`` and
+    grouped by task id in Python instead of hydrating model instances.
+    Selected with ``TASK_LIST_READ_MODEL = "rows"``.
+    """
+
+    @staticmethod
+    def fetch(user_obj, queryset: QuerySet) -> List[TaskRow]:
+        tasks = [TaskRow(*values) for values in TaskReadModel._task_values(queryset)]
+        if tasks:
+            task_ids = [task.id for task in tasks]
+            TaskReadModel._attach(
+                tasks,
+                TaskReadModel._subtask_values(task_ids),
+                TaskReadModel._tag_values(user_obj, task_ids)
+            )
+        return tasks
+
+    @staticmethod
+    async def afetch(user_obj, queryset: QuerySet) -> List[TaskRow]:
+        tasks = [TaskRow(*values) async for values in TaskReadModel._task_values(queryset)]
+        if tasks:
+            task_ids = [task.id for task in tasks]
+            TaskReadModel._attach(
+                tasks,
+                [values async for values in TaskReadModel._subtask_values(task_ids)],
+                [values async for values in TaskReadModel._tag_values(user_obj, task_ids)]
+            )
+        return tasks
+
+    @staticmethod
+    def _task_values(queryset: QuerySet) -> QuerySet:
+        # Drop the joins and prefetches set up for model instances.
+        return queryset.select_related(None).prefetch_related(None).values_list(*TASK_COLUMNS)
+
+    @staticmethod
+    def _subtask_values(task_ids: list) -> QuerySet:
+        return (
+            SubTask.objects
+            .filter(parent_task_id__in=task_ids)
+            .order_by("id")
+            .values_list("parent_task_id", "id", "title", "is_completed")
+        )
+
+    @staticmethod
+    def _tag_values(user_obj, task_ids: list) -> QuerySet:
+        return (
+            TaggedItem.objects
+            .filter(task_id__in=task_ids, tag__user=user_obj)
+            .order_by("id")
+            .values_list("task_id", "tag_id", "tag__title")
+        )
+
+    @staticmethod
+    def _attach(tasks: List[TaskRow], subtask_values, tag_values):
+        subtasks = defaultdict(list)
+        for task_id, subtask_id, title, is_completed in subtask_values:
+            subtasks[task_id].append(SubTaskRow(subtask_id, title, is_completed))
+
+        tags = defaultdict(list)
+        for task_id, tag_id, title in tag_values:
+            tags[task_id].append(TagRow(tag_id, title))
+
+        for task in tasks:
+            task.subTasks = subtasks.get(task.id, [])
+            task.tags = tags.get(task.id, [])
@@ -1,32 +1,125 @@
 
 from ninja import Query, Router
 from typing import List
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 
 from app.authentication.api.auth import JWTAuth
 from app.core.exceptions import BadRequestError, NotFoundError
-from app.scheduler.api.schemas import FullTaskSchemaIn, FullTaskSchemaOut, TaskSchemaIn, TaskUpdateSchema
+from app.core.renderers import TrustedResponse
+from app.scheduler.api.versioning import get_data_version, make_list_etag, not_modified
+from app.scheduler.api.schemas import BulkTaskSchemaIn, BulkTaskSchemaOut, FullTaskSchemaIn, FullTaskSchemaOut, FullTaskWriteSchemaOut, TaskDaySummarySchema, TaskSchemaIn, TaskUpdateSchema
+from .async_services import AsyncTaskServices
 from .services import TaskServices
-from .filters import TaskFilterSchema
+from .bulk_services import BulkTaskServices
+from .filters import TaskFilterSchema, TaskPaginationSchema, TaskSearchQuerySchema, TaskSummaryQuerySchema
+from .search_services import TaskSearchServices
+from .summary_services import TaskSummaryServices
 
 
 router = Router(tags=["Tasks"], auth=JWTAuth())
 
 
 @router.get("/", response=List[FullTaskSchemaOut])
-def get_all_tasks(request, filters: TaskFilterSchema = Query()):
-    tasks = TaskServices.get_all_tasks(
-        user_obj=request.auth,
-        scheduled_date=filters.scheduled_date
-    )
-    return tasks
+def get_all_tasks(
+    request,
+    filters: TaskFilterSchema = Query(),
+    pagination: TaskPaginationSchema = Query()
+):
+    etag = make_list_etag(request, "tasks", get_data_version(request.auth.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
 
+    try:
+        tasks, next_cursor = TaskServices.get_all_tasks(
+            user_obj=request.auth,
+            filters=filters.get_filter_expression(),
+            series=filters.get_series_filter(),
+            cursor=pagination.cursor,
+            limit=pagination.limit
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+
+    response = TrustedResponse(tasks)
+    response["ETag"] = etag
+    if next_cursor:
+        response["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@router.get("/export/")
+def export_tasks(request):
+    # A sync iterator would be buffered whole by Django's ASGI handler, so
+    # hand it the async generator when running under uvicorn.
+    if isinstance(request, ASGIRequest):
+        content = AsyncTaskServices.export_tasks(user_obj=request.auth)
+    else:
+        content = TaskServices.export_tasks(user_obj=request.auth)
+
+    response = StreamingHttpResponse(content, content_type="application/x-ndjson")
+    response["Content-Disposition"] = 'attachment; filename="tasks.ndjson"'
+    return response
+
+
+@router.get("/search/", response=List[FullTaskSchemaOut])
+def search_tasks(
+    request,
+    params: TaskSearchQuerySchema = Query(),
+    pagination: TaskPaginationSchema = Query()
+):
+    etag = make_list_etag(request, "task-search", get_data_version(request.auth.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    try:
+        tasks, next_cursor = TaskSearchServices.search(
+            user_obj=request.auth,
+            query=params.q,
+            cursor=pagination.cursor,
+            limit=pagination.limit
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+
+    response = TrustedResponse(tasks)
+    response["ETag"] = etag
+    if next_cursor:
+        response["X-Next-Cursor"] = next_cursor
+    return response
 
-@router.post("/full-create/", response={201: FullTaskSchemaOut})
+
+@router.get("/summary/", response=List[TaskDaySummarySchema])
+def get_task_summary(request, params: TaskSummaryQuerySchema = Query()):
+    etag = make_list_etag(request, "task-summary", get_data_version(request.auth.id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    try:
+        summary = TaskSummaryServices.get_summary(
+            user_obj=request.auth,
+            date_from=params.date_from,
+            date_to=params.date_to
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+
+    response = TrustedResponse(summary)
+    response["ETag"] = etag
+    return response
+
+
+@router.post("/full-create/", response={201: FullTaskWriteSchemaOut})
 def full_task_create(request, data: FullTaskSchemaIn):
     try:
         task = TaskServices.create_full_task(user_obj=request.auth, task_data=data.model_dump())
-        return 201, task
+        return TrustedResponse(task, status=201)
+    except ValidationError as e:
+        raise BadRequestError(str(e))
     except ValueError as e:
         raise BadRequestError(f'haha {str(e)}')
     except Exception as e:
@@ -34,11 +127,23 @@ def full_task_create(request, data: FullTaskSchemaIn):
         raise BadRequestError("Failed to create task")
     
 
-@router.post("/", response={201: FullTaskSchemaOut})
+@router.post("/bulk/", response=BulkTaskSchemaOut)
+def bulk_tasks(request, data: BulkTaskSchemaIn):
+    try:
+        results = BulkTaskServices.apply(
+            user_obj=request.auth,
+            operations=data.model_dump()["operations"]
+        )
+    except ValidationError as e:
+        raise BadRequestError(str(e))
+    return TrustedResponse({"results": results})
+
+
+@router.post("/", response={201: FullTaskWriteSchemaOut})
 def create_task(request, data: TaskSchemaIn):
     try:
         task = TaskServices.create_task(user_obj=request.auth, task_data=data.dict())
-        return 201, task
+        return TrustedResponse(task, status=201)
     except Exception as e:
         raise BadRequestError(str(e))
 
@@ -46,21 +151,23 @@ def create_task(request, data: TaskSchemaIn):
 @router.get("/{id}/", response=FullTaskSchemaOut)
 def get_task(request, id:int):
     try:
-        return TaskServices.get_task_by_id(user_obj=request.auth, task_id=id)
+        task = TaskServices.get_task_by_id(user_obj=request.auth, task_id=id)
+        return TrustedResponse(task)
     except ObjectDoesNotExist as e:
         raise NotFoundError(str(e))
     except Exception as e:
         raise BadRequestError(str)
     
 
-@router.put("/{id}/", response=FullTaskSchemaOut)
+@router.put("/{id}/", response=FullTaskWriteSchemaOut)
 def update_task_put(request, id: int, data: TaskSchemaIn):
     try:
-        return TaskServices.update_task(
+        task = TaskServices.update_task(
             user_obj=request.auth,
             task_id=id,
             data=data.model_dump()
         )
+        return TrustedResponse(task)
     
     except ObjectDoesNotExist as e:
         raise NotFoundError(str(e))
@@ -69,14 +176,15 @@ def update_task_put(request, id: int, data: TaskSchemaIn):
         raise BadRequestError(str(e))
     
 
-@router.patch("/{id}/", response=FullTaskSchemaOut)
+@router.patch("/{id}/", response=FullTaskWriteSchemaOut)
 def update_task_patch(request, id: int, data: TaskUpdateSchema):
     try:
-        return TaskServices.update_task_partial(
+        task = TaskServices.update_task_partial(
             user_obj=request.auth,
             task_id=id,
             data=data.model_dump(exclude_unset=True)
         )
+        return TrustedResponse(task)
     
     except ObjectDoesNotExist as e:
         raise NotFoundError(str(e))
@@ -96,14 +204,15 @@ def delete_task(request, id: int):
         raise BadRequestError(str(e))
     
 
-@router.put("/{id}/update/", response=FullTaskSchemaOut)
+@router.put("/{id}/update/", response=FullTaskWriteSchemaOut)
 def full_task_update(request, id: int, data: FullTaskSchemaIn):
     try:
-        return TaskServices.update_full_task(
+        task = TaskServices.update_full_task(
             user_obj=request.auth,
             task_id=id,
             data=data.model_dump()
         )
+        return TrustedResponse(task)
     except ObjectDoesNotExist as e:
         raise NotFoundError(str(e))
     except Exception as e:
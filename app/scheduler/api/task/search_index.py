@@ -0,0 +1,73 @@
+import re
+from typing import Iterable, List
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+
+from app.scheduler.models import SubTask, TaggedItem, Task
+
+
+SEARCH_TERM = re.compile(r"\w+")
+
+
+class TaskSearchIndex:
+    """
+    Keeps ``Task.search_vector`` in step with the task, its subtasks and its
+    tags. Write paths call ``refresh`` inside their transaction once the
+    related rows are written.
+    """
+
+    @staticmethod
+    def refresh(task_ids: Iterable[int]):
+        """Recompute the search vector of the given tasks in one statement."""
+        task_ids = list(task_ids)
+        if task_ids:
+            Task.objects.filter(id__in=task_ids).update(search_vector=TaskSearchIndex.vector())
+
+    @staticmethod
+    def refresh_for_tag(tag_id):
+        Task.objects.filter(
+            id__in=TaggedItem.objects.filter(tag_id=tag_id).values("task_id")
+        ).update(search_vector=TaskSearchIndex.vector())
+
+    @staticmethod
+    def terms(text: str) -> List[str]:
+        return SEARCH_TERM.findall(text.lower())
+
+    @staticmethod
+    def query(terms: List[str]) -> SearchQuery:
+        # Terms are \w+ only, so they are safe to splice into a raw tsquery.
+        # Only the last term is treated as a prefix (the word being typed);
+        # prefixing every term makes short queries match most of the table.
+        return SearchQuery(
+            " & ".join(terms[:-1] + [f"{terms[-1]}:*"]),
+            search_type="raw",
+            config=settings.TASK_SEARCH_CONFIG
+        )
+
+    @staticmethod
+    def vector():
+        config = settings.TASK_SEARCH_CONFIG
+        subtask_titles = Subquery(
+            SubTask.objects
+            .filter(parent_task=OuterRef("pk"))
+            .values("parent_task")
+            .annotate(text=StringAgg("title", " "))
+            .values("text")
+        )
+        tag_titles = Subquery(
+            TaggedItem.objects
+            .filter(task=OuterRef("pk"))
+            .values("task")
+            .annotate(text=StringAgg("tag__title", " "))
+            .values("text")
+        )
+
+        return (
+            SearchVector("title", weight="A", config=config)
+            + SearchVector(Coalesce(subtask_titles, Value(""), output_field=TextField()), weight="B", config=config)
+            + SearchVector(Coalesce(tag_titles, Value(""), output_field=TextField()), weight="B", config=config)
+            + SearchVector("description", weight="C", config=config)
+        )
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchRank, TrigramWordSimilarity
+from django.core.exceptions import ValidationError
+from django.db.models import F
+
+from .search_index import TaskSearchIndex
+from .services import TaskServices
+
+
+MODE_FULLTEXT = "f"
+MODE_TRIGRAM = "t"
+
+
+class TaskSearchServices:
+    """
+    Ranked search over a user's tasks. Terms are matched against
+    ``Task.search_vector``, the last one as a prefix; when that finds
+    nothing the query is retried as a trigram word-similarity match on the
+    title to catch typos.
+
+    The cursor is opaque to clients: the search mode and the offset of the
+    next page. The index itself is maintained by ``TaskSearchIndex``.
+    """
+
+    @staticmethod
+    def search(user_obj, query: str, cursor=None, limit=None):
+        terms = TaskSearchIndex.terms(query)
+        if not terms:
+            raise ValidationError("Search query must contain at least one word")
+
+        mode, offset = TaskSearchServices._decode_cursor(cursor)
+        limit = min(limit or settings.TASK_PAGE_SIZE, settings.TASK_PAGE_SIZE_MAX)
+
+        if mode == MODE_FULLTEXT:
+            tasks = list(TaskSearchServices._fulltext_queryset(user_obj, terms)[offset:offset + limit + 1])
+            # Only fall back when the search as a whole found nothing, not
+            # when a later page runs out.
+            if tasks or offset:
+                return TaskSearchServices._build_page(tasks, MODE_FULLTEXT, offset, limit)
+            offset = 0
+
+        query = " ".join(terms)
+        tasks = list(TaskSearchServices._trigram_queryset(user_obj, query)[offset:offset + limit + 1])
+        return TaskSearchServices._build_page(tasks, MODE_TRIGRAM, offset, limit)
+
+    @staticmethod
+    def _fulltext_queryset(user_obj, terms: list):
+        search_query = TaskSearchIndex.query(terms)
+        return (
+            TaskServices._fetch_tasks(user_obj)
+            .filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-id")
+        )
+
+    @staticmethod
+    def _trigram_queryset(user_obj, query: str):
+        return (
+            TaskServices._fetch_tasks(user_obj)
+            .filter(title__trigram_word_similar=query)
+            .annotate(similarity=TrigramWordSimilarity(query, "title"))
+            .order_by("-similarity", "-id")
+        )
+
+    @staticmethod
+    def _build_page(tasks: list, mode: str, offset: int, limit: int):
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = f"{mode}{offset + limit}"
+
+        return [TaskServices._serialize_task(task) for task in tasks], next_cursor
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        if not cursor:
+            return MODE_FULLTEXT, 0
+
+        mode, offset = cursor[:1], cursor[1:]
+        if mode not in (MODE_FULLTEXT, MODE_TRIGRAM) or not offset.isdigit():
+            raise ValidationError("Invalid cursor")
+
+        return mode, int(offset)
@@ -1,35 +1,72 @@
+import heapq
+from itertools import islice
 from typing import List
 from datetime import timedelta
-from django.db.models import Prefetch, QuerySet, Q
+from django.conf import settings
+from django.db.models import BooleanField, Prefetch, QuerySet, Q, Value
 from django.db import IntegrityError, transaction
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.utils import timezone
 
+from app.core.renderers import dumps
 from app.scheduler.api.schemas import FullTaskSchemaOut, PriorityLevel
-from app.scheduler.models import SubTask, Tag, TaggedItem, Task, TaskCategory
-from .utils import validate_times, validate_dates
+from app.scheduler.models import SubTask, Tag, TaggedItem, Task, TaskCategory, TaskOccurrence, Tombstone
+from app.scheduler.api.recurrence.occurrences import OccurrenceServices, SeriesFilter
+from app.scheduler.api.recurrence.services import RecurrenceServices
+from app.scheduler.api.tombstones import record_deletions
+from app.scheduler.api.versioning import bump_data_version
+from .conflicts import TaskConflictServices
+from .read_models import TaskReadModel
+from .search_index import TaskSearchIndex
+from .summary_services import TaskSummaryServices
+from .utils import decode_cursor, encode_cursor, validate_times, validate_dates
+
+
+# Days ahead of today listed when the client passes no filter.
+DEFAULT_WINDOW_DAYS = 5
+
 
 class TaskServices:
 
     @staticmethod
-    def get_all_tasks(user_obj, scheduled_date=None):
-        queryset = TaskServices._fetch_tasks(user_obj)
+    def get_all_tasks(user_obj, filters=None, series=None, cursor=None, limit=None):
+        """
+        ``filters`` is the Q of ``TaskFilterSchema`` and ``series`` its
+        ``SeriesFilter``; without ``series`` a filtered list leaves out the
+        occurrences of recurring tasks.
+        """
+        queryset, limit = TaskServices._task_page_queryset(
+            user_obj=user_obj,
+            filters=filters,
+            cursor=cursor,
+            limit=limit
+        )
+        series = TaskServices._series_filter(filters, series)
+        occurrences = OccurrenceServices.page(user_obj, series, cursor, limit) if series else []
 
-        if scheduled_date:
-            queryset = queryset.filter(scheduled_date=scheduled_date)
-        else:
-            today = timezone.now().date()
-            queryset = queryset.filter(
-                Q(scheduled_date__range=[today, today + timedelta(days=5)])
-                | Q(
-                    scheduled_date__lt=today,
-                    dead_line__gte=today
-                )
-            )
+        if settings.TASK_LIST_READ_MODEL == "rows":
+            tasks = TaskServices._merge_occurrences(TaskReadModel.fetch(user_obj, queryset), occurrences, limit)
+            return TaskServices._build_task_page(tasks, limit, serialize=False)
 
-        return [TaskServices._serialize_task(task) for task in queryset]
+        return TaskServices._build_task_page(TaskServices._merge_occurrences(list(queryset), occurrences, limit), limit)
     
 
+    @staticmethod
+    def export_tasks(user_obj, chunk_size=None):
+        chunk_size = chunk_size or settings.TASK_EXPORT_CHUNK_SIZE
+        queryset = TaskServices._export_queryset(user_obj)
+
+        lines = []
+        for task in queryset.iterator(chunk_size=chunk_size):
+            lines.append(TaskServices._dump_task_line(task))
+            if len(lines) >= chunk_size:
+                yield b"".join(lines)
+                lines = []
+
+        if lines:
+            yield b"".join(lines)
+
+
     @staticmethod
     def get_task_by_id(user_obj, task_id):
         task = TaskServices._fetch_tasks(user_obj=user_obj)\
@@ -52,13 +89,14 @@ class TaskServices:
                 category_id=category_id
             )
             
-        task = Task.objects.create(
+        task = Task(
             user=user_obj,
             category=category_instance,
             **task_data
         )
+        conflicts = TaskServices._save_task(user_obj, task)
 
-        return TaskServices._serializer_task_basic(task)
+        return TaskConflictServices.attach(TaskServices._serializer_task_basic(task), conflicts)
 
 
     @staticmethod
@@ -98,12 +136,14 @@ class TaskServices:
                 validate_times(start_time=start_time, end_time=end_time)
 
                 # Create the main task
-                task = Task.objects.create(
+                task = Task(
                     user=user_obj, 
                     category=category_instance,
                     scheduled_date=scheduled_date,
                     **task_data
                 )
+                conflicts = TaskConflictServices.check(user_obj, task)
+                task.save()
 
                 # Create tagged items if tags provided
                 if tags:
@@ -125,7 +165,10 @@ class TaskServices:
                     ]
                     SubTask.objects.bulk_create(subtask_objects)
 
-            
+                TaskSummaryServices.record(user_obj.id, added=[TaskSummaryServices.entry(task)])
+                TaskSearchIndex.refresh([task.id])
+                bump_data_version(user_obj.id)
+
             # Fetch related data with select_related/prefetch_related for efficiency
             tagged_items = task.tagged_items.select_related("tag").all()
             subtasks = task.subTasks.all()
@@ -134,10 +177,10 @@ class TaskServices:
             task_response["subTasks"] = TaskServices._serialize_subtasks(subtasks)
             task_response["tags"] = TaskServices._serizlie_tags(tagged_items)
 
-            return task_response            
+            return TaskConflictServices.attach(task_response, conflicts)
 
 
-        except (ValueError, ObjectDoesNotExist):
+        except (ValueError, ValidationError, ObjectDoesNotExist):
             raise
         except IntegrityError as e:
             raise ValueError(f"Database constraint violation: {str(e)}")
@@ -147,14 +190,22 @@ class TaskServices:
 
     @staticmethod
     def update_full_task(user_obj, task_id: int, data: dict):
-        task: Task = TaskServices._fetch_tasks(user_obj=user_obj).filter(pk=task_id).first()
-        if not task:
-            raise ObjectDoesNotExist(f"Task with ID {task_id} not found")
-
         tags = data.pop("tags", None)
         sub_tasks = data.pop("subTasks", None)
 
         with transaction.atomic():
+            # Locking the row keeps the subtask/tag diff below exact against
+            # concurrent writes to the same task.
+            task: Task = (
+                Task.objects
+                .filter(user=user_obj, pk=task_id)
+                .defer("search_vector")
+                .select_for_update()
+                .first()
+            )
+            if not task:
+                raise ObjectDoesNotExist(f"Task with ID {task_id} not found")
+            summary_before = TaskSummaryServices.entry(task)
 
             scheduled_date = data.pop("scheduled_date") or timezone.now().date()
             dead_line = data.pop("dead_line")
@@ -173,164 +224,318 @@ class TaskServices:
                 if attr == "category" and value is not None:
                     value = TaskServices._validate_category(user_obj=user_obj, category_id=value)
                 setattr(task, attr, value)
+            conflicts = TaskConflictServices.check(user_obj, task)
             task.save()
+            TaskSummaryServices.record(
+                user_obj.id, removed=[summary_before], added=[TaskSummaryServices.entry(task)]
+            )
 
-            if tags is not None:
-                TaskServices.__update_full_task_tags(task=task, new_tags=tags)
+            task_tags = TaskServices.__update_full_task_tags(user_obj=user_obj, task=task, new_tags=tags)
+            task_subtasks = TaskServices.__update_full_task_subtasks(task=task, new_subtasks=sub_tasks)
 
-            if sub_tasks is not None:
-                TaskServices.__update_full_task_subtasks(task=task, new_subtasks=sub_tasks)
-            
-        task.refresh_from_db()
-        if tags is not None:
-            del task.prefetched_tagged_items
-            task.prefetched_tagged_items = list(TaggedItem.objects.select_related("tag").filter(task=task, tag__user=user_obj))
+            TaskSearchIndex.refresh([task.id])
+            bump_data_version(user_obj.id)
 
-        return TaskServices._serialize_task(task)
+        # Everything in the response is already in memory.
+        task_response = TaskServices._serializer_task_basic(task)
+        task_response["subTasks"] = task_subtasks
+        task_response["tags"] = task_tags
+
+        return TaskConflictServices.attach(task_response, conflicts)
 
 
     @staticmethod
-    def __update_full_task_tags(task, new_tags):
-        current_tags = set(
-            TaggedItem.objects.filter(task=task).values_list("tag_id", flat=True)
+    def __update_full_task_tags(user_obj, task, new_tags) -> List[dict]:
+        """
+        Sync the task's tags with ``new_tags`` (``None`` keeps them) and
+        return them serialized. One query reads the tags currently attached
+        together with the requested ones, which also validates the latter;
+        each half of the UNION is an index lookup.
+        """
+        requested = list(dict.fromkeys(new_tags or []))
+        rows = (
+            Tag.objects
+            .filter(id__in=requested, user=user_obj)
+            .values_list("id", "title", "user_id", Value(False, output_field=BooleanField()))
+            .union(
+                TaggedItem.objects
+                .filter(task=task)
+                .values_list("tag_id", "tag__title", "tag__user_id", Value(True, output_field=BooleanField())),
+                all=True
+            )
         )
-        new_tags = set(new_tags)
-
-        tags_to_remove = current_tags - new_tags
+        titles = {}
+        current_tags = set()
+        for tag_id, title, owner_id, attached in rows:
+            if owner_id == user_obj.id:
+                titles[tag_id] = title
+            if attached:
+                current_tags.add(tag_id)
+
+        if new_tags is None:
+            return [{"id": tag_id, "title": titles[tag_id]} for tag_id in sorted(current_tags) if tag_id in titles]
+
+        invalid_tags = set(requested) - titles.keys()
+        if invalid_tags:
+            raise ValueError(f"Invalid tag IDs: {invalid_tags}")
+
+        tags_to_remove = current_tags - set(requested)
         if tags_to_remove:
             TaggedItem.objects.filter(task=task, tag_id__in=tags_to_remove).delete()
 
-        tags_to_add = new_tags - current_tags
+        tags_to_add = [tag_id for tag_id in requested if tag_id not in current_tags]
         if tags_to_add:
-            tagged_items = [
+            TaggedItem.objects.bulk_create([
                 TaggedItem(tag_id=tag_id, task=task) for tag_id in tags_to_add
-            ]
-            TaggedItem.objects.bulk_create(tagged_items)
+            ])
+
+        return [{"id": tag_id, "title": titles[tag_id]} for tag_id in requested]
 
     @staticmethod
-    def __update_full_task_subtasks(task, new_subtasks):
+    def __update_full_task_subtasks(task, new_subtasks) -> List[dict]:
+        """
+        Sync the task's subtasks with ``new_subtasks`` (``None`` keeps them)
+        and return them serialized. Kept and new subtasks are written by one
+        upsert; ids in the payload that are not this task's create new rows.
+        """
         current_subtasks = {
-            st.id: st for st in SubTask.objects.filter(parent_task=task)
+            subtask_id: (title, is_completed)
+            for subtask_id, title, is_completed in
+            SubTask.objects.filter(parent_task=task).order_by("id").values_list("id", "title", "is_completed")
         }
+        if new_subtasks is None:
+            return [
+                {"id": subtask_id, "title": title, "is_completed": is_completed}
+                for subtask_id, (title, is_completed) in current_subtasks.items()
+            ]
 
-        subtasks_to_create = []
-        subtasks_to_update = []
-        updated_ids = set()
-
+        subtasks = []
+        kept_ids = set()
         for subtask_data in new_subtasks:
             subtask_id = subtask_data.get("id")
+            current = current_subtasks.get(subtask_id, ("", False))
+            subtask = SubTask(
+                parent_task=task,
+                title=subtask_data.get("title", current[0]),
+                is_completed=subtask_data.get("is_completed", current[1])
+            )
+            if subtask_id in current_subtasks and subtask_id not in kept_ids:
+                subtask.id = subtask_id
+                kept_ids.add(subtask_id)
+            subtasks.append(subtask)
 
-            if subtask_id and subtask_id in current_subtasks:
-                subtask_instance = current_subtasks[subtask_id]
-                subtask_instance.title = subtask_data.get("title", subtask_instance.title)
-                subtask_instance.is_completed = subtask_data.get("is_completed", subtask_instance.is_completed)
-
-                subtasks_to_update.append(subtask_instance)
-                updated_ids.add(subtask_id)
-            else:
-                subtasks_to_create.append(
-                    SubTask(
-                        parent_task=task,
-                        title=subtask_data.get("title", ""),
-                        is_completed=subtask_data.get("is_completed", False)
-                    )
-                )
-        
-        subtasks_to_delete = set(current_subtasks.keys()) - updated_ids
+        subtasks_to_delete = current_subtasks.keys() - kept_ids
         if subtasks_to_delete:
             SubTask.objects.filter(id__in=subtasks_to_delete).delete()
 
-        if subtasks_to_update:
-            SubTask.objects.bulk_update(subtasks_to_update, ["title", "is_completed"])
+        if subtasks:
+            SubTask.objects.bulk_create(
+                subtasks,
+                update_conflicts=True,
+                unique_fields=["id"],
+                update_fields=["title", "is_completed"]
+            )
 
-        if subtasks_to_create:
-            SubTask.objects.bulk_create(subtasks_to_create)
+        return TaskServices._serialize_subtasks(subtasks)
 
 
     @staticmethod
     def update_task(user_obj, task_id: int, data: dict):
-        task = TaskServices._fetch_tasks(user_obj=user_obj).filter(pk=task_id).first()
-        if not task:
-            raise ObjectDoesNotExist(f"Task with ID {task_id} not found")
-        
-        title = data.get("title")
-        if not title:
-            raise ValidationError("Title is required for full update")
-        
-        if len(title.strip()) <= 0:
-            raise ValidationError("Title cannot be empty")
-        
-        priority_level = data.get("priority_level", PriorityLevel.medium)
-        if isinstance(priority_level, PriorityLevel):
-            priority_level = priority_level.value
-
-        category_id = data.get("category")
-        category = None
-        if category_id:
-            category = TaskServices._validate_category(
-                user_obj=user_obj,
-                category_id=category_id
-            )
-
-        scheduled_date = data.get("scheduled_date") or timezone.now().date()
-        dead_line = data.get("dead_line")
-        validate_dates(scheduled_date, dead_line)
+        with transaction.atomic():
+            task = TaskServices._lock_task(user_obj, task_id)
+            summary_before = TaskSummaryServices.entry(task)
+
+            title = data.get("title")
+            if not title:
+                raise ValidationError("Title is required for full update")
+
+            if len(title.strip()) <= 0:
+                raise ValidationError("Title cannot be empty")
+
+            priority_level = data.get("priority_level", PriorityLevel.medium)
+            if isinstance(priority_level, PriorityLevel):
+                priority_level = priority_level.value
+
+            category_id = data.get("category")
+            category = None
+            if category_id:
+                category = TaskServices._validate_category(
+                    user_obj=user_obj,
+                    category_id=category_id
+                )
 
-        start_time = data.get("start_time")
-        end_time = data.get("end_time")
-        validate_times(start_time, end_time)
+            scheduled_date = data.get("scheduled_date") or timezone.now().date()
+            dead_line = data.get("dead_line")
+            validate_dates(scheduled_date, dead_line)
 
+            start_time = data.get("start_time")
+            end_time = data.get("end_time")
+            validate_times(start_time, end_time)
 
-        task.title = title.strip()
-        task.description = data.get("description", "")
-        task.category = category
-        task.priority_level = priority_level
-        task.scheduled_date = scheduled_date
-        task.dead_line = dead_line
-        task.start_time = start_time
-        task.end_time = end_time
-        task.is_completed = data.get("is_completed", False)
+            task.title = title.strip()
+            task.description = data.get("description", "")
+            task.category = category
+            task.priority_level = priority_level
+            task.scheduled_date = scheduled_date
+            task.dead_line = dead_line
+            task.start_time = start_time
+            task.end_time = end_time
+            task.is_completed = data.get("is_completed", False)
 
-        task.save()
+            conflicts = TaskServices._save_task(user_obj, task, summary_before)
 
-        return TaskServices._serialize_task(task)
+        return TaskConflictServices.attach(TaskServices._serialize_task(task), conflicts)
     
 
     @staticmethod
     def update_task_partial(user_obj, task_id: int, data: dict):
-        task = TaskServices._fetch_tasks(user_obj=user_obj).filter(pk=task_id).first()
-        if not task:
-            raise ObjectDoesNotExist(f"Task with ID {task_id} not found")
-        
-        for field, value in data.items():
-            if field == "category" and value is not None:
-                value = TaskServices._validate_category(user_obj=user_obj, category_id=value)
+        with transaction.atomic():
+            task = TaskServices._lock_task(user_obj, task_id)
+            summary_before = TaskSummaryServices.entry(task)
 
-            setattr(task, field, value)
+            for field, value in data.items():
+                if field == "category" and value is not None:
+                    value = TaskServices._validate_category(user_obj=user_obj, category_id=value)
 
-        validate_dates(
-            scheduled_date=task.scheduled_date,
-            dead_line=task.dead_line
-        )
+                setattr(task, field, value)
 
-        validate_times(
-            start_time=task.start_time,
-            end_time=task.end_time
-        )
+            validate_dates(
+                scheduled_date=task.scheduled_date,
+                dead_line=task.dead_line
+            )
+
+            validate_times(
+                start_time=task.start_time,
+                end_time=task.end_time
+            )
 
-        task.save()
+            conflicts = TaskServices._save_task(user_obj, task, summary_before)
 
-        return TaskServices._serialize_task(task)
+        return TaskConflictServices.attach(TaskServices._serialize_task(task), conflicts)
 
         
 
     @staticmethod
     def delete_task(user_obj, task_id):
-        task = TaskServices._fetch_tasks(user_obj=user_obj).filter(pk=task_id).first()
+        with transaction.atomic():
+            task = TaskServices._lock_task(user_obj, task_id)
+            TaskServices._delete_task(user_obj, task)
+
+    @staticmethod
+    def _lock_task(user_obj, task_id) -> Task:
+        """
+        Load the task for a read-modify-write and lock its row until the
+        surrounding transaction ends, so concurrent writes to the same task
+        see each other's summary entry. Call inside ``transaction.atomic``.
+        """
+        task = (
+            TaskServices._fetch_tasks(user_obj=user_obj)
+            .filter(pk=task_id)
+            # The category join is nullable; lock the task row only.
+            .select_for_update(of=("self",))
+            .first()
+        )
         if not task:
             raise ObjectDoesNotExist(f"Task with ID {task_id} not found")
-        
-        task.delete()
+        return task
+
+    @staticmethod
+    def _save_task(user_obj, task, summary_before=None):
+        """
+        Save a single task together with its summary, search vector and data
+        version. Returns the task's conflicts (see ``TaskConflictServices``).
+        ``summary_before`` must come from a row locked with ``_lock_task``,
+        whose transaction this joins without a savepoint.
+        """
+        with transaction.atomic(savepoint=False):
+            conflicts = TaskConflictServices.check(user_obj, task)
+            task.save()
+            TaskSummaryServices.record(
+                user_obj.id,
+                removed=[summary_before] if summary_before else [],
+                added=[TaskSummaryServices.entry(task)]
+            )
+            TaskSearchIndex.refresh([task.id])
+            bump_data_version(user_obj.id)
+
+        return conflicts
+
+    @staticmethod
+    def _delete_task(user_obj, task):
+        with transaction.atomic(savepoint=False):
+            task_id = task.id
+            _, deleted = task.delete()
+            # Someone else deleted it first: their delete did the bookkeeping.
+            if not deleted.get(Task._meta.label):
+                return
+            record_deletions(user_obj.id, Tombstone.KIND_TASK, [task_id])
+            TaskSummaryServices.record(user_obj.id, removed=[TaskSummaryServices.entry(task)])
+            bump_data_version(user_obj.id)
+
+    @staticmethod
+    def _task_page_queryset(user_obj, filters=None, cursor=None, limit=None):
+        # Recurring tasks are listed through their occurrences.
+        queryset = TaskServices._fetch_tasks(user_obj).filter(is_recurring=False)
+
+        # ``filters`` is the Q built by TaskFilterSchema; an empty one means
+        # the client asked for the default window.
+        if filters:
+            queryset = queryset.filter(filters)
+        else:
+            today = timezone.now().date()
+            queryset = queryset.filter(
+                Q(scheduled_date__range=[today, today + timedelta(days=DEFAULT_WINDOW_DAYS)])
+                | Q(
+                    scheduled_date__lt=today,
+                    dead_line__gte=today
+                )
+            )
+
+        # Keyset pagination on (scheduled_date, id). The plain
+        # scheduled_date__gte bound is what lets the (user, scheduled_date)
+        # index seek straight to the page instead of skipping rows.
+        if cursor:
+            cursor_date, cursor_id = decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(scheduled_date__gt=cursor_date) | Q(id__gt=cursor_id),
+                scheduled_date__gte=cursor_date
+            )
+
+        limit = min(limit or settings.TASK_PAGE_SIZE, settings.TASK_PAGE_SIZE_MAX)
+
+        return queryset.order_by("scheduled_date", "id")[:limit + 1], limit
+
+    @staticmethod
+    def _build_task_page(tasks: list, limit: int, serialize: bool = True):
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].scheduled_date, tasks[-1].id)
+
+        # Read-model rows (occurrences included) are already in the response shape.
+        if serialize:
+            tasks = [TaskServices._serialize_task(task) if isinstance(task, Task) else task for task in tasks]
+
+        return tasks, next_cursor
+
+    @staticmethod
+    def _series_filter(filters, series):
+        # An empty filter means the default window, for series too.
+        if not filters:
+            today = timezone.now().date()
+            return SeriesFilter(
+                scheduled_from=today,
+                scheduled_to=today + timedelta(days=DEFAULT_WINDOW_DAYS),
+                overdue=True
+            )
+        return series
+
+    @staticmethod
+    def _merge_occurrences(tasks: list, occurrences: list, limit: int) -> list:
+        if not occurrences:
+            return tasks
+        merged = heapq.merge(tasks, occurrences, key=lambda task: (task.scheduled_date, task.id))
+        return list(islice(merged, limit + 1))
 
     @staticmethod
     def _fetch_tasks(user_obj) -> QuerySet:
@@ -340,9 +545,12 @@ class TaskServices:
             to_attr="prefetched_tagged_items"
         )
 
+        # search_vector is only read by the database; deferring it keeps it
+        # out of every row fetched here and out of the UPDATE issued by save().
         return (
             Task.objects
             .filter(user=user_obj)
+            .defer("search_vector")
             .select_related("category")
             .prefetch_related("subTasks", tagged_items_prefetch)
         )
@@ -363,9 +571,37 @@ class TaskServices:
             "created_at": task.created_at,
             "updated_at": task.updated_at,
             "subTasks": TaskServices._serialize_subtasks(task.subTasks.all()),
-            "tags": TaskServices._serizlie_tags(task.prefetched_tagged_items)
+            "tags": TaskServices._serizlie_tags(task.prefetched_tagged_items),
+            # Only occurrences of a series carry one; see TaskRow.
+            "recurring_task": None,
         }
     
+    @staticmethod
+    def _export_queryset(user_obj) -> QuerySet:
+        return (
+            TaskServices._fetch_tasks(user_obj)
+            .select_related("recurrence")
+            .prefetch_related(
+                Prefetch("occurrences", queryset=TaskOccurrence.objects.order_by("occurrence_date"))
+            )
+            .order_by("id")
+        )
+
+    @staticmethod
+    def _dump_task_line(task: 'Task') -> bytes:
+        """
+        One NDJSON line of the export. A recurring task also carries its
+        rule and its stored occurrences, so the line describes the whole
+        series rather than its first occurrence.
+        """
+        line = TaskServices._serialize_task(task)
+        if task.is_recurring:
+            line["recurrence"] = RecurrenceServices._serialize_rule(task.recurrence)
+            line["occurrences"] = [
+                RecurrenceServices._serialize_occurrence(occurrence) for occurrence in task.occurrences.all()
+            ]
+        return dumps(line) + b"\n"
+
     @staticmethod
     def _serializer_task_basic(task: 'Task') -> dict:
         return {
@@ -382,7 +618,8 @@ class TaskServices:
             "created_at": task.created_at,
             "updated_at": task.updated_at,
             "subTasks": [],
-            "tags": []
+            "tags": [],
+            "recurring_task": None,
         }
     
     @staticmethod
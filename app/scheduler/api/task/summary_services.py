@@ -0,0 +1,108 @@
+from collections import Counter, defaultdict
+from typing import Iterable, List
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+
+from app.scheduler.models import Task, TaskDaySummary
+
+
+PRIORITY_COLUMNS = {
+    Task.PRIORITY_LEVEL_LOW: "low",
+    Task.PRIORITY_LEVEL_MEDIUM: "medium",
+    Task.PRIORITY_LEVEL_HIGH: "high",
+}
+
+
+class TaskSummaryServices:
+    """
+    Maintains ``TaskDaySummary``. Write paths take an ``entry`` of a task
+    before and after the change and pass them to ``record`` inside the
+    transaction of the write, so the counters never drift from ``Task``.
+    Days whose tasks all moved away keep a row with zero counts; readers
+    skip them.
+    """
+
+    @staticmethod
+    def get_summary(user_obj, date_from, date_to) -> List[dict]:
+        if date_to < date_from:
+            raise ValidationError("'to' must not be before 'from'")
+
+        max_days = settings.TASK_SUMMARY_MAX_DAYS
+        if (date_to - date_from).days + 1 > max_days:
+            raise ValidationError(f"Date range can span at most {max_days} days")
+
+        return list(
+            TaskDaySummary.objects
+            .filter(user=user_obj, scheduled_date__range=[date_from, date_to], total__gt=0)
+            .order_by("scheduled_date")
+            .values("scheduled_date", "total", "completed", "low", "medium", "high")
+        )
+
+    @staticmethod
+    def entry(task: Task) -> tuple:
+        """The (date, completed, priority) a task contributes to the summary."""
+        scheduled_date = Task._meta.get_field("scheduled_date").to_python(task.scheduled_date)
+        priority_level = getattr(task.priority_level, "value", task.priority_level)
+        return scheduled_date, bool(task.is_completed), priority_level
+
+    @staticmethod
+    def record(user_id, removed: Iterable[tuple] = (), added: Iterable[tuple] = ()):
+        deltas = defaultdict(Counter)
+        for sign, entries in ((-1, removed), (1, added)):
+            for scheduled_date, is_completed, priority_level in entries:
+                delta = deltas[scheduled_date]
+                delta["total"] += sign
+                delta["completed"] += sign if is_completed else 0
+                delta[PRIORITY_COLUMNS[priority_level]] += sign
+
+        for scheduled_date, delta in deltas.items():
+            # Nothing to write for e.g. a title-only update.
+            delta = {column: value for column, value in delta.items() if value}
+            if delta:
+                TaskSummaryServices._apply_delta(user_id, scheduled_date, delta)
+
+    @staticmethod
+    def _apply_delta(user_id, scheduled_date, delta: dict):
+        updates = {column: F(column) + value for column, value in delta.items()}
+        updated = TaskDaySummary.objects.filter(
+            user_id=user_id, scheduled_date=scheduled_date
+        ).update(**updates)
+        if updated:
+            return
+
+        try:
+            with transaction.atomic():
+                TaskDaySummary.objects.create(
+                    user_id=user_id,
+                    scheduled_date=scheduled_date,
+                    **{column: max(value, 0) for column, value in delta.items()}
+                )
+        except IntegrityError:
+            # Another transaction created the day first.
+            TaskDaySummary.objects.filter(
+                user_id=user_id, scheduled_date=scheduled_date
+            ).update(**updates)
+
+    @staticmethod
+    def rebuild(user_ids: Iterable[int]):
+        """Recount the summary of the given users from their tasks."""
+        user_ids = list(user_ids)
+        rows = (
+            Task.objects
+            .filter(user_id__in=user_ids)
+            .values("user_id", "scheduled_date")
+            .annotate(
+                total=Count("id"),
+                completed=Count("id", filter=Q(is_completed=True)),
+                **{
+                    column: Count("id", filter=Q(priority_level=priority_level))
+                    for priority_level, column in PRIORITY_COLUMNS.items()
+                }
+            )
+            .order_by()
+        )
+        with transaction.atomic():
+            TaskDaySummary.objects.filter(user_id__in=user_ids).delete()
+            TaskDaySummary.objects.bulk_create((TaskDaySummary(**row) for row in rows.iterator()), batch_size=1000)
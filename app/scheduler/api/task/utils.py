@@ -1,4 +1,11 @@
+import base64
+from datetime import date, datetime, time, timedelta
 from django.core.exceptions import ValidationError
+from django.db.backends.postgresql.psycopg_any import NumericRange
+
+
+EPOCH = datetime(1970, 1, 1)
+
 
 def validate_dates(scheduled_date, dead_line):
     if dead_line:
@@ -12,4 +19,34 @@ def validate_dates(scheduled_date, dead_line):
 def validate_times(start_time, end_time):
     if start_time and end_time:
         if end_time <= start_time:
-            raise ValidationError("End time msut be after start time")
\ No newline at end of file
+            raise ValidationError("End time msut be after start time")
+
+def encode_cursor(scheduled_date, task_id):
+    raw = f"{scheduled_date.isoformat()}:{task_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw_date, raw_id = base64.urlsafe_b64decode(padded).decode().split(":")
+        return date.fromisoformat(raw_date), int(raw_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError("Invalid cursor")
+
+
+def busy_range(scheduled_date, start_time, end_time):
+    """
+    Python side of ``Task.busy_range`` for a task with both times: the
+    [start, end) wall-clock epoch seconds, or ``None``.
+    """
+    if not (scheduled_date and start_time and end_time):
+        return None
+
+    epoch_day = (datetime.combine(scheduled_date, time.min) - EPOCH) // timedelta(seconds=1)
+    return NumericRange(epoch_day + _time_seconds(start_time), epoch_day + _time_seconds(end_time))
+
+
+def _time_seconds(value: time) -> int:
+    # The column casts EXTRACT(EPOCH ...) to bigint, which rounds.
+    return value.hour * 3600 + value.minute * 60 + value.second + (value.microsecond >= 500_000)
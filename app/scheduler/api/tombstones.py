@@ -0,0 +1,11 @@
+from typing import Iterable
+
+from app.scheduler.models import Tombstone
+
+
+def record_deletions(user_id, kind: str, object_ids: Iterable[int]):
+    """Leave a tombstone for each deleted object; call inside the delete's transaction."""
+    Tombstone.objects.bulk_create([
+        Tombstone(user_id=user_id, kind=kind, object_id=object_id)
+        for object_id in object_ids
+    ])
@@ -0,0 +1,59 @@
+import hashlib
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import HttpResponseNotModified
+from django.utils import timezone
+from django.utils.http import parse_etags
+
+from app.scheduler.models import UserDataVersion
+
+
+def bump_data_version(user_id):
+    updated = UserDataVersion.objects.filter(user_id=user_id).update(version=F("version") + 1)
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            UserDataVersion.objects.create(user_id=user_id, version=1)
+    except IntegrityError:
+        UserDataVersion.objects.filter(user_id=user_id).update(version=F("version") + 1)
+
+
+async def abump_data_version(user_id):
+    updated = await UserDataVersion.objects.filter(user_id=user_id).aupdate(version=F("version") + 1)
+    if not updated:
+        await sync_to_async(bump_data_version)(user_id)
+
+
+def get_data_version(user_id) -> int:
+    version = UserDataVersion.objects.filter(user_id=user_id).values_list("version", flat=True).first()
+    return version or 0
+
+
+async def aget_data_version(user_id) -> int:
+    version = await UserDataVersion.objects.filter(user_id=user_id).values_list("version", flat=True).afirst()
+    return version or 0
+
+
+def make_list_etag(request, resource: str, version: int) -> str:
+    # The default task window is relative to today, so the date is part of
+    # the key alongside the query string (filters, cursor, limit).
+    key = f"{resource}:{request.auth.id}:{version}:{timezone.now().date()}:{request.GET.urlencode()}"
+    return 'W/"%s"' % hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def not_modified(request, etag: str):
+    """Return a 304 response when ``If-None-Match`` matches ``etag``, else ``None``."""
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return None
+
+    tags = {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    return None
@@ -0,0 +1,28 @@
+from typing import List
+
+from app.core.jobs import job
+from app.scheduler.api.task.search_index import TaskSearchIndex
+from app.scheduler.api.task.summary_services import TaskSummaryServices
+from app.scheduler.reminders.services import DeadlineReminderServices
+
+
+@job("scheduler.refresh_search", batch_size=100)
+def refresh_search(payloads: List[dict]):
+    """Payloads name either ``task_ids`` or a ``tag_id`` whose tasks need a new search vector."""
+    task_ids = set()
+    for payload in payloads:
+        task_ids.update(payload.get("task_ids", ()))
+        if payload.get("tag_id"):
+            TaskSearchIndex.refresh_for_tag(payload["tag_id"])
+    TaskSearchIndex.refresh(task_ids)
+
+
+@job("scheduler.rebuild_task_summary", batch_size=50, concurrency=1)
+def rebuild_task_summary(payloads: List[dict]):
+    TaskSummaryServices.rebuild({payload["user_id"] for payload in payloads})
+
+
+@job("scheduler.deliver_deadline_reminders", batch_size=10, max_attempts=5)
+def deliver_deadline_reminders(payloads: List[dict]):
+    for payload in payloads:
+        DeadlineReminderServices.deliver(payload["kind"], payload["task_ids"])
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_summaries(apps, schema_editor):
+    Task = apps.get_model('scheduler', 'Task')
+    TaskDaySummary = apps.get_model('scheduler', 'TaskDaySummary')
+
+    rows = (
+        Task.objects
+        .values('user_id', 'scheduled_date')
+        .annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(is_completed=True)),
+            low=Count('id', filter=Q(priority_level='L')),
+            medium=Count('id', filter=Q(priority_level='M')),
+            high=Count('id', filter=Q(priority_level='H')),
+        )
+        .order_by()
+    )
+    TaskDaySummary.objects.bulk_create(
+        (TaskDaySummary(**row) for row in rows.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0002_userdataversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskDaySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scheduled_date', models.DateField()),
+                ('total', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('low', models.IntegerField(default=0)),
+                ('medium', models.IntegerField(default=0)),
+                ('high', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_day_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'scheduled_date')},
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_search_vectors(apps, schema_editor):
+    Task = apps.get_model('scheduler', 'Task')
+    SubTask = apps.get_model('scheduler', 'SubTask')
+    TaggedItem = apps.get_model('scheduler', 'TaggedItem')
+
+    config = settings.TASK_SEARCH_CONFIG
+    subtask_titles = Subquery(
+        SubTask.objects.filter(parent_task=OuterRef('pk'))
+        .values('parent_task').annotate(text=StringAgg('title', ' ')).values('text')
+    )
+    tag_titles = Subquery(
+        TaggedItem.objects.filter(task=OuterRef('pk'))
+        .values('task').annotate(text=StringAgg('tag__title', ' ')).values('text')
+    )
+    Task.objects.update(search_vector=(
+        SearchVector('title', weight='A', config=config)
+        + SearchVector(Coalesce(subtask_titles, Value(''), output_field=TextField()), weight='B', config=config)
+        + SearchVector(Coalesce(tag_titles, Value(''), output_field=TextField()), weight='B', config=config)
+        + SearchVector('description', weight='C', config=config)
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0003_taskdaysummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='task_search_vector_gin'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:12
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0004_task_search'),
+    ]
+
+    operations = [
+        # Needs the contrib package on the server and, unless pg_trgm is
+        # already installed, a role allowed to create extensions.
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='task_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
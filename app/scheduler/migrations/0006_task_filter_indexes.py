@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0005_task_title_trgm'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taggeditem',
+            index=models.Index(fields=['task', 'tag'], name='taggeditem_task_tag'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'priority_level', 'scheduled_date'], name='task_user_priority_date'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'is_completed', 'scheduled_date'], name='task_user_completed_date'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'category', 'scheduled_date'], name='task_user_category_date'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'dead_line'], name='task_user_deadline'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:25
+
+import app.scheduler.models
+import django.contrib.postgres.fields.ranges
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0007_delta_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='busy_range',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(start_time__isnull=False, then=models.Func(app.scheduler.models.WallClockSeconds('scheduled_date', 'start_time'), django.db.models.functions.comparison.Coalesce(app.scheduler.models.WallClockSeconds('scheduled_date', 'end_time'), django.db.models.expressions.CombinedExpression(app.scheduler.models.WallClockSeconds('scheduled_date', 'start_time'), '+', models.Value(1))), function='int8range', output_field=django.contrib.postgres.fields.ranges.BigIntegerRangeField())), default=None, output_field=django.contrib.postgres.fields.ranges.BigIntegerRangeField()), output_field=django.contrib.postgres.fields.ranges.BigIntegerRangeField()),
+        ),
+    ]
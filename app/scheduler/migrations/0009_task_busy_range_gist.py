@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:27
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0008_task_busy_range'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # btree_gist lets user_id share the GiST index with the range, so
+        # overlap queries only walk one user's intervals. Same requirements
+        # as pg_trgm in 0005.
+        BtreeGistExtension(),
+        migrations.AddIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['user', 'busy_range'], name='task_user_busy_range'),
+        ),
+    ]
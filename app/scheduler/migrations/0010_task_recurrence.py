@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0009_task_busy_range_gist'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurrence_date', models.DateField()),
+                ('is_cancelled', models.BooleanField(default=False)),
+                ('is_completed', models.BooleanField(default=False)),
+                ('start_time', models.TimeField(null=True)),
+                ('end_time', models.TimeField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskRecurrence',
+            fields=[
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recurrence', serialize=False, to='scheduler.task')),
+                ('freq', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')], max_length=7)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('weekdays', models.PositiveSmallIntegerField(default=0)),
+                ('until', models.DateField(null=True)),
+                ('count', models.PositiveIntegerField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='is_recurring',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_recurring', True)), fields=['user'], name='task_user_recurring'),
+        ),
+        migrations.AddField(
+            model_name='taskoccurrence',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='scheduler.task'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='taskoccurrence',
+            unique_together={('task', 'occurrence_date')},
+        ),
+    ]
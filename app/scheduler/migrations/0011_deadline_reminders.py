@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0010_task_recurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeadlineReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('due_soon', 'Due soon'), ('overdue', 'Overdue')], max_length=10)),
+                ('dead_line', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('dead_line__isnull', False), ('is_completed', False), ('is_recurring', False)), fields=['dead_line', 'id'], name='task_open_deadline'),
+        ),
+        migrations.AddField(
+            model_name='deadlinereminder',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deadline_reminders', to='scheduler.task'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='deadlinereminder',
+            unique_together={('kind', 'dead_line', 'task')},
+        ),
+    ]
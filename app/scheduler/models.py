@@ -1,4 +1,9 @@
+from django.contrib.postgres.fields import BigIntegerRangeField
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Case, Func, Q, When
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from app.scheduler.validator import validate_date_not_past
 from django.utils import timezone
@@ -11,14 +16,29 @@ class TaskCategory(models.Model):
         on_delete=models.CASCADE,
         related_name="taskCategories",
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ["title", "user"]
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="category_user_updated"),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class WallClockSeconds(Func):
+    """
+    Seconds since the epoch of ``date + time`` read as a wall-clock
+    timestamp (no time zone), which keeps the expression immutable.
+    """
+
+    template = "EXTRACT(EPOCH FROM (%(expressions)s))::bigint"
+    arg_joiner = " + "
+    output_field = models.BigIntegerField()
+
+
 class Task(models.Model):
     PRIORITY_LEVEL_LOW = "L"
     PRIORITY_LEVEL_MEDIUM = "M"
@@ -41,19 +61,148 @@ class Task(models.Model):
     start_time = models.TimeField(null=True, blank=True)
     end_time = models.TimeField(null=True, blank=True)
     is_completed = models.BooleanField(default=False)
+    # Set while the task has a TaskRecurrence. Such a task is a series: it is
+    # listed through its occurrences rather than as itself.
+    is_recurring = models.BooleanField(default=False)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tasks"
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Title, subtask and tag titles and description, maintained by
+    # TaskSearchIndex on every write.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # [start, end) of a timed task in wall-clock epoch seconds, for overlap
+    # and gap queries. A task without end_time occupies its start second;
+    # untimed tasks have none.
+    busy_range = models.GeneratedField(
+        expression=Case(
+            When(start_time__isnull=False, then=Func(
+                WallClockSeconds("scheduled_date", "start_time"),
+                Coalesce(
+                    WallClockSeconds("scheduled_date", "end_time"),
+                    WallClockSeconds("scheduled_date", "start_time") + 1
+                ),
+                function="int8range",
+                output_field=BigIntegerRangeField()
+            )),
+            default=None,
+            output_field=BigIntegerRangeField()
+        ),
+        output_field=BigIntegerRangeField(),
+        db_persist=True,
+    )
 
     class Meta:
-        indexes = [models.Index(fields=["user", "scheduled_date"])]
+        indexes = [
+            models.Index(fields=["user", "scheduled_date"]),
+            # One per list filter, each keeping scheduled_date last so the
+            # filtered page is still read in keyset order.
+            models.Index(fields=["user", "priority_level", "scheduled_date"], name="task_user_priority_date"),
+            models.Index(fields=["user", "is_completed", "scheduled_date"], name="task_user_completed_date"),
+            models.Index(fields=["user", "category", "scheduled_date"], name="task_user_category_date"),
+            models.Index(fields=["user", "dead_line"], name="task_user_deadline"),
+            models.Index(fields=["user", "updated_at"], name="task_user_updated"),
+            GinIndex(fields=["search_vector"], name="task_search_vector_gin"),
+            GinIndex(fields=["title"], opclasses=["gin_trgm_ops"], name="task_title_trgm"),
+            GistIndex(fields=["user", "busy_range"], name="task_user_busy_range"),
+            models.Index(fields=["user"], condition=Q(is_recurring=True), name="task_user_recurring"),
+            # The deadline reminder scan across all users: open, single
+            # tasks by deadline, in (dead_line, id) keyset order.
+            models.Index(
+                fields=["dead_line", "id"],
+                condition=Q(is_completed=False, is_recurring=False, dead_line__isnull=False),
+                name="task_open_deadline",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class TaskRecurrence(models.Model):
+    """
+    RRULE-like rule of a recurring task. The series starts on the task's
+    ``scheduled_date`` and every occurrence copies the task; occurrences are
+    expanded on read, so a series is one row however long it runs.
+    """
+
+    FREQ_DAILY = "daily"
+    FREQ_WEEKLY = "weekly"
+    FREQ_MONTHLY = "monthly"
+
+    FREQ_CHOICES = [
+        (FREQ_DAILY, "Daily"),
+        (FREQ_WEEKLY, "Weekly"),
+        (FREQ_MONTHLY, "Monthly"),
+    ]
+
+    task = models.OneToOneField(
+        Task, on_delete=models.CASCADE, primary_key=True, related_name="recurrence"
+    )
+    freq = models.CharField(max_length=7, choices=FREQ_CHOICES)
+    interval = models.PositiveSmallIntegerField(default=1)
+    # Weekly rules only: bit 0 is Monday, bit 6 Sunday. 0 repeats on the
+    # weekday the series starts on.
+    weekdays = models.PositiveSmallIntegerField(default=0)
+    until = models.DateField(null=True)
+    count = models.PositiveIntegerField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class TaskOccurrence(models.Model):
+    """
+    The one occurrence of a recurring task that differs from the series:
+    cancelled, completed or moved to other times. Times left null follow
+    the series.
+    """
+
+    task = models.ForeignKey(
+        Task, on_delete=models.CASCADE, related_name="occurrences"
+    )
+    occurrence_date = models.DateField()
+    is_cancelled = models.BooleanField(default=False)
+    is_completed = models.BooleanField(default=False)
+    start_time = models.TimeField(null=True)
+    end_time = models.TimeField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ["task", "occurrence_date"]
+
+
+class DeadlineReminder(models.Model):
+    """
+    A reminder about a task's deadline, recorded when the reminder scheduler
+    queues it. The unique (kind, dead_line, task) makes the scheduler
+    idempotent: a restart scans again but skips what it already queued, and
+    moving the deadline makes the task due for new reminders.
+    """
+
+    KIND_DUE_SOON = "due_soon"
+    KIND_OVERDUE = "overdue"
+
+    KIND_CHOICES = [
+        (KIND_DUE_SOON, "Due soon"),
+        (KIND_OVERDUE, "Overdue"),
+    ]
+
+    task = models.ForeignKey(
+        Task, on_delete=models.CASCADE, related_name="deadline_reminders"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    dead_line = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set once the notifier took it, or once it turned out stale (task
+    # completed or deadline moved) by delivery time.
+    sent_at = models.DateTimeField(null=True)
+
+    class Meta:
+        # In the scan's (dead_line, id) order within a kind, so the scan
+        # anti-joins it with a merge over both columns.
+        unique_together = ["kind", "dead_line", "task"]
+
+
 class SubTask(models.Model):
     title = models.CharField(max_length=150)
     is_completed = models.BooleanField(default=False)
@@ -67,9 +216,13 @@ class Tag(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tags"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ["title", "user"]
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="tag_user_updated"),
+        ]
 
     def __str__(self):
         return self.title
@@ -84,3 +237,73 @@ class TaggedItem(models.Model):
 
     class Meta:
         unique_together = ["tag", "task"]
+        # unique_together covers lookups by tag; this one serves the
+        # per-task EXISTS of the tag filter and the tags prefetch.
+        indexes = [
+            models.Index(fields=["task", "tag"], name="taggeditem_task_tag"),
+        ]
+
+
+class UserDataVersion(models.Model):
+    """
+    Per-user counter bumped on every task, tag or category write. List
+    endpoints derive their ETag from it, so a conditional GET only reads
+    this row.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="data_version",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+
+class TaskDaySummary(models.Model):
+    """
+    Task counts per user and scheduled date, kept in step with ``Task`` by
+    the task services inside the same transaction as the task write.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="task_day_summaries"
+    )
+    scheduled_date = models.DateField()
+    total = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    low = models.IntegerField(default=0)
+    medium = models.IntegerField(default=0)
+    high = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ["user", "scheduled_date"]
+
+
+class Tombstone(models.Model):
+    """
+    A deleted task, tag or category. Delta sync reports these so clients can
+    drop their copies; ``prune_sync_tombstones`` removes the expired ones.
+    """
+
+    KIND_TASK = "task"
+    KIND_TAG = "tag"
+    KIND_CATEGORY = "category"
+
+    KIND_CHOICES = [
+        (KIND_TASK, "Task"),
+        (KIND_TAG, "Tag"),
+        (KIND_CATEGORY, "Category"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tombstones"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deleted_at"], name="tombstone_user_deleted"),
+        ]
@@ -0,0 +1,74 @@
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import date
+from functools import lru_cache
+from typing import List
+
+import orjson
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Reminder:
+    """
+    What a notifier delivers. ``key`` is the same for every delivery of one
+    reminder, so a sink can drop the duplicates of a retried batch.
+    """
+
+    key: str
+    kind: str
+    user_id: int
+    email: str
+    task_id: int
+    title: str
+    dead_line: date
+
+
+class Notifier(ABC):
+    """
+    Delivers reminders, set with ``DEADLINE_REMINDER_NOTIFIER``. ``send``
+    runs inside the delivery job's transaction: raising retries the whole
+    batch later, so it should either deliver all of it or raise.
+    """
+
+    @abstractmethod
+    def send(self, reminders: List[Reminder]):
+        ...
+
+
+class LogNotifier(Notifier):
+    def send(self, reminders: List[Reminder]):
+        for reminder in reminders:
+            logger.info(
+                "Task %s of user %s is %s (deadline %s): %s",
+                reminder.task_id, reminder.user_id, reminder.kind.replace("_", " "),
+                reminder.dead_line, reminder.title
+            )
+
+
+class FileNotifier(Notifier):
+    """Appends one JSON line per reminder to ``DEADLINE_REMINDER_FILE``."""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, reminders: List[Reminder]):
+        lines = b"".join(orjson.dumps(asdict(reminder), option=orjson.OPT_APPEND_NEWLINE) for reminder in reminders)
+        with self._lock, open(self.path or settings.DEADLINE_REMINDER_FILE, "ab") as sink:
+            sink.write(lines)
+
+
+def get_notifier() -> Notifier:
+    return _notifier(settings.DEADLINE_REMINDER_NOTIFIER)
+
+
+@lru_cache(maxsize=None)
+def _notifier(path: str) -> Notifier:
+    return import_string(path)()
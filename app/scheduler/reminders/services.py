@@ -0,0 +1,245 @@
+import logging
+import threading
+import time as timer
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional, Tuple
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q, QuerySet
+from django.utils import timezone
+
+from app.core import metrics
+from app.core.jobs import enqueue_many
+from app.scheduler.models import DeadlineReminder, Task
+from .notifiers import Reminder, get_notifier
+from .wakeups import WakeupHeap
+
+
+logger = logging.getLogger(__name__)
+
+DELIVER_JOB = "scheduler.deliver_deadline_reminders"
+
+# Advisory lock namespace (first key) of the single running scheduler.
+LOCK_NAMESPACE = 2505
+
+
+class DeadlineReminderServices:
+    """
+    Finds the open tasks that are due a reminder and queues them for
+    delivery. A task is due at the end of its ``dead_line`` day, so the
+    tasks due a reminder of a kind are exactly those whose deadline falls in
+    a date range; each range is read with a keyset scan of the partial
+    ``task_open_deadline`` index, anti-joined against the reminders already
+    recorded.
+
+    Recurring series are left out: their ``dead_line`` is the first
+    occurrence's.
+    """
+
+    @staticmethod
+    def due_ranges(now: datetime) -> List[Tuple[str, date, date]]:
+        """(kind, first, last) deadline dates due a reminder of that kind at ``now``."""
+        today = timezone.localdate(now)
+        lead = timedelta(hours=settings.DEADLINE_REMINDER_LEAD_HOURS)
+        # The end of day D is the start of D + 1, which is due once it is
+        # no later than now (overdue) or now + lead (due soon).
+        return [
+            (DeadlineReminder.KIND_DUE_SOON, today, timezone.localdate(now + lead) - timedelta(days=1)),
+            (DeadlineReminder.KIND_OVERDUE,
+             today - timedelta(days=settings.DEADLINE_REMINDER_CATCHUP_DAYS), today - timedelta(days=1)),
+        ]
+
+    @staticmethod
+    def next_wakeups(now: datetime) -> List[Tuple[datetime, str]]:
+        """When each kind's range next grows by a day."""
+        lead = timedelta(hours=settings.DEADLINE_REMINDER_LEAD_HOURS)
+        return [
+            (_next_midnight(now + lead) - lead, DeadlineReminder.KIND_DUE_SOON),
+            (_next_midnight(now), DeadlineReminder.KIND_OVERDUE),
+        ]
+
+    @staticmethod
+    def schedule(now: datetime) -> int:
+        """
+        Record and queue every reminder due at ``now`` that was not queued
+        before; returns how many. Each batch is recorded and queued in one
+        transaction, so a crash leaves nothing half done.
+        """
+        batch_size = settings.DEADLINE_REMINDER_BATCH_SIZE
+        queued = 0
+
+        for kind, first, last in DeadlineReminderServices.due_ranges(now):
+            if first > last:
+                continue
+
+            after = None
+            while True:
+                batch = DeadlineReminderServices._scan(kind, first, last, after, batch_size)
+                if not batch:
+                    break
+
+                with transaction.atomic():
+                    DeadlineReminder.objects.bulk_create(
+                        [DeadlineReminder(task_id=task_id, kind=kind, dead_line=dead_line)
+                         for task_id, dead_line in batch],
+                        # Only a second scheduler racing this one conflicts.
+                        ignore_conflicts=True,
+                    )
+                    enqueue_many(DELIVER_JOB, [{"kind": kind, "task_ids": [task_id for task_id, _ in batch]}])
+
+                metrics.deadline_reminders.inc(len(batch), kind=kind, result="queued")
+                queued += len(batch)
+                after = (batch[-1][1], batch[-1][0])
+                if len(batch) < batch_size:
+                    break
+
+        return queued
+
+    @staticmethod
+    def deliver(kind: str, task_ids: Iterable[int]) -> int:
+        """
+        Hand the unsent reminders of ``kind`` for ``task_ids`` to the
+        notifier and mark them sent; returns how many were delivered.
+        Reminders whose task was completed or got another deadline since
+        are marked without being sent.
+        """
+        reminders = list(
+            DeadlineReminder.objects
+            .filter(kind=kind, task_id__in=list(task_ids), sent_at__isnull=True)
+            .select_for_update(of=("self",))
+            .values_list(
+                "id", "task_id", "dead_line", "task__dead_line", "task__is_completed",
+                "task__title", "task__user_id", "task__user__email"
+            )
+        )
+        if not reminders:
+            return 0
+
+        deliveries = [
+            Reminder(
+                key=f"{task_id}:{kind}:{dead_line.isoformat()}",
+                kind=kind,
+                user_id=user_id,
+                email=email,
+                task_id=task_id,
+                title=title,
+                dead_line=dead_line,
+            )
+            for _, task_id, dead_line, task_dead_line, is_completed, title, user_id, email in reminders
+            if task_dead_line == dead_line and not is_completed
+        ]
+        if deliveries:
+            get_notifier().send(deliveries)
+
+        DeadlineReminder.objects.filter(id__in=[reminder[0] for reminder in reminders]).update(
+            sent_at=timezone.now()
+        )
+        metrics.deadline_reminders.inc(len(deliveries), kind=kind, result="sent")
+        metrics.deadline_reminders.inc(len(reminders) - len(deliveries), kind=kind, result="stale")
+        return len(deliveries)
+
+    @staticmethod
+    def prune(now: datetime) -> int:
+        """
+        Delete the sent reminders of deadlines the scans no longer reach;
+        they are not needed to skip those tasks any more.
+        """
+        cutoff = timezone.localdate(now) - timedelta(days=settings.DEADLINE_REMINDER_CATCHUP_DAYS)
+        deleted, _ = DeadlineReminder.objects.filter(
+            kind__in=[DeadlineReminder.KIND_DUE_SOON, DeadlineReminder.KIND_OVERDUE],
+            dead_line__lt=cutoff,
+            sent_at__isnull=False,
+        ).delete()
+        return deleted
+
+    @staticmethod
+    def _scan(kind: str, first: date, last: date, after: Optional[tuple], limit: int) -> List[Tuple[int, date]]:
+        queryset = DeadlineReminderServices._scan_queryset(kind, first, last, after)
+        return list(queryset.values_list("id", "dead_line")[:limit])
+
+    @staticmethod
+    def _scan_queryset(kind: str, first: date, last: date, after: Optional[tuple]) -> QuerySet:
+        """Open tasks with a deadline from ``first`` to ``last`` and no reminder of ``kind`` for it."""
+        # Both sides are bounded by the same range, so each keyset batch
+        # merges only what lies past the previous one.
+        low = after[0] if after else first
+        queryset = Task.objects.filter(
+            dead_line__range=[low, last], is_completed=False, is_recurring=False
+        ).filter(
+            ~Exists(DeadlineReminder.objects.filter(
+                kind=kind, dead_line__range=[low, last], dead_line=OuterRef("dead_line"), task=OuterRef("pk")
+            ))
+        )
+        if after:
+            queryset = queryset.filter(Q(dead_line__gt=after[0]) | Q(dead_line=after[0], id__gt=after[1]))
+        return queryset.order_by("dead_line", "id")
+
+
+class DeadlineReminderScheduler:
+    """
+    The long-running side of reminders. It sleeps until the next wakeup on
+    its heap, when a kind's range grows by a day, or at most
+    ``DEADLINE_REMINDER_SCAN_INTERVAL`` seconds, after which it scans again
+    to pick up tasks whose deadline was set or moved into a range that was
+    already scanned. Everything it does is recorded in the database, so a
+    restarted scheduler carries on where the last one stopped.
+    """
+
+    def __init__(self):
+        self.wakeups = WakeupHeap()
+        self._pruned_on = None
+
+    def run(self, stop: threading.Event, once: bool = False):
+        if not self._acquire():
+            raise RuntimeError("Another deadline reminder scheduler is running")
+
+        try:
+            while not stop.is_set():
+                now = timezone.now()
+                self.tick(now)
+                if once:
+                    return
+
+                wait = timedelta(seconds=settings.DEADLINE_REMINDER_SCAN_INTERVAL)
+                next_at = self.wakeups.next_at()
+                if next_at is not None:
+                    wait = min(wait, next_at - now)
+                stop.wait(max(wait.total_seconds(), 0))
+        finally:
+            self._release()
+
+    def tick(self, now: datetime) -> int:
+        # A wakeup only makes the scan happen on time; the scan itself
+        # covers every kind whatever woke it.
+        self.wakeups.pop_due(now)
+        start = timer.perf_counter()
+        queued = DeadlineReminderServices.schedule(now)
+        metrics.deadline_reminder_scan.observe(timer.perf_counter() - start)
+        for at, kind in DeadlineReminderServices.next_wakeups(now):
+            self.wakeups.push(at, kind)
+
+        today = timezone.localdate(now)
+        if self._pruned_on != today:
+            DeadlineReminderServices.prune(now)
+            self._pruned_on = today
+
+        if queued:
+            logger.info("Queued %s deadline reminders", queued)
+        metrics.registry.maybe_flush()
+        return queued
+
+    @staticmethod
+    def _acquire() -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s, 0)", [LOCK_NAMESPACE])
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def _release():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s, 0)", [LOCK_NAMESPACE])
+
+
+def _next_midnight(moment: datetime) -> datetime:
+    day = timezone.localdate(moment) + timedelta(days=1)
+    return timezone.make_aware(datetime.combine(day, time.min))
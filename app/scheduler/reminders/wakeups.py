@@ -0,0 +1,42 @@
+import heapq
+from datetime import datetime
+from itertools import count
+from typing import Dict, Hashable, List, Optional
+
+
+class WakeupHeap:
+    """
+    Min-heap of pending wakeups with at most one per key. Pushing a key
+    again keeps the earlier of the two times; the superseded entry stays in
+    the heap and is skipped when it surfaces.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._pending: Dict[Hashable, datetime] = {}
+        self._seq = count()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def push(self, at: datetime, key: Hashable):
+        pending = self._pending.get(key)
+        if pending is not None and pending <= at:
+            return
+        self._pending[key] = at
+        heapq.heappush(self._heap, (at, next(self._seq), key))
+
+    def pop_due(self, now: datetime) -> List[Hashable]:
+        """Remove and return the keys whose wakeup is at or before ``now``."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            at, _, key = heapq.heappop(self._heap)
+            if self._pending.get(key) == at:
+                del self._pending[key]
+                due.append(key)
+        return due
+
+    def next_at(self) -> Optional[datetime]:
+        while self._heap and self._pending.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
@@ -0,0 +1,899 @@
+import json
+import os
+import tempfile
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from unittest import skipUnless
+
+import orjson
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import connection
+from django.db.backends.postgresql.psycopg_any import NumericRange
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from ninja.responses import NinjaJSONEncoder
+from pydantic import ValidationError as SchemaValidationError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.core.management.commands import check_task_filter_plans
+from app.core.models import Job
+from app.core.renderers import TrustedResponse
+from app.scheduler.api.agenda.services import AgendaServices
+from app.scheduler.api.recurrence.occurrences import OccurrenceServices
+from app.scheduler.api.recurrence.rules import Rule, between, includes
+from app.scheduler.api.recurrence.services import RecurrenceServices
+from app.scheduler.api.schemas import FullTaskSchemaIn, FullTaskSchemaOut
+from app.scheduler.api.sync.services import SyncServices
+from app.scheduler.api.task.filters import TaskFilterSchema
+from app.scheduler.api.task.search_index import TaskSearchIndex
+from app.scheduler.api.task.search_services import TaskSearchServices
+from app.scheduler.api.task.services import DEFAULT_WINDOW_DAYS, TaskServices
+from app.scheduler.api.task.utils import EPOCH
+from app.scheduler.api.versioning import bump_data_version
+from app.scheduler.models import (
+    DeadlineReminder, SubTask, Tag, TaggedItem, Task, TaskCategory, TaskDaySummary, TaskOccurrence,
+    TaskRecurrence, Tombstone,
+)
+from app.scheduler.reminders.notifiers import Notifier
+from app.scheduler.reminders.services import DELIVER_JOB, DeadlineReminderServices
+
+
+User = get_user_model()
+
+
+def has_extension(name: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = %s", [name])
+        return cursor.fetchone() is not None
+
+
+def create_user(username="planner"):
+    return User.objects.create_user(username=username, email=f"{username}@example.com", password="password")
+
+
+def auth_header(user) -> dict:
+    return {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+
+class TaskSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        for title in ["Weekly planning meeting", "Plant the tomatoes", "Call the plumber", "Pay rent"]:
+            TaskServices.create_task(cls.user, {"title": title})
+        TaskServices.create_task(create_user("other"), {"title": "Planning for someone else"})
+
+    def _titles(self, query, **kwargs):
+        tasks, cursor = TaskSearchServices.search(self.user, query, **kwargs)
+        return [task["title"] for task in tasks], cursor
+
+    def test_matches_the_last_term_as_a_prefix(self):
+        titles, cursor = self._titles("pla")
+        self.assertCountEqual(titles, ["Weekly planning meeting", "Plant the tomatoes"])
+        self.assertIsNone(cursor)
+
+    def test_earlier_terms_match_whole_words(self):
+        titles, _ = self._titles("planning mee")
+        self.assertEqual(titles, ["Weekly planning meeting"])
+
+    def test_pages_through_the_results(self):
+        first, cursor = self._titles("pla", limit=1)
+        self.assertEqual(cursor, "f1")
+        second, cursor = self._titles("pla", cursor=cursor, limit=1)
+        self.assertIsNone(cursor)
+        self.assertCountEqual(first + second, ["Weekly planning meeting", "Plant the tomatoes"])
+
+    def test_falls_back_to_trigram_similarity(self):
+        if not has_extension("pg_trgm"):
+            self.skipTest("pg_trgm is not installed")
+
+        titles, cursor = self._titles("plumbr")
+        self.assertEqual(titles, ["Call the plumber"])
+        self.assertIsNone(cursor)
+
+
+class TaskResponseTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.task = Task.objects.create(
+            user=cls.user, title="Standup", scheduled_date=timezone.now().date(),
+            start_time=time(9, 30, 0, 500500), end_time=time(9, 45),
+        )
+        SubTask.objects.create(parent_task=cls.task, title="notes")
+        Task.objects.filter(pk=cls.task.pk).update(
+            created_at=datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=dt_timezone.utc)
+        )
+
+    def test_trusted_responses_match_the_schema_validated_body(self):
+        task = TaskServices.get_task_by_id(self.user, self.task.id)
+        validated = FullTaskSchemaOut.model_validate(task).model_dump()
+
+        body = json.loads(TrustedResponse(task).content)
+        # Ninja's own encoder: millisecond datetimes and times.
+        self.assertEqual(body, json.loads(json.dumps(validated, cls=NinjaJSONEncoder)))
+        self.assertEqual(body["created_at"], "2026-01-02T03:04:05.123Z")
+        self.assertEqual(body["start_time"], "09:30:00.500")
+
+    def test_list_rows_match_the_detail_route(self):
+        headers = auth_header(self.user)
+        detail = self.client.get(f"/api/schedule/tasks/{self.task.id}/", headers=headers).json()
+        listed = self.client.get("/api/schedule/tasks/", headers=headers).json()
+
+        self.assertEqual(listed, [detail])
+
+
+class TaskFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.today = timezone.now().date()
+        cls.work = TaskCategory.objects.create(user=cls.user, title="work")
+        cls.urgent, cls.home = Tag.objects.bulk_create([
+            Tag(user=cls.user, title="urgent"), Tag(user=cls.user, title="home"),
+        ])
+
+        def task(title, days=0, **fields):
+            return Task.objects.create(
+                user=cls.user, title=title, scheduled_date=cls.today + timedelta(days=days), **fields
+            )
+
+        cls.report = task("Quarterly report", category=cls.work, priority_level=Task.PRIORITY_LEVEL_HIGH)
+        cls.groceries = task("Buy groceries", days=1, is_completed=True)
+        cls.boiler = task("Fix the boiler", days=2)
+        cls.overdue = task("Renew passport", days=-3, dead_line=cls.today + timedelta(days=1))
+        cls.missed = task("Old errand", days=-3)
+        cls.later = task("Plan the holiday", days=DEFAULT_WINDOW_DAYS + 10)
+
+        TaggedItem.objects.bulk_create([
+            TaggedItem(task=cls.report, tag=cls.urgent),
+            TaggedItem(task=cls.boiler, tag=cls.urgent),
+            TaggedItem(task=cls.boiler, tag=cls.home),
+            TaggedItem(task=cls.groceries, tag=cls.home),
+        ])
+        TaskSearchIndex.refresh(Task.objects.filter(user=cls.user).values_list("id", flat=True))
+
+    def _ids(self, **params):
+        filters = TaskFilterSchema(**params).get_filter_expression()
+        tasks, _ = TaskServices.get_all_tasks(self.user, filters=filters)
+        return [task.id for task in tasks]
+
+    def test_no_filter_lists_the_default_window(self):
+        # The next DEFAULT_WINDOW_DAYS days, plus earlier tasks whose
+        # deadline has not passed.
+        self.assertEqual(self._ids(), [self.overdue.id, self.report.id, self.groceries.id, self.boiler.id])
+
+    def test_scheduled_range(self):
+        self.assertEqual(
+            self._ids(scheduled_from=self.today + timedelta(days=1), scheduled_to=self.today + timedelta(days=30)),
+            [self.groceries.id, self.boiler.id, self.later.id],
+        )
+        self.assertEqual(self._ids(scheduled_date=self.today - timedelta(days=3)), [self.overdue.id, self.missed.id])
+
+    def test_priority_completion_and_category(self):
+        self.assertEqual(self._ids(priority=["H"]), [self.report.id])
+        self.assertEqual(self._ids(is_completed=True), [self.groceries.id])
+        self.assertEqual(self._ids(category=self.work.id), [self.report.id])
+        self.assertEqual(self._ids(deadline_from=self.today), [self.overdue.id])
+
+    def test_tags_match_any_or_all(self):
+        tags = [self.urgent.id, self.home.id]
+        self.assertEqual(self._ids(tags=tags), [self.report.id, self.groceries.id, self.boiler.id])
+        self.assertEqual(self._ids(tags=tags, tags_match="all"), [self.boiler.id])
+
+    def test_free_text(self):
+        self.assertEqual(self._ids(q="boil"), [self.boiler.id])
+        self.assertEqual(self._ids(q="the"), [self.boiler.id, self.later.id])
+        self.assertEqual(self._ids(q="the", is_completed=False, scheduled_to=self.today + timedelta(days=5)),
+                         [self.boiler.id])
+
+    def test_rejects_inverted_ranges_and_empty_queries(self):
+        with self.assertRaises(SchemaValidationError):
+            TaskFilterSchema(scheduled_from=self.today, scheduled_to=self.today - timedelta(days=1))
+        with self.assertRaises(SchemaValidationError):
+            TaskFilterSchema(deadline_from=self.today, deadline_to=self.today - timedelta(days=1))
+        with self.assertRaises(SchemaValidationError):
+            TaskFilterSchema(q="?!")
+
+
+@skipUnless(connection.vendor == "postgresql", "Query plans are only checked on PostgreSQL")
+class TaskFilterPlanTests(TestCase):
+    """Every filter combination must be served by an index; see ``check_task_filter_plans``."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = check_task_filter_plans.seed(users=10, tasks=2000, days=365)
+
+    def test_no_filter_combination_scans_tasks_sequentially(self):
+        for name, seq_scans, indexes, _ in check_task_filter_plans.check_plans(self.state):
+            with self.subTest(name):
+                self.assertEqual(seq_scans, [])
+                self.assertTrue(indexes)
+
+
+class UpdateFullTaskTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.category = TaskCategory.objects.create(user=cls.user, title="work")
+        cls.kept_tag, cls.dropped_tag, cls.new_tag = Tag.objects.bulk_create([
+            Tag(user=cls.user, title="kept"), Tag(user=cls.user, title="dropped"), Tag(user=cls.user, title="new"),
+        ])
+        cls.foreign_tag = Tag.objects.create(user=create_user("other"), title="theirs")
+
+        cls.task = Task.objects.create(user=cls.user, title="Write report", category=cls.category)
+        cls.kept, cls.dropped = SubTask.objects.bulk_create([
+            SubTask(parent_task=cls.task, title="outline"), SubTask(parent_task=cls.task, title="draft"),
+        ])
+        TaggedItem.objects.bulk_create([
+            TaggedItem(task=cls.task, tag=cls.kept_tag), TaggedItem(task=cls.task, tag=cls.dropped_tag),
+        ])
+        cls.other_subtask = SubTask.objects.create(
+            parent_task=Task.objects.create(user=cls.user, title="Other task"), title="elsewhere"
+        )
+        bump_data_version(cls.user.id)
+
+    def _update(self, **fields):
+        data = FullTaskSchemaIn(title="Write the report", category=self.category.id, **fields).model_dump()
+        return TaskServices.update_full_task(self.user, self.task.id, data)
+
+    def test_upserts_subtasks_and_tags(self):
+        # Lock, category, the task, tags (read, delete, insert), subtasks
+        # (read, delete, one upsert for kept ids and one insert for new
+        # ones), the search vector and the data version, in one savepoint.
+        # The day summary is untouched: date, priority and state are too.
+        with self.assertNumQueries(14):
+            task = self._update(
+                tags=[self.kept_tag.id, self.new_tag.id],
+                subTasks=[
+                    {"id": self.kept.id, "title": "outline v2", "is_completed": True},
+                    {"id": None, "title": "review", "is_completed": False},
+                    {"id": self.other_subtask.id, "title": "stolen", "is_completed": False},
+                ],
+            )
+
+        self.assertEqual([tag["id"] for tag in task["tags"]], [self.kept_tag.id, self.new_tag.id])
+        self.assertEqual(
+            sorted(SubTask.objects.filter(parent_task=self.task).values_list("title", "is_completed")),
+            [("outline v2", True), ("review", False), ("stolen", False)],
+        )
+        self.assertTrue(SubTask.objects.filter(pk=self.kept.id, parent_task=self.task).exists())
+        self.assertFalse(SubTask.objects.filter(pk=self.dropped.id).exists())
+        # The id of another task's subtask creates a new row instead of moving it.
+        self.assertEqual(SubTask.objects.get(pk=self.other_subtask.id).title, "elsewhere")
+        self.assertEqual(sorted(subtask["id"] is not None for subtask in task["subTasks"]), [True, True, True])
+
+    def test_missing_tags_and_subtasks_are_kept(self):
+        data = FullTaskSchemaIn(title="Write the report").model_dump()
+        data["tags"] = data["subTasks"] = None
+        task = TaskServices.update_full_task(self.user, self.task.id, data)
+
+        self.assertEqual([tag["id"] for tag in task["tags"]], [self.kept_tag.id, self.dropped_tag.id])
+        self.assertEqual([subtask["id"] for subtask in task["subTasks"]], [self.kept.id, self.dropped.id])
+        self.assertEqual(TaggedItem.objects.filter(task=self.task).count(), 2)
+
+    def test_rejects_tags_of_other_users(self):
+        response = self.client.put(
+            f"/api/schedule/tasks/{self.task.id}/update/",
+            data={"title": "Write the report", "tags": [self.kept_tag.id, self.foreign_tag.id]},
+            content_type="application/json",
+            headers=auth_header(self.user),
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(self.foreign_tag.id), response.json()["detail"])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Write report")
+        self.assertEqual(TaggedItem.objects.filter(task=self.task).count(), 2)
+
+
+class TaskSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.day = date(2026, 3, 2)
+
+    def setUp(self):
+        self.task = TaskServices.create_task(
+            self.user, {"title": "Pay rent", "scheduled_date": self.day, "priority_level": "H"}
+        )
+
+    def _counts(self, day):
+        return list(
+            TaskDaySummary.objects.filter(user=self.user, scheduled_date=day).values_list("total", "high")
+        )
+
+    def test_double_delete_counts_the_task_once(self):
+        response = self.client.delete(
+            f"/api/schedule/tasks/{self.task['id']}/", headers=auth_header(self.user)
+        )
+        self.assertEqual(response.status_code, 204)
+        response = self.client.delete(
+            f"/api/schedule/tasks/{self.task['id']}/", headers=auth_header(self.user)
+        )
+        self.assertEqual(response.status_code, 404)
+
+        self.assertEqual(self._counts(self.day), [(0, 0)])
+        self.assertEqual(Tombstone.objects.filter(user=self.user, object_id=self.task["id"]).count(), 1)
+
+    def test_delete_of_a_copy_loaded_before_another_delete_is_a_no_op(self):
+        # Two requests that both read the task before either deleted it.
+        first, second = (Task.objects.get(pk=self.task["id"]) for _ in range(2))
+        TaskServices._delete_task(self.user, first)
+        TaskServices._delete_task(self.user, second)
+
+        self.assertEqual(self._counts(self.day), [(0, 0)])
+        self.assertEqual(Tombstone.objects.filter(user=self.user, object_id=self.task["id"]).count(), 1)
+
+    def test_moving_a_task_updates_both_days(self):
+        next_day = self.day + timedelta(days=1)
+        TaskServices.update_task_partial(self.user, self.task["id"], {"scheduled_date": next_day})
+        TaskServices.update_task_partial(self.user, self.task["id"], {"scheduled_date": next_day})
+
+        self.assertEqual(self._counts(self.day), [(0, 0)])
+        self.assertEqual(self._counts(next_day), [(1, 1)])
+
+
+class SyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.category = TaskCategory.objects.create(user=cls.user, title="home")
+        cls.tag = Tag.objects.create(user=cls.user, title="errand")
+        cls.task, cls.other_task = Task.objects.bulk_create([
+            Task(user=cls.user, title="Buy milk", category=cls.category, scheduled_date=date(2026, 3, 2)),
+            Task(user=cls.user, title="Call plumber", scheduled_date=date(2026, 3, 2)),
+        ])
+        TaggedItem.objects.create(task=cls.task, tag=cls.tag)
+        Task.objects.create(user=create_user("other"), title="Not mine")
+
+        # Everything was last written an hour ago; tokens from half an hour
+        # ago have seen all of it.
+        cls.written_at = timezone.now() - timedelta(hours=1)
+        for model in (Task, Tag, TaskCategory):
+            model.objects.filter(user=cls.user).update(updated_at=cls.written_at)
+
+    def _sync(self, since=None):
+        params = {"since": since} if since else {}
+        return self.client.get("/api/schedule/sync/", params, headers=auth_header(self.user))
+
+    def _since_half_an_hour(self):
+        return SyncServices._encode_token(timezone.now() - timedelta(minutes=30))
+
+    def test_full_sync_returns_everything_the_user_owns(self):
+        body = self._sync().json()
+
+        self.assertEqual([task["id"] for task in body["tasks"]], [self.task.id, self.other_task.id])
+        self.assertEqual(body["tasks"][0]["tags"], [{"id": self.tag.id, "title": "errand"}])
+        self.assertEqual(body["tags"], [{"id": self.tag.id, "title": "errand"}])
+        self.assertEqual(body["categories"], [{"id": self.category.id, "title": "home"}])
+        self.assertEqual(body["deleted"], {"tasks": [], "tags": [], "categories": []})
+
+    def test_delta_returns_only_what_changed(self):
+        since = self._since_half_an_hour()
+        self.assertEqual(self._sync(since).json()["tasks"], [])
+
+        TaskServices.update_task_partial(self.user, self.task.id, {"title": "Buy oat milk"})
+        body = self._sync(since).json()
+
+        self.assertEqual([task["title"] for task in body["tasks"]], ["Buy oat milk"])
+        self.assertEqual(body["tags"], [])
+        self.assertEqual(body["categories"], [])
+
+    def test_deletes_leave_tombstones(self):
+        since = self._since_half_an_hour()
+        headers = auth_header(self.user)
+        self.client.delete(f"/api/schedule/tasks/{self.task.id}/", headers=headers)
+        self.client.post(
+            "/api/schedule/tasks/bulk/",
+            {"operations": [{"op": "delete", "id": self.other_task.id}]},
+            content_type="application/json",
+            headers=headers,
+        )
+        self.client.delete(f"/api/schedule/tags/{self.tag.id}/", headers=headers)
+        self.client.delete(f"/api/schedule/categories/{self.category.id}/", headers=headers)
+
+        body = self._sync(since).json()
+
+        self.assertEqual(body["tasks"], [])
+        self.assertEqual(
+            {key: sorted(ids) for key, ids in body["deleted"].items()},
+            {
+                "tasks": [self.task.id, self.other_task.id],
+                "tags": [self.tag.id],
+                "categories": [self.category.id],
+            },
+        )
+        # A full sync has nothing to delete.
+        self.assertEqual(self._sync().json()["deleted"], {"tasks": [], "tags": [], "categories": []})
+
+    def test_series_carry_their_rule_and_changed_occurrences(self):
+        RecurrenceServices.set_rule(self.user, self.task.id, {"freq": "daily", "interval": 2})
+        day = self.task.scheduled_date
+        for offset in (2, 4):
+            RecurrenceServices.update_occurrence(
+                self.user, self.task.id, day + timedelta(days=offset), {"is_cancelled": True}
+            )
+        TaskOccurrence.objects.filter(occurrence_date=day + timedelta(days=2)).update(updated_at=self.written_at)
+
+        body = self._sync(self._since_half_an_hour()).json()
+
+        self.assertEqual([task["id"] for task in body["tasks"]], [self.task.id])
+        self.assertEqual(
+            body["recurrences"],
+            [{"task": self.task.id, "freq": "daily", "interval": 2, "weekdays": [], "until": None, "count": None}],
+        )
+        self.assertEqual(
+            [occurrence["occurrence_date"] for occurrence in body["occurrences"]],
+            [(day + timedelta(days=4)).isoformat()],
+        )
+        self.assertEqual(len(self._sync().json()["occurrences"]), 2)
+
+        # Dropping the rule re-sends the task without one.
+        RecurrenceServices.delete_rule(self.user, self.task.id)
+        body = self._sync(self._since_half_an_hour()).json()
+        self.assertEqual([task["id"] for task in body["tasks"]], [self.task.id])
+        self.assertEqual(body["recurrences"], [])
+
+    @override_settings(SYNC_LAG_SECONDS=60)
+    def test_token_lags_behind_the_sync(self):
+        before = timezone.now()
+        token = self._sync().json()["token"]
+        after = timezone.now()
+
+        watermark = SyncServices._decode_token(token)
+        self.assertGreaterEqual(watermark, before - timedelta(seconds=60))
+        self.assertLessEqual(watermark, after - timedelta(seconds=60))
+
+        # A write inside the lag is sent again by the next sync.
+        TaskServices.update_task_partial(self.user, self.task.id, {"title": "Buy oat milk"})
+        body = self._sync(token).json()
+        self.assertEqual([task["id"] for task in body["tasks"]], [self.task.id])
+        self.assertEqual([task["id"] for task in self._sync(body["token"]).json()["tasks"]], [self.task.id])
+
+    def test_token_never_moves_backwards(self):
+        ahead = timezone.now() + timedelta(minutes=5)
+        token = self._sync(SyncServices._encode_token(ahead)).json()["token"]
+
+        self.assertEqual(SyncServices._decode_token(token), ahead)
+
+    def test_token_round_trip(self):
+        moment = datetime(2026, 5, 17, 8, 30, 15, 123456, tzinfo=dt_timezone.utc)
+        token = SyncServices._encode_token(moment)
+
+        self.assertNotIn("=", token)
+        self.assertEqual(SyncServices._decode_token(token), moment)
+
+    @override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=30)
+    def test_expired_token_is_gone(self):
+        token = SyncServices._encode_token(timezone.now() - timedelta(days=31))
+
+        self.assertEqual(self._sync(token).status_code, 410)
+
+    def test_invalid_token_is_rejected(self):
+        for token in ("bm90LWEtbnVtYmVy", "%%%"):
+            with self.subTest(token=token):
+                self.assertEqual(self._sync(token).status_code, 400)
+
+
+class RecurrenceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.start = date(2026, 1, 5)  # a Monday
+
+    def _series(self, title="Water plants", **rule):
+        task = TaskServices.create_task(self.user, {"title": title, "scheduled_date": self.start})
+        RecurrenceServices.set_rule(self.user, task["id"], {"freq": "daily", **rule})
+        return task["id"]
+
+    def _dates(self, rule, start, end):
+        return list(between(rule, start, end))
+
+    def test_daily_rule(self):
+        rule = Rule.of(self.start, "daily", 2, 0, None, None)
+
+        self.assertEqual(
+            self._dates(rule, date(2026, 1, 1), date(2026, 1, 12)),
+            [date(2026, 1, 5), date(2026, 1, 7), date(2026, 1, 9), date(2026, 1, 11)],
+        )
+        # Windows far from the start and across cache blocks.
+        self.assertEqual(len(self._dates(rule, date(2026, 1, 5), date(2026, 12, 31))), 181)
+        self.assertEqual(self._dates(rule, date(2027, 1, 1), date(2027, 1, 3)), [date(2027, 1, 2)])
+
+    def test_weekly_rule(self):
+        weekdays = (1 << 0) | (1 << 2) | (1 << 4)
+        rule = Rule.of(self.start, "weekly", 2, weekdays, None, None)
+        self.assertEqual(
+            self._dates(rule, self.start, date(2026, 1, 25)),
+            [date(2026, 1, 5), date(2026, 1, 7), date(2026, 1, 9),
+             date(2026, 1, 19), date(2026, 1, 21), date(2026, 1, 23)],
+        )
+
+        # A series starting mid-week skips the earlier weekdays of that week.
+        rule = Rule.of(date(2026, 1, 8), "weekly", 1, weekdays, None, 4)
+        self.assertEqual(
+            self._dates(rule, self.start, date(2026, 2, 28)),
+            [date(2026, 1, 9), date(2026, 1, 12), date(2026, 1, 14), date(2026, 1, 16)],
+        )
+
+        # No weekdays repeats on the weekday the series starts on.
+        rule = Rule.of(self.start, "weekly", 1, 0, date(2026, 1, 19), None)
+        self.assertEqual(
+            self._dates(rule, self.start, date(2026, 3, 1)),
+            [date(2026, 1, 5), date(2026, 1, 12), date(2026, 1, 19)],
+        )
+
+    def test_monthly_rule_skips_months_without_the_day(self):
+        rule = Rule.of(date(2026, 1, 31), "monthly", 1, 0, None, None)
+        self.assertEqual(
+            self._dates(rule, date(2026, 1, 1), date(2026, 8, 31)),
+            [date(2026, 1, 31), date(2026, 3, 31), date(2026, 5, 31), date(2026, 7, 31), date(2026, 8, 31)],
+        )
+
+        # Skipped months do not count towards COUNT, also from a later window.
+        rule = Rule.of(date(2026, 1, 31), "monthly", 1, 0, None, 3)
+        self.assertEqual(self._dates(rule, date(2026, 4, 1), date(2026, 12, 31)), [date(2026, 5, 31)])
+
+        rule = Rule.of(date(2026, 1, 15), "monthly", 3, 0, date(2026, 10, 14), None)
+        self.assertEqual(
+            self._dates(rule, date(2026, 1, 1), date(2027, 1, 31)),
+            [date(2026, 1, 15), date(2026, 4, 15), date(2026, 7, 15)],
+        )
+
+    def test_count_and_until_end_the_series(self):
+        rule = Rule.of(self.start, "daily", 1, 0, None, 3)
+        self.assertEqual(
+            self._dates(rule, date(2025, 12, 1), date(2026, 12, 31)),
+            [date(2026, 1, 5), date(2026, 1, 6), date(2026, 1, 7)],
+        )
+
+        rule = Rule.of(self.start, "daily", 1, 0, date(2026, 1, 6), None)
+        self.assertEqual(
+            self._dates(rule, date(2025, 12, 1), date(2026, 12, 31)), [date(2026, 1, 5), date(2026, 1, 6)]
+        )
+
+    def test_includes(self):
+        rule = Rule.of(date(2026, 1, 31), "monthly", 1, 0, None, 3)
+
+        self.assertTrue(includes(rule, date(2026, 3, 31)))
+        self.assertTrue(includes(rule, date(2026, 5, 31)))
+        self.assertFalse(includes(rule, date(2026, 2, 28)))
+        self.assertFalse(includes(rule, date(2025, 12, 31)))
+        self.assertFalse(includes(rule, date(2026, 7, 31)))
+
+    def test_list_pages_merge_tasks_and_occurrences(self):
+        series_id = self._series(count=4)
+        singles = [
+            TaskServices.create_task(self.user, {"title": title, "scheduled_date": day})["id"]
+            for title, day in (("Dentist", date(2026, 1, 6)), ("Haircut", date(2026, 1, 7)))
+        ]
+        params = {"scheduled_from": "2026-01-05", "scheduled_to": "2026-01-31", "limit": 3}
+
+        first = self.client.get("/api/schedule/tasks/", params, headers=auth_header(self.user))
+        second = self.client.get(
+            "/api/schedule/tasks/", {**params, "cursor": first["X-Next-Cursor"]}, headers=auth_header(self.user)
+        )
+
+        def entries(response):
+            return [(task["scheduled_date"], task["id"], task["recurring_task"]) for task in response.json()]
+
+        self.assertEqual(entries(first), [
+            ("2026-01-05", series_id, series_id),
+            ("2026-01-06", series_id, series_id),
+            ("2026-01-06", singles[0], None),
+        ])
+        self.assertEqual(entries(second), [
+            ("2026-01-07", series_id, series_id),
+            ("2026-01-07", singles[1], None),
+            ("2026-01-08", series_id, series_id),
+        ])
+        self.assertNotIn("X-Next-Cursor", second)
+
+    def test_exceptions_cancel_and_complete_occurrences(self):
+        series_id = self._series(count=4)
+        RecurrenceServices.update_occurrence(self.user, series_id, date(2026, 1, 6), {"is_cancelled": True})
+        RecurrenceServices.update_occurrence(
+            self.user, series_id, date(2026, 1, 7),
+            {"is_completed": True, "start_time": time(8), "end_time": time(9)}
+        )
+
+        occurrences = OccurrenceServices.between(self.user, date(2026, 1, 1), date(2026, 1, 31))
+
+        self.assertEqual(
+            [(occurrence.scheduled_date, occurrence.is_completed, occurrence.start_time) for occurrence in occurrences],
+            [
+                (date(2026, 1, 5), False, None),
+                (date(2026, 1, 7), True, time(8)),
+                (date(2026, 1, 8), False, None),
+            ],
+        )
+
+        completed = self.client.get(
+            "/api/schedule/tasks/",
+            {"scheduled_from": "2026-01-01", "scheduled_to": "2026-01-31", "is_completed": True},
+            headers=auth_header(self.user),
+        ).json()
+        self.assertEqual([task["scheduled_date"] for task in completed], ["2026-01-07"])
+
+    def test_set_rule(self):
+        task_id = TaskServices.create_task(self.user, {"title": "Stretch", "scheduled_date": self.start})["id"]
+
+        for data, message in (
+            ({"freq": "daily", "weekdays": [1]}, "Weekdays only apply"),
+            ({"freq": "weekly", "weekdays": [7]}, "Weekdays go from"),
+            ({"freq": "daily", "until": date(2026, 2, 1), "count": 3}, "either 'until' or 'count'"),
+            ({"freq": "daily", "until": date(2026, 1, 4)}, "'until' cannot be before"),
+        ):
+            with self.subTest(data=data):
+                with self.assertRaisesMessage(ValidationError, message):
+                    RecurrenceServices.set_rule(self.user, task_id, data)
+        self.assertFalse(Task.objects.get(pk=task_id).is_recurring)
+
+        RecurrenceServices.set_rule(self.user, task_id, {"freq": "weekly", "weekdays": [4, 0, 4]})
+        rule = RecurrenceServices.set_rule(self.user, task_id, {"freq": "weekly", "weekdays": [2], "count": 5})
+
+        self.assertEqual(
+            rule, {"task": task_id, "freq": "weekly", "interval": 1, "weekdays": [2], "until": None, "count": 5}
+        )
+        self.assertEqual(RecurrenceServices.get_rule(self.user, task_id), rule)
+        self.assertEqual(TaskRecurrence.objects.filter(task_id=task_id).count(), 1)
+        self.assertTrue(Task.objects.get(pk=task_id).is_recurring)
+        with self.assertRaises(ObjectDoesNotExist):
+            RecurrenceServices.set_rule(create_user("other"), task_id, {"freq": "daily"})
+
+    def test_update_occurrence(self):
+        series_id = self._series(interval=2)
+
+        with self.assertRaisesMessage(ValidationError, "does not occur on 2026-01-06"):
+            RecurrenceServices.update_occurrence(self.user, series_id, date(2026, 1, 6), {"is_completed": True})
+        with self.assertRaises(ValidationError):
+            RecurrenceServices.update_occurrence(
+                self.user, series_id, date(2026, 1, 7), {"start_time": time(10), "end_time": time(9)}
+            )
+
+        RecurrenceServices.update_occurrence(self.user, series_id, date(2026, 1, 7), {"is_completed": True})
+        occurrence = RecurrenceServices.update_occurrence(
+            self.user, series_id, date(2026, 1, 7), {"is_cancelled": None, "start_time": time(7)}
+        )
+
+        # Left-out and null flags keep their stored value.
+        self.assertEqual(occurrence, {
+            "task": series_id, "occurrence_date": date(2026, 1, 7), "is_cancelled": False,
+            "is_completed": True, "start_time": time(7), "end_time": None,
+        })
+        self.assertEqual(TaskOccurrence.objects.filter(task_id=series_id).count(), 1)
+
+    def test_delete_rule_turns_the_series_back_into_a_task(self):
+        series_id = self._series()
+        RecurrenceServices.update_occurrence(self.user, series_id, date(2026, 1, 6), {"is_cancelled": True})
+
+        RecurrenceServices.delete_rule(self.user, series_id)
+
+        task = Task.objects.get(pk=series_id)
+        self.assertFalse(task.is_recurring)
+        self.assertEqual(task.scheduled_date, self.start)
+        self.assertFalse(TaskRecurrence.objects.filter(task_id=series_id).exists())
+        self.assertFalse(TaskOccurrence.objects.filter(task_id=series_id).exists())
+        self.assertEqual(OccurrenceServices.between(self.user, date(2026, 1, 1), date(2026, 1, 31)), [])
+        with self.assertRaises(ObjectDoesNotExist):
+            RecurrenceServices.delete_rule(self.user, series_id)
+
+    def test_export_carries_the_rule_and_occurrences(self):
+        series_id = self._series(interval=3)
+        RecurrenceServices.update_occurrence(self.user, series_id, date(2026, 1, 8), {"is_completed": True})
+        single_id = TaskServices.create_task(self.user, {"title": "One-off", "scheduled_date": self.start})["id"]
+
+        lines = [orjson.loads(line) for line in b"".join(TaskServices.export_tasks(self.user)).splitlines()]
+
+        self.assertEqual([line["id"] for line in lines], [series_id, single_id])
+        series, single = lines
+        self.assertEqual(
+            series["recurrence"],
+            {"task": series_id, "freq": "daily", "interval": 3, "weekdays": [], "until": None, "count": None},
+        )
+        self.assertEqual(
+            series["occurrences"],
+            [{
+                "task": series_id, "occurrence_date": "2026-01-08", "is_cancelled": False,
+                "is_completed": True, "start_time": None, "end_time": None,
+            }],
+        )
+        self.assertNotIn("recurrence", single)
+
+
+def at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(day, time(hour, minute))
+
+
+def seconds(moment: datetime) -> int:
+    return int((moment - EPOCH).total_seconds())
+
+
+class FreeSlotTests(TestCase):
+    DAY = date(2030, 6, 3)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
+        def task(day, start, end, **fields):
+            return Task.objects.create(
+                user=cls.user, title="busy", scheduled_date=day, start_time=start, end_time=end, **fields
+            )
+
+        day = cls.DAY
+        task(day, time(9), time(10))
+        task(day, time(9, 30), time(11))          # overlaps the first
+        task(day, time(11), time(11, 20))         # touches the merged block
+        task(day, time(14), None)                 # a reminder blocks nothing
+        task(day, time(15), time(15, 10))
+        task(day, time(15, 30), time(16))         # 20 minutes after the previous one
+        task(day + timedelta(days=1), time(8), time(12))
+        task(day, None, None)                     # untimed
+        Task.objects.create(user=create_user("other"), title="theirs", scheduled_date=day,
+                            start_time=time(12), end_time=time(14))
+
+    def _slots(self, date_from, date_to, **kwargs):
+        return [
+            (slot["start"], slot["end"], slot["minutes"])
+            for slot in AgendaServices.get_free_slots(self.user, date_from, date_to, **kwargs)
+        ]
+
+    def test_merge_collapses_overlapping_and_touching_ranges(self):
+        ranges = [NumericRange(0, 10), NumericRange(5, 8), NumericRange(10, 20), NumericRange(30, 40),
+                  NumericRange(35, 50)]
+        self.assertEqual(AgendaServices._merge(ranges), [(0, 20), (30, 50)])
+        self.assertEqual(AgendaServices._merge([]), [])
+
+    def test_openings_without_day_bounds_cover_the_window(self):
+        date_from, date_to = at(self.DAY, 6), at(self.DAY + timedelta(days=2), 3)
+        self.assertEqual(AgendaServices._openings(date_from, date_to, None, None),
+                         [(seconds(date_from), seconds(date_to))])
+
+    def test_openings_are_clipped_to_the_day_bounds_and_the_window(self):
+        date_from, date_to = at(self.DAY, 10), at(self.DAY + timedelta(days=2), 12)
+        next_day, last_day = self.DAY + timedelta(days=1), self.DAY + timedelta(days=2)
+
+        self.assertEqual(AgendaServices._openings(date_from, date_to, time(9), time(17)), [
+            (seconds(at(self.DAY, 10)), seconds(at(self.DAY, 17))),
+            (seconds(at(next_day, 9)), seconds(at(next_day, 17))),
+            (seconds(at(last_day, 9)), seconds(at(last_day, 12))),
+        ])
+        # Only a start bound: each opening runs to midnight, or to the window's end.
+        self.assertEqual(AgendaServices._openings(date_from, date_to, time(18), None), [
+            (seconds(at(self.DAY, 18)), seconds(at(next_day, 0))),
+            (seconds(at(next_day, 18)), seconds(at(last_day, 0))),
+        ])
+
+    def test_gaps_between_merged_busy_ranges(self):
+        self.assertEqual(self._slots(at(self.DAY, 8), at(self.DAY, 17)), [
+            (at(self.DAY, 8), at(self.DAY, 9), 60),
+            (at(self.DAY, 11, 20), at(self.DAY, 15), 220),
+            (at(self.DAY, 16), at(self.DAY, 17), 60),
+        ])
+
+    def test_min_minutes_drops_short_gaps(self):
+        slots = self._slots(at(self.DAY, 8), at(self.DAY, 17), min_minutes=10)
+        self.assertIn((at(self.DAY, 15, 10), at(self.DAY, 15, 30), 20), slots)
+        self.assertNotIn((at(self.DAY, 15, 10), at(self.DAY, 15, 30), 20),
+                         self._slots(at(self.DAY, 8), at(self.DAY, 17), min_minutes=30))
+
+    def test_day_bounds_split_the_window_per_day(self):
+        self.assertEqual(
+            self._slots(at(self.DAY, 0), at(self.DAY + timedelta(days=2), 0), day_start=time(10), day_end=time(13)),
+            [
+                (at(self.DAY, 11, 20), at(self.DAY, 13), 100),
+                (at(self.DAY + timedelta(days=1), 12), at(self.DAY + timedelta(days=1), 13), 60),
+            ],
+        )
+
+    def test_occurrences_of_recurring_tasks_are_busy(self):
+        series = Task.objects.create(user=self.user, title="standup", scheduled_date=self.DAY,
+                                     start_time=time(12), end_time=time(12, 30))
+        RecurrenceServices.set_rule(self.user, series.id, {"freq": "daily"})
+
+        self.assertEqual(self._slots(at(self.DAY + timedelta(days=1), 12), at(self.DAY + timedelta(days=1), 14)), [
+            (at(self.DAY + timedelta(days=1), 12, 30), at(self.DAY + timedelta(days=1), 14), 90),
+        ])
+
+    def test_rejects_invalid_windows(self):
+        with self.assertRaises(ValidationError):
+            AgendaServices.get_free_slots(self.user, at(self.DAY, 10), at(self.DAY, 9))
+        with self.assertRaises(ValidationError):
+            AgendaServices.get_free_slots(self.user, at(self.DAY, 8), at(self.DAY, 17),
+                                          day_start=time(12), day_end=time(9))
+
+
+def local(day: date, hour: int, minute: int = 0) -> datetime:
+    return timezone.make_aware(at(day, hour, minute))
+
+
+@override_settings(DEADLINE_REMINDER_LEAD_HOURS=24, DEADLINE_REMINDER_CATCHUP_DAYS=7)
+class DeadlineReminderTests(TestCase):
+    DAY = date(2030, 6, 3)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
+        def task(days, **fields):
+            return Task.objects.create(user=cls.user, title=f"due in {days}",
+                                       dead_line=cls.DAY + timedelta(days=days), **fields)
+
+        cls.due_today = [task(0), task(0)]
+        cls.overdue = [task(-1), task(-7)]
+        task(-8)                          # past the catch-up window
+        task(1)                           # not due yet
+        task(0, is_completed=True)
+        task(-1, is_recurring=True)
+
+    def _due(self, now):
+        return {kind: (first, last) for kind, first, last in DeadlineReminderServices.due_ranges(now)}
+
+    def test_due_ranges(self):
+        soon, overdue = DeadlineReminder.KIND_DUE_SOON, DeadlineReminder.KIND_OVERDUE
+        # A deadline is due at the end of its day, so at midnight today's
+        # deadline is exactly the lead away.
+        for now in [local(self.DAY, 0), local(self.DAY, 23, 59)]:
+            self.assertEqual(self._due(now), {
+                soon: (self.DAY, self.DAY),
+                overdue: (self.DAY - timedelta(days=7), self.DAY - timedelta(days=1)),
+            })
+
+        with override_settings(DEADLINE_REMINDER_LEAD_HOURS=36):
+            self.assertEqual(self._due(local(self.DAY, 11, 59))[soon], (self.DAY, self.DAY))
+            self.assertEqual(self._due(local(self.DAY, 12))[soon], (self.DAY, self.DAY + timedelta(days=1)))
+
+        with override_settings(DEADLINE_REMINDER_LEAD_HOURS=0):
+            first, last = self._due(local(self.DAY, 12))[soon]
+            self.assertGreater(first, last)
+
+    def test_next_wakeups_are_when_the_ranges_grow(self):
+        with override_settings(DEADLINE_REMINDER_LEAD_HOURS=36):
+            self.assertEqual(DeadlineReminderServices.next_wakeups(local(self.DAY, 9)), [
+                (local(self.DAY, 12), DeadlineReminder.KIND_DUE_SOON),
+                (local(self.DAY + timedelta(days=1), 0), DeadlineReminder.KIND_OVERDUE),
+            ])
+
+    @override_settings(DEADLINE_REMINDER_BATCH_SIZE=1)
+    def test_rescans_queue_nothing_new(self):
+        now = local(self.DAY, 10)
+        self.assertEqual(DeadlineReminderServices.schedule(now), 4)
+        self.assertEqual(
+            set(DeadlineReminder.objects.values_list("task_id", "kind")),
+            {(task.id, DeadlineReminder.KIND_DUE_SOON) for task in self.due_today}
+            | {(task.id, DeadlineReminder.KIND_OVERDUE) for task in self.overdue},
+        )
+        self.assertEqual(Job.objects.filter(name=DELIVER_JOB).count(), 4)
+
+        self.assertEqual(DeadlineReminderServices.schedule(now), 0)
+        self.assertEqual(DeadlineReminderServices.schedule(now + timedelta(hours=1)), 0)
+        self.assertEqual(Job.objects.filter(name=DELIVER_JOB).count(), 4)
+
+    def test_deliver_skips_stale_reminders(self):
+        DeadlineReminderServices.schedule(local(self.DAY, 10))
+        completed, moved = self.due_today
+        Task.objects.filter(pk=completed.pk).update(is_completed=True)
+        Task.objects.filter(pk=moved.pk).update(dead_line=self.DAY + timedelta(days=2))
+        overdue_ids = [task.id for task in self.overdue]
+
+        with tempfile.TemporaryDirectory() as directory:
+            sink = os.path.join(directory, "reminders.jsonl")
+            with override_settings(DEADLINE_REMINDER_NOTIFIER="app.scheduler.reminders.notifiers.FileNotifier",
+                                   DEADLINE_REMINDER_FILE=sink):
+                self.assertEqual(DeadlineReminderServices.deliver(
+                    DeadlineReminder.KIND_DUE_SOON, [completed.id, moved.id]), 0)
+                self.assertEqual(DeadlineReminderServices.deliver(DeadlineReminder.KIND_OVERDUE, overdue_ids), 2)
+                # Already sent.
+                self.assertEqual(DeadlineReminderServices.deliver(DeadlineReminder.KIND_OVERDUE, overdue_ids), 0)
+
+            with open(sink, "rb") as lines:
+                delivered = [orjson.loads(line) for line in lines]
+
+        self.assertCountEqual([reminder["task_id"] for reminder in delivered], overdue_ids)
+        self.assertFalse(DeadlineReminder.objects.filter(sent_at__isnull=True).exists())
+
+    def test_notifiers_must_implement_send(self):
+        with self.assertRaises(TypeError):
+            Notifier()
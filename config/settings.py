@@ -35,6 +35,8 @@ ALLOWED_HOSTS = ["*"]
 
 CORS_ALLOWED_ORIGINS = ["https://scheduler-site.liara.run", "http://localhost:5173", "http://127.0.0.1:5173"]
 
+CORS_EXPOSE_HEADERS = ["X-Next-Cursor", "ETag"]
+
 
 # Application definition
 
@@ -45,6 +47,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     #third party apps
     'rest_framework',
     'rest_framework_simplejwt',
@@ -68,8 +71,33 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-# if DEBUG:
-#     MIDDLEWARE.insert(0, 'app.core.middlewares.query_logger.QueryLoggerMiddleware')
+# Per-request wall time / query profiling. SAMPLE_RATE (0-1) is the share of
+# requests whose queries are captured; requests slower than SLOW_REQUEST_MS
+# are always logged.
+REQUEST_PROFILER = {
+    "ENABLED": os.getenv("REQUEST_PROFILER", "").lower() in ("1", "true", "yes"),
+    "SAMPLE_RATE": float(os.getenv("REQUEST_PROFILER_SAMPLE_RATE") or 0.01),
+    "SLOW_REQUEST_MS": float(os.getenv("REQUEST_PROFILER_SLOW_MS") or 500),
+    "SLOWEST_QUERIES": int(os.getenv("REQUEST_PROFILER_SLOWEST_QUERIES") or 5),
+    "MAX_SQL_LENGTH": 500,
+}
+
+if REQUEST_PROFILER["ENABLED"]:
+    MIDDLEWARE.insert(0, "app.core.middlewares.profiling.RequestProfilerMiddleware")
+
+# Prometheus metrics served at /metrics, off unless METRICS is set. Under
+# gunicorn set METRICS_MULTIPROCESS_DIR to a directory shared by the workers
+# (emptied on restart) so a scrape reports all of them. The scraper must send
+# TOKEN as a bearer token; without a TOKEN /metrics answers 403.
+METRICS = {
+    "ENABLED": os.getenv("METRICS", "").lower() in ("1", "true", "yes"),
+    "MULTIPROCESS_DIR": os.getenv("METRICS_MULTIPROCESS_DIR") or None,
+    "FLUSH_INTERVAL": float(os.getenv("METRICS_FLUSH_INTERVAL") or 5),
+    "TOKEN": os.getenv("METRICS_TOKEN", ""),
+}
+
+if METRICS["ENABLED"]:
+    MIDDLEWARE.insert(0, "app.core.middlewares.metrics.MetricsMiddleware")
 
 ROOT_URLCONF = 'config.urls'
 
@@ -94,6 +122,14 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connection reuse. With DB_POOL enabled every worker process keeps a
+# psycopg3 pool of DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections; this is
+# the option to use under uvicorn, where persistent connections are not
+# reused across requests. Otherwise DB_CONN_MAX_AGE keeps each thread's
+# connection open for that many seconds (0 closes it after every request),
+# checked before reuse when DB_CONN_HEALTH_CHECKS is on.
+DB_POOL = os.getenv("DB_POOL", "").lower() in ("1", "true", "yes")
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -101,10 +137,23 @@ DATABASES = {
         'USER': os.getenv("PGUSER"),
         'PASSWORD': os.getenv("PGPASSWORD"),
         'HOST': os.getenv("PGHOST"),
-        'PORT': os.getenv("PGPORT")
+        'PORT': os.getenv("PGPORT"),
+        # Pooled connections are returned to the pool instead of persisting.
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE") or 0),
+        'CONN_HEALTH_CHECKS': os.getenv("DB_CONN_HEALTH_CHECKS", "true").lower() in ("1", "true", "yes"),
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv("DB_CONNECT_TIMEOUT") or 10),
+        },
     }
 }
 
+if DB_POOL:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv("DB_POOL_MIN_SIZE") or 2),
+        'max_size': int(os.getenv("DB_POOL_MAX_SIZE") or 10),
+        'timeout': float(os.getenv("DB_POOL_TIMEOUT") or 10),
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -150,6 +199,116 @@ SIMPLE_JWT = {
     "REFRESH_TOEKN_LIFETIME": timedelta(days=14),
 }
 
+# "db" loads the user row on every request, "stateless" resolves it from a
+# per-process LRU/TTL cache keyed by the token's user_id claim.
+JWT_AUTH = {
+    "MODE": os.getenv("JWT_AUTH_MODE") or "db",
+    "USER_CACHE_SIZE": int(os.getenv("JWT_USER_CACHE_SIZE") or 1024),
+    "USER_CACHE_TTL": int(os.getenv("JWT_USER_CACHE_TTL") or 60),
+}
+
+# Page size of GET /schedule/tasks/. Clients may ask for a smaller or larger
+# page with ?limit=, capped at TASK_PAGE_SIZE_MAX.
+TASK_PAGE_SIZE = int(os.getenv("TASK_PAGE_SIZE") or 100)
+TASK_PAGE_SIZE_MAX = int(os.getenv("TASK_PAGE_SIZE_MAX") or 500)
+
+# How GET /schedule/tasks/ reads its page: "rows" uses the values_list read
+# models in app/scheduler/api/task/read_models.py, "orm" full model
+# instances. Both produce the same response; see `manage.py bench_read_models`.
+TASK_LIST_READ_MODEL = os.getenv("TASK_LIST_READ_MODEL") or "rows"
+
+# Rows fetched (and prefetched) per server-side cursor round trip by the
+# NDJSON export.
+TASK_EXPORT_CHUNK_SIZE = int(os.getenv("TASK_EXPORT_CHUNK_SIZE") or 500)
+
+# Upper bound on operations accepted by POST /schedule/tasks/bulk/.
+TASK_BULK_MAX_OPERATIONS = int(os.getenv("TASK_BULK_MAX_OPERATIONS") or 500)
+
+# Widest from..to span accepted by GET /schedule/tasks/summary/.
+TASK_SUMMARY_MAX_DAYS = int(os.getenv("TASK_SUMMARY_MAX_DAYS") or 400)
+
+# Widest from..to window of GET /schedule/agenda/ and /schedule/free-slots/.
+AGENDA_MAX_DAYS = int(os.getenv("AGENDA_MAX_DAYS") or 62)
+
+# Overlap detection on single-task writes (app/scheduler/api/task/conflicts.py):
+# "off", "flag" (return the overlapping task ids as "conflicts") or "reject"
+# (400). At most TASK_CONFLICT_MAX_REPORTED ids are returned or reported.
+TASK_CONFLICT_MODE = os.getenv("TASK_CONFLICT_MODE") or "off"
+TASK_CONFLICT_MAX_REPORTED = int(os.getenv("TASK_CONFLICT_MAX_REPORTED") or 20)
+
+# Recurring tasks (app/scheduler/api/recurrence). Occurrences are expanded on
+# read; RECURRENCE_CACHE_SIZE bounds the per-process cache of expanded
+# 28-day blocks, and RECURRENCE_HORIZON_DAYS how far past today a list
+# without an upper date bound expands a series.
+RECURRENCE_CACHE_SIZE = int(os.getenv("RECURRENCE_CACHE_SIZE") or 4096)
+RECURRENCE_HORIZON_DAYS = int(os.getenv("RECURRENCE_HORIZON_DAYS") or 366)
+
+# DB-backed job queue (app/core/jobs.py, `manage.py run_jobs`). Idle workers
+# poll every JOBS_POLL_INTERVAL seconds and claim up to JOBS_CLAIM_SIZE due
+# jobs at a time; a claimed job whose worker has not finished it within
+# JOBS_LEASE_SECONDS is queued again. Failed jobs are retried after an
+# exponential delay starting at JOBS_RETRY_BASE_SECONDS, capped at
+# JOBS_RETRY_MAX_SECONDS.
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL") or 1)
+JOBS_CLAIM_SIZE = int(os.getenv("JOBS_CLAIM_SIZE") or 50)
+JOBS_LEASE_SECONDS = int(os.getenv("JOBS_LEASE_SECONDS") or 300)
+JOBS_RETRY_BASE_SECONDS = int(os.getenv("JOBS_RETRY_BASE_SECONDS") or 10)
+JOBS_RETRY_MAX_SECONDS = int(os.getenv("JOBS_RETRY_MAX_SECONDS") or 3600)
+
+# Deadline reminders (app/scheduler/reminders, `manage.py run_deadline_reminders`).
+# A task is due at the end of its dead_line day in TIME_ZONE; a "due_soon"
+# reminder goes out DEADLINE_REMINDER_LEAD_HOURS before that and an
+# "overdue" one once it passed, unless the task was completed. Deadlines
+# that passed more than DEADLINE_REMINDER_CATCHUP_DAYS ago are not caught up
+# on. Besides its timed wakeups the scheduler rescans every
+# DEADLINE_REMINDER_SCAN_INTERVAL seconds for tasks written since, and
+# queues reminders in jobs of DEADLINE_REMINDER_BATCH_SIZE.
+# DEADLINE_REMINDER_NOTIFIER is the dotted path of the Notifier delivering
+# them; FileNotifier appends JSON lines to DEADLINE_REMINDER_FILE.
+DEADLINE_REMINDER_LEAD_HOURS = int(os.getenv("DEADLINE_REMINDER_LEAD_HOURS") or 24)
+DEADLINE_REMINDER_CATCHUP_DAYS = int(os.getenv("DEADLINE_REMINDER_CATCHUP_DAYS") or 7)
+DEADLINE_REMINDER_SCAN_INTERVAL = int(os.getenv("DEADLINE_REMINDER_SCAN_INTERVAL") or 60)
+DEADLINE_REMINDER_BATCH_SIZE = int(os.getenv("DEADLINE_REMINDER_BATCH_SIZE") or 500)
+DEADLINE_REMINDER_NOTIFIER = (
+    os.getenv("DEADLINE_REMINDER_NOTIFIER") or "app.scheduler.reminders.notifiers.LogNotifier"
+)
+DEADLINE_REMINDER_FILE = os.getenv("DEADLINE_REMINDER_FILE") or "deadline_reminders.jsonl"
+
+# Delta sync (GET /schedule/sync/). A sync token lags the sync by
+# SYNC_LAG_SECONDS, so changes from transactions still in flight (or stamped
+# by a worker with a slightly late clock) are sent again next time rather
+# than missed. Tokens older than the tombstone retention need a full sync.
+SYNC_LAG_SECONDS = int(os.getenv("SYNC_LAG_SECONDS") or 5)
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS") or 30)
+
+# Text search configuration of the task search vector. "simple" does no
+# stemming, so it works for any language; changing it requires
+# `manage.py rebuild_task_search`.
+TASK_SEARCH_CONFIG = os.getenv("TASK_SEARCH_CONFIG") or "simple"
+
+# How tag renames and deletes refresh the search vector of the tag's tasks:
+# "inline" in the request, or "deferred" to a job, so renaming a tag on
+# thousands of tasks does not hold up the response. Task writes always
+# refresh inline.
+TASK_SEARCH_REFRESH = os.getenv("TASK_SEARCH_REFRESH") or "inline"
+
+# Mount the async task router (AsyncTaskServices + AsyncJWTAuth) instead of
+# the sync one. Only worth enabling when served through config.asgi.
+ASYNC_TASK_API = os.getenv("ASYNC_TASK_API", "").lower() in ("1", "true", "yes")
+
+# Planetary hours are cached per (lat, lon, date) with coordinates rounded to
+# PRECISION decimals (2 ~ 1km). BACKEND optionally names a CACHES alias shared
+# between workers, consulted after the in-process LRU.
+PLANETARY_CACHE = {
+    "MAX_SIZE": int(os.getenv("PLANETARY_CACHE_SIZE") or 2048),
+    "PRECISION": int(os.getenv("PLANETARY_CACHE_PRECISION") or 2),
+    "BACKEND": os.getenv("PLANETARY_CACHE_BACKEND") or None,
+    "TIMEOUT": int(os.getenv("PLANETARY_CACHE_TIMEOUT") or 60 * 60 * 48),
+}
+
+# Longest span accepted by GET /planetary/range/.
+PLANETARY_RANGE_MAX_DAYS = int(os.getenv("PLANETARY_RANGE_MAX_DAYS") or 62)
+
 ANYDI = {
     "CONTAINER_FACTORY": "app.planetary.api.dependency.get_service",
     "PATCH_NINJA": True,
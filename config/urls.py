@@ -1,8 +1,13 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from api.v1 import api
+from app.core.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api.urls)
 ]
+
+if settings.METRICS["ENABLED"]:
+    urlpatterns.append(path('metrics', metrics_view, name='metrics'))